@@ -0,0 +1,14 @@
+import sys
+import time
+
+# Taken before any project import so the headless cold start includes them
+STARTED_NS = time.perf_counter_ns()
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Headless commands: only the engine and input backend are imported, never Qt
+        from src.Public.headless import main
+        sys.exit(main(sys.argv[1:], STARTED_NS))
+    from src.Public.sigma_auto_clicker import AppLauncher
+    launcher = AppLauncher()
+    launcher.run()
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from src.Public.click_sequence import SequenceStep
+from src.Public.guards import GuardCondition
+from src.Public.humanize import JITTER_DISTRIBUTIONS, JITTER_OFF
+from src.Public.input_backend import BUTTON_FLAGS, CLICK_TYPES, parse_chord
+from src.Public.triggers import PixelCondition, TemplateCondition
+from src.Public.timing import CATCH_UP_POLICIES, CATCH_UP_SKIP, DEFAULT_TIMING_PROFILE, MAX_CPS, TIMING_PROFILES
+
+@dataclass(slots=True, frozen=True)
+class ClickPlan:
+    """Immutable, validated click schedule compiled from the settings.
+
+    Intervals are precomputed in nanoseconds so the click loop never parses
+    or looks anything up by key. The engine holds the active plan in a single
+    attribute; replacing that attribute is the (atomic) hot-swap.
+    """
+    clicks: int
+    max_loops: int
+    click_interval_ns: int
+    cycle_interval_ns: int
+    burst: bool = False
+    catch_up: str = CATCH_UP_SKIP
+    timing_profile: str = DEFAULT_TIMING_PROFILE
+    target_cps: float = 0.0
+    sequence: Tuple[SequenceStep, ...] = ()
+    macro_path: str = ""
+    jitter: str = JITTER_OFF
+    jitter_ns: int = 0
+    offset_px: int = 0
+    button: str = "left"
+    click_type: str = "single"
+    hold_ns: int = 0
+    keys: Tuple[int, ...] = ()
+    pixel_trigger: Optional[PixelCondition] = None
+    template_trigger: Optional[TemplateCondition] = None
+    guard: Optional[GuardCondition] = None
+
+    @property
+    def humanized(self) -> bool:
+        return self.jitter != JITTER_OFF and (self.jitter_ns > 0 or self.offset_px > 0)
+
+    @property
+    def presses(self) -> int:
+        return CLICK_TYPES[self.click_type]
+
+    def __post_init__(self) -> None:
+        if self.clicks < 1:
+            raise ValueError("Clicks per cycle must be at least 1")
+        if self.max_loops < 0:
+            raise ValueError("Max cycles cannot be negative")
+        if self.click_interval_ns < 0 or self.cycle_interval_ns < 0:
+            raise ValueError("Delays cannot be negative")
+        if self.catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {self.catch_up}")
+        if self.timing_profile not in TIMING_PROFILES:
+            raise ValueError(f"Unknown timing profile: {self.timing_profile}")
+        if not 0 <= self.target_cps <= MAX_CPS:
+            raise ValueError(f"Target CPS must be between 0 and {MAX_CPS}")
+        if self.jitter not in JITTER_DISTRIBUTIONS:
+            raise ValueError(f"Unknown jitter distribution: {self.jitter}")
+        if self.jitter_ns < 0 or self.offset_px < 0:
+            raise ValueError("Jitter and cursor offset cannot be negative")
+        if self.button not in BUTTON_FLAGS:
+            raise ValueError(f"Unknown mouse button: {self.button}")
+        if self.click_type not in CLICK_TYPES:
+            raise ValueError(f"Unknown click type: {self.click_type}")
+        if self.hold_ns < 0:
+            raise ValueError("Hold duration cannot be negative")
+        if any(not 0 < vk < 255 for vk in self.keys):
+            raise ValueError("Key codes must be between 1 and 254")
+        if self.burst and (self.hold_ns or (CLICK_TYPES[self.click_type] > 1 and not self.keys)):
+            # One SendInput call can neither hold a press nor space out double/triple clicks
+            raise ValueError("Burst mode can't be combined with a hold duration or double/triple clicks")
+        if self.pixel_trigger is not None and self.template_trigger is not None:
+            raise ValueError("Use either a pixel trigger or an image trigger, not both")
+
+    @classmethod
+    def compile(cls, settings: Dict[str, Any]) -> "ClickPlan":
+        """Build a plan from a settings dict (as produced by the UI).
+
+        Every malformed value raises ValueError, whatever the conversion
+        that trips over it (e.g. ``inf`` delays or a non-string chord).
+        """
+        try:
+            return cls._from_settings(settings)
+        except KeyError as e:
+            raise ValueError(f"Missing setting: {e.args[0]}") from e
+        except (TypeError, AttributeError, OverflowError) as e:
+            raise ValueError(f"Bad setting value: {e}") from e
+
+    @classmethod
+    def _from_settings(cls, settings: Dict[str, Any]) -> "ClickPlan":
+        return cls(
+            clicks=int(settings["clicks"]),
+            max_loops=int(settings["max_loops"]),
+            click_interval_ns=int(float(settings["click_delay"]) * 1_000_000_000),
+            cycle_interval_ns=int(float(settings["cycle_delay"]) * 1_000_000_000),
+            burst=bool(settings.get("burst", False)),
+            catch_up=settings.get("catch_up", CATCH_UP_SKIP),
+            timing_profile=settings.get("timing_profile", DEFAULT_TIMING_PROFILE),
+            target_cps=float(settings.get("target_cps", 0.0)),
+            sequence=tuple(SequenceStep.from_dict(step) for step in settings.get("sequence", ())),
+            macro_path=str(settings.get("macro_path", "")),
+            jitter=settings.get("jitter", JITTER_OFF),
+            jitter_ns=int(float(settings.get("jitter_ms", 0.0)) * 1_000_000),
+            offset_px=int(settings.get("offset_px", 0)),
+            button=str(settings.get("button", "left")).lower(),
+            click_type=str(settings.get("click_type", "single")).lower(),
+            hold_ns=int(float(settings.get("hold_ms", 0.0)) * 1_000_000),
+            keys=parse_chord(settings.get("keys", "")),
+            pixel_trigger=PixelCondition.from_dict(settings["pixel_trigger"]) if settings.get("pixel_trigger") else None,
+            template_trigger=(
+                TemplateCondition.from_dict(settings["template_trigger"]) if settings.get("template_trigger") else None
+            ),
+            guard=GuardCondition.from_dict(settings["guard"]) if settings.get("guard") else None,
+        )
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.Public.input_backend import (
+    BUTTON_FLAGS, MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_MOVE, MOUSEEVENTF_VIRTUALDESK,
+    InputBackend, MouseEvent, button_events,
+)
+
+@dataclass(slots=True, frozen=True)
+class SequenceStep:
+    """One step of a click sequence in screen pixels and milliseconds."""
+    x: int
+    y: int
+    button: str = "left"
+    count: int = 1
+    hold_ms: float = 0.0
+    delay_ms: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.button not in BUTTON_FLAGS:
+            raise ValueError(f"Unknown mouse button: {self.button}")
+        if self.count < 1:
+            raise ValueError("Step click count must be at least 1")
+        if self.hold_ms < 0 or self.delay_ms < 0:
+            raise ValueError("Step hold and delay cannot be negative")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SequenceStep":
+        return cls(
+            x=int(data["x"]),
+            y=int(data["y"]),
+            button=str(data.get("button", "left")).lower(),
+            count=int(data.get("count", 1)),
+            hold_ms=float(data.get("hold_ms", 0.0)),
+            delay_ms=float(data.get("delay_ms", 0.0)),
+        )
+
+# (prebuilt buffer, input events in it, wait after it in ns, clicks it completes, held)
+# ``held`` is ``(key, release_buffer)`` for an action that leaves ``key`` pressed,
+# ``(key, None)`` for the action that releases it and None otherwise, so playback
+# can release whatever is still down when it stops early.
+SequenceAction = Tuple[Any, int, int, int, Optional[Tuple[Any, Any]]]
+
+def normalize_point(x: int, y: int, desktop: Tuple[int, int, int, int]) -> Tuple[int, int]:
+    """Map a virtual-desktop pixel to SendInput's 0..65535 absolute range."""
+    left, top, width, height = desktop
+    nx = ((x - left) * 65535) // max(1, width - 1)
+    ny = ((y - top) * 65535) // max(1, height - 1)
+    return min(65535, max(0, nx)), min(65535, max(0, ny))
+
+def compile_sequence(steps: Sequence[SequenceStep], backend: InputBackend) -> Tuple[SequenceAction, ...]:
+    """Compile steps into ready-to-send buffers.
+
+    Coordinates are normalized once against the backend's virtual-desktop
+    metrics, so playback is a plain loop over ``(buffer, events, wait_ns, clicks, held)``
+    with no per-step coordinate math.
+    """
+    desktop = backend.virtual_desktop()
+    move_flags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+    actions: List[SequenceAction] = []
+    for step in steps:
+        nx, ny = normalize_point(step.x, step.y, desktop)
+        down, up = button_events(step.button)
+        move: MouseEvent = (move_flags, nx, ny, 0)
+        delay_ns = int(step.delay_ms * 1_000_000)
+        hold_ns = int(step.hold_ms * 1_000_000)
+        if hold_ns <= 0:
+            events = [move] + [down, up] * step.count
+            actions.append((backend.compile_mouse(events), len(events), delay_ns, step.count, None))
+            continue
+        press_first = backend.compile_mouse([move, down])
+        press = backend.compile_mouse([down])
+        release = backend.compile_mouse([up])
+        held, released = (step.button, release), (step.button, None)
+        for i in range(step.count):
+            actions.append((press_first, 2, hold_ns, 0, held) if i == 0 else (press, 1, hold_ns, 0, held))
+            actions.append((release, 1, delay_ns if i == step.count - 1 else 0, 1, released))
+    return tuple(actions)
@@ -0,0 +1,645 @@
+import sys
+import time
+import ctypes
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Final, List, Optional
+from src.Public.click_plan import ClickPlan
+from src.Public.click_sequence import compile_sequence
+from src.Public.guards import ClickGuard, create_guard
+from src.Public.humanize import JitterBuffer
+from src.Public.input_backend import (
+    InputBackend, button_events, chord_events, chord_template, click_template, create_input_backend,
+)
+from src.Public.macro import MacroStream
+from src.Public.screen_capture import CaptureBackend, create_capture_backend
+from src.Public.telemetry import ClickTelemetry, TimingStats
+from src.Public.thread_priority import (
+    PRIORITY_NORMAL, apply_thread_priority, describe_priority, validate_priority,
+)
+from src.Public.triggers import PixelTrigger, TemplateTrigger
+from src.Public.timing import (
+    CATCH_UP_BURST, CATCH_UP_SKIP, MAX_CATCH_UP, TIMING_PROFILES, DeadlineScheduler, HybridTimer, PrecisionTimer, RateController,
+    create_profile_timer, create_timer,
+)
+
+# ------------------------------------------------------------------
+# Engine states
+# ------------------------------------------------------------------
+STATE_IDLE: Final[str] = "Idle"
+STATE_ARMING: Final[str] = "Arming"
+STATE_RUNNING: Final[str] = "Running"
+STATE_STOPPING: Final[str] = "Stopping"
+
+class ClickerEngine:
+    """Qt-free auto-click engine – Windows 11 optimized.
+
+    A single long-lived worker thread is parked on a condition variable and
+    driven through Idle → Arming → Running → Stopping → Idle, so toggling
+    never spawns threads or lets two loops overlap. The worker never touches
+    widgets or the activity log; it only bumps plain integer counters (atomic
+    under the GIL) and queues status messages for the GUI to sample.
+    """
+
+    MESSAGE_BACKLOG: Final[int] = 1000
+    JOIN_TIMEOUT: Final[float] = 1.0
+    MATCH_WORKERS: Final[int] = 2
+    GUARD_POLL_NS: Final[int] = 15_000_000
+
+    def __init__(
+        self, backend: Optional[InputBackend] = None, capture: Optional[CaptureBackend] = None,
+        thread_priority: str = PRIORITY_NORMAL, cpu_core: Optional[int] = None,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        timer_factory: Optional[Callable[[str], PrecisionTimer]] = None,
+    ):
+        validate_priority(thread_priority, cpu_core)
+        # Injectable time source and sleeper: the simulation harness (tests/simulation.py) swaps in a virtual clock
+        self.clock = clock
+        self.timer_factory = timer_factory
+        self.thread_priority = thread_priority
+        self.cpu_core = cpu_core
+        self.running = False
+        self.state = STATE_IDLE
+        self.thread: Optional[threading.Thread] = None
+        self.backend = backend or create_input_backend()
+        self.capture = capture
+        self._match_pool: Optional[ThreadPoolExecutor] = None
+        self.telemetry = ClickTelemetry()
+        self.runs = 0
+        self.clicks_done = 0
+        self.cycles_done = 0
+        self.messages: deque = deque(maxlen=self.MESSAGE_BACKLOG)
+        self.plan: Optional[ClickPlan] = None
+        self.guard: Optional[ClickGuard] = None
+        self.last_start_latency_ns: Optional[int] = None
+        self.last_stop_latency_ns: Optional[int] = None
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._timer: Optional[PrecisionTimer] = None
+        self._timer_profile: Optional[str] = None
+        self._start_requested_ns = 0
+        self._stop_requested_ns = 0
+        self._spin_margins: Dict[str, int] = {}
+        # Timer of an idle calibration in progress; start/shutdown interrupt it
+        self._calibration_timer: Optional[PrecisionTimer] = None
+        self._priority_label = describe_priority(thread_priority, cpu_core)
+        # Win11: ensure we send INPUT structs instead of legacy mouse_event
+        self._ensure_uiAccess()
+        # Start the worker now so it can calibrate the timers before the first run is armed
+        with self._cond:
+            self._ensure_worker()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self, plan: ClickPlan) -> bool:
+        """Arm the parked worker with the given plan; False if not idle."""
+        with self._cond:
+            if self.state != STATE_IDLE or self._shutdown:
+                return False
+            self._ensure_worker()
+            self._start_requested_ns = self.clock()
+            self.plan = plan
+            self.clicks_done = 0
+            self.cycles_done = 0
+            self.runs += 1
+            self.running = True
+            self.state = STATE_ARMING
+            self._cond.notify_all()
+        self._interrupt_calibration()
+        return True
+
+    def stop(self) -> None:
+        """Stop the current run and wake the worker from any pending sleep."""
+        with self._cond:
+            if self.state in (STATE_ARMING, STATE_RUNNING):
+                self._stop_requested_ns = self.clock()
+                self.state = STATE_STOPPING
+            self.running = False
+        timer = self._timer
+        if timer is not None:
+            timer.interrupt()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the engine is back to Idle; return True if it is."""
+        if threading.current_thread() is self.thread:
+            return self.state == STATE_IDLE
+        with self._cond:
+            return self._cond.wait_for(lambda: self.state == STATE_IDLE, timeout)
+
+    def shutdown(self, timeout: Optional[float] = JOIN_TIMEOUT) -> None:
+        """Stop any run and let the worker thread exit."""
+        self.stop()
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        self._interrupt_calibration()
+        thread = self.thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self._match_pool is not None:
+            self._match_pool.shutdown(wait=False)
+
+    def set_thread_priority(self, level: str, core: Optional[int] = None) -> None:
+        """Set the click thread's priority and CPU core; takes effect on the next run."""
+        validate_priority(level, core)
+        self.thread_priority, self.cpu_core = level, core
+
+    def swap_plan(self, plan: ClickPlan) -> None:
+        """Replace the active plan; a running loop picks it up on its next cycle."""
+        self.plan = plan
+
+    def drain_messages(self) -> List[str]:
+        """Pop every queued status message (call from the consumer thread)."""
+        messages = []
+        pop = self.messages.popleft
+        while self.messages:
+            messages.append(pop())
+        return messages
+
+    def _log(self, message: str) -> None:
+        self.messages.append(message)
+
+    # ------------------------------------------------------------------
+    # Core loop
+    # ------------------------------------------------------------------
+    def _click_loop(self) -> None:
+        """Main click loop – absolute deadlines, precision timers & INPUT injection."""
+        requested = inserted = skipped = gated = 0
+        jitter = trigger = None
+        # Buttons/keys a sequence or macro left pressed: key -> prebuilt release buffer
+        holding: Dict[object, object] = {}
+        try:
+            cycle_count = 0
+            active = self.plan
+            # Build the INPUT buffers once per run, not once per click
+            self._prepare_backend(active)
+            send_click = self.backend.click
+            send_burst = self.backend.burst
+            send_offset = self.backend.click_offset
+            send = self.backend.send
+            clock = self.clock
+            telemetry = self.telemetry
+            telemetry.reset()
+            record = telemetry.record
+            # The worker's timer handle is reused across runs, re-armed for every wait
+            timer = self._acquire_timer(active.timing_profile)
+            if not self.running:
+                return
+            scheduler = DeadlineScheduler(timer.sleep_until, active.catch_up, clock=clock)
+            wait = scheduler.wait
+            scheduler.start()
+            with self._cond:
+                if self.state == STATE_ARMING:
+                    self.state = STATE_RUNNING
+            self.last_start_latency_ns = clock() - self._start_requested_ns
+            plan = None
+            while self.running:
+                if self.plan is not plan:
+                    # New or hot-swapped plan: unpack it into locals once per change
+                    previous, plan = plan, self.plan
+                    if previous is not None:
+                        if plan.timing_profile != previous.timing_profile:
+                            timer = self._acquire_timer(plan.timing_profile)
+                            scheduler.set_sleeper(timer.sleep_until)
+                        if (plan.button, plan.click_type, plan.keys) != (previous.button, previous.click_type, previous.keys):
+                            self._prepare_backend(plan)
+                        self._log("🔧 Click settings updated")
+                    clicks, burst, max_loops = plan.clicks, plan.burst, plan.max_loops
+                    click_ns, cycle_ns = plan.click_interval_ns, plan.cycle_interval_ns
+                    # The click template is chosen once per plan: plain/multi-press, or press-hold-release
+                    click_events = 2 * plan.presses * (len(plan.keys) or 1)
+                    click = self._held_click(plan, timer) if plan.hold_ns else send_click
+                    # A click can't start before the previous one's hold ended, and successive
+                    # multi-clicks must be further apart than the double-click time
+                    min_click_ns = plan.presses * plan.hold_ns
+                    if plan.presses > 1 and not plan.keys:
+                        min_click_ns += self.backend.double_click_time_ns()
+                    if click_ns < min_click_ns:
+                        click_ns = min_click_ns
+                        self._log(f"🖱️ Click delay raised to {min_click_ns / 1e6:.0f} ms to fit hold/double-click time")
+                    scheduler.catch_up = plan.catch_up
+                    if min_click_ns and plan.catch_up != CATCH_UP_SKIP:
+                        # Caught-up clicks go out back to back, which would cut holds short or merge multi-clicks
+                        scheduler.catch_up = CATCH_UP_SKIP
+                        self._log("⏭️ Missed clicks are skipped: held and multi-clicks can't be caught up in a burst")
+                    if holding:
+                        requested += len(holding)
+                        inserted += self._release_held(holding)
+                    # Sequences are compiled to absolute-coordinate buffers once per plan
+                    actions = compile_sequence(plan.sequence, self.backend) if plan.sequence else ()
+                    if plan.macro_path:
+                        # Recorded macros stream from a memory-mapped file, one bounded chunk at a time
+                        actions = MacroStream(plan.macro_path, self.backend)
+                    # Decided by the plan, not by ``actions``: an empty macro is falsy but still a playback
+                    playback = bool(plan.sequence or plan.macro_path)
+                    if playback and not len(actions):
+                        self._log("⚠️ Nothing to play: the sequence or macro is empty")
+                        break
+                    if jitter is not None:
+                        jitter.close()
+                        jitter = None
+                    if trigger is not None:
+                        trigger.close()
+                        trigger = None
+                    if self.guard is not None and self.guard.condition != plan.guard:
+                        self.guard.stop()
+                        self.guard = None
+                    if plan.guard is not None and self.guard is None:
+                        # Hook-fed flag: the loop reads ``guard.allowed`` without any syscall
+                        self.guard = create_guard(plan.guard)
+                        self.guard.start()
+                    guard = self.guard
+                    if plan.pixel_trigger is not None or plan.template_trigger is not None:
+                        # Capture context is opened once per plan for the ROI only
+                        if self.capture is None:
+                            self.capture = create_capture_backend()
+                        if plan.pixel_trigger is not None:
+                            trigger = PixelTrigger(self.capture, plan.pixel_trigger)
+                        else:
+                            trigger = TemplateTrigger(
+                                self.capture, plan.template_trigger, self._matching_pool(), self.backend.virtual_desktop()
+                            )
+                    aiming = plan.template_trigger is not None and plan.template_trigger.click_at_match
+                    click_many = send_burst
+                    if aiming:
+                        # Each click goes to the latest match; the prebuilt buffer's target is patched in place
+                        send_at = self.backend.click_at
+                        click = lambda target=trigger: send_at(*target.target)
+                        click_events += 1
+                        # A burst template clicks wherever the cursor is, so bursts repeat the aimed click
+                        click_many = lambda count, click=click: sum(click() for _ in range(count))
+                    if plan.humanized and not (playback or burst):
+                        # Jitter is drawn in large batches off-thread (the index carries across cycles);
+                        # the loop only indexes lists
+                        offset_px = 0 if plan.hold_ns or plan.keys or aiming else plan.offset_px
+                        jitter = JitterBuffer(plan.jitter, plan.jitter_ns, offset_px, clicks)
+                        delays = ()
+                        j = 0
+                    rate = None
+                    if plan.target_cps:
+                        # CPS mode: a continuous schedule, cycles only group clicks
+                        rate = RateController(
+                            min(plan.target_cps, 1e9 / min_click_ns) if min_click_ns else plan.target_cps
+                        )
+                        rate.start(clock())
+                        click_ns = rate.interval_ns
+                        cycle_ns = clicks * click_ns if burst else 0
+                if max_loops and cycle_count >= max_loops:
+                    break
+                if guard is not None and not guard.allowed:
+                    self._pause_for_guard(guard, timer, scheduler, rate)
+                    continue
+                if playback:
+                    for buffer, events, wait_ns, step_clicks, held in actions:
+                        if not self.running:
+                            break
+                        if guard is not None and not guard.allowed:
+                            self._pause_for_guard(guard, timer, scheduler, rate)
+                        # Releases are never gated: a skipped one would leave the input pressed
+                        releasing = held is not None and held[1] is None
+                        if trigger is not None and not releasing and not trigger.matches():
+                            gated += 1
+                            telemetry.missed += wait(wait_ns)
+                            continue
+                        record(scheduler.deadline, clock(), step_clicks)
+                        requested += events
+                        inserted += send(buffer)
+                        if held is not None:
+                            if releasing:
+                                holding.pop(held[0], None)
+                            else:
+                                holding[held[0]] = held[1]
+                        self.clicks_done += step_clicks
+                        telemetry.missed += wait(wait_ns)
+                elif burst and trigger is not None and not trigger.matches():
+                    gated += clicks
+                elif burst:
+                    # Whole cycle in one SendInput call; intra-click delay is ignored
+                    record(scheduler.deadline, clock(), clicks)
+                    requested += click_events * clicks
+                    inserted += click_many(clicks)
+                    self.clicks_done += clicks
+                    if rate:
+                        cycle_ns = clicks * rate.tick(clock(), clicks)
+                else:
+                    done = 0
+                    while done < clicks and self.running:
+                        if guard is not None and not guard.allowed:
+                            self._pause_for_guard(guard, timer, scheduler, rate)
+                            continue
+                        delay_ns = click_ns
+                        if trigger is not None and not trigger.matches():
+                            # Condition not met: let this slot pass without clicking
+                            gated += 1
+                        elif jitter is None:
+                            record(scheduler.deadline, clock())
+                            requested += click_events
+                            inserted += click()
+                            self.clicks_done += 1
+                        else:
+                            record(scheduler.deadline, clock())
+                            if j == len(delays):
+                                delays, xs, ys = jitter.next_batch()
+                                j = 0
+                            dx, dy = xs[j], ys[j]
+                            requested += click_events + 2 if dx or dy else click_events
+                            inserted += send_offset(dx, dy) if dx or dy else click()
+                            delay_ns = max(min_click_ns, click_ns + delays[j])
+                            j += 1
+                            self.clicks_done += 1
+                        done += 1
+                        if rate:
+                            click_ns = rate.tick(clock())
+                        # Only this cycle's slots can be missed here; lateness past its last
+                        # slot eats into the cycle delay below
+                        missed = wait(delay_ns, clicks - done)
+                        if missed:
+                            telemetry.missed += missed
+                            # Behind schedule: burst the missed clicks or drop them
+                            extra = scheduler.catch_up_count(missed)
+                            if extra and not self._may_click(guard, trigger):
+                                extra = 0
+                            if extra:
+                                record(scheduler.deadline, clock(), extra)
+                                requested += click_events * extra
+                                inserted += click_many(extra)
+                                self.clicks_done += extra
+                                if rate:
+                                    # Caught-up clicks count towards the achieved rate
+                                    click_ns = rate.tick(clock(), extra)
+                            skipped += missed - extra
+                            done += missed
+                cycle_count += 1
+                self.cycles_done = cycle_count
+                # The next cycle starts cycle_ns after this one's last slot, however late that ran
+                wait(cycle_ns, 0)
+                if playback:
+                    continue
+                period_ns = cycle_ns if burst else clicks * click_ns + cycle_ns
+                late_ns = clock() - scheduler.deadline
+                if period_ns and late_ns >= period_ns:
+                    # Whole cycles overdue: jump the grid over them and count their clicks as missed
+                    cycles = late_ns // period_ns
+                    if max_loops:
+                        cycles = min(cycles, max_loops - cycle_count)
+                    scheduler.advance(cycles * period_ns)
+                    cycle_count += cycles
+                    self.cycles_done = cycle_count
+                    missed = cycles * clicks
+                    telemetry.missed += missed
+                    extra = scheduler.catch_up_count(missed)
+                    if extra and not self._may_click(guard, trigger):
+                        extra = 0
+                    if extra:
+                        record(scheduler.deadline, clock(), extra)
+                        requested += click_events * extra
+                        inserted += click_many(extra)
+                        self.clicks_done += extra
+                        if rate:
+                            rate_ns = rate.tick(clock(), extra)
+                            if burst:
+                                cycle_ns = clicks * rate_ns
+                            else:
+                                click_ns = rate_ns
+                    skipped += missed - extra
+        except Exception as e:
+            self._log(f"❌ Clicker error: {e}")
+        finally:
+            if jitter is not None:
+                jitter.close()
+            if self.guard is not None:
+                self.guard.stop()
+                self.guard = None
+            if trigger is not None:
+                self._log(
+                    f"🎯 {trigger.name} held back {gated} clicks "
+                    f"(worst check {trigger.max_check_ns / 1000:.0f} µs over {trigger.checks} checks)"
+                )
+                trigger.close()
+            if holding:
+                # A stop mid-hold still releases everything before the run ends
+                requested += len(holding)
+                inserted += self._release_held(holding)
+            if self._stop_requested_ns:
+                self.last_stop_latency_ns = self.clock() - self._stop_requested_ns
+                self._stop_requested_ns = 0
+                self._log(f"⏹️ Stop latency: {self.last_stop_latency_ns / 1000:.0f} µs")
+            self.backend.close()
+            self._report_injection(requested, inserted)
+            if skipped:
+                self._log(f"⏭️ Skipped {skipped} overdue clicks")
+            if self.last_start_latency_ns is not None:
+                self._log(f"▶️ Start latency: {self.last_start_latency_ns / 1000:.0f} µs")
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        """Spawn the parked worker thread on first use (caller holds the lock)."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._worker, name="ClickerEngine", daemon=True)
+            self.thread.start()
+
+    def _worker(self) -> None:
+        """Park on the condition variable; run one click loop per arm."""
+        # Timer resolution is requested once for the worker's lifetime, not per run
+        self._enable_precision_timer()
+        try:
+            while True:
+                self._calibrate_idle()
+                with self._cond:
+                    self._cond.wait_for(lambda: self.state != STATE_IDLE or self._shutdown)
+                    if self._shutdown:
+                        return
+                self.last_start_latency_ns = None
+                self._run_with_priority()
+                with self._cond:
+                    self.running = False
+                    self.state = STATE_IDLE
+                    self._cond.notify_all()
+        finally:
+            timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.close()
+            self._disable_precision_timer()
+            with self._cond:
+                self.running = False
+                self.state = STATE_IDLE
+                self._cond.notify_all()
+
+    def _run_with_priority(self) -> None:
+        """Run one click loop at the configured priority and report the jitter change."""
+        level, core = self.thread_priority, self.cpu_core
+        label = describe_priority(level, core)
+        before: Optional[TimingStats] = None
+        if label != self._priority_label and self.telemetry.count:
+            # The previous run's samples are still buffered: that's the "before"
+            before = self.telemetry.stats()
+        restore = None
+        if level != PRIORITY_NORMAL or core is not None:
+            restore, notes = apply_thread_priority(level, core)
+            for note in notes:
+                self._log(f"⚠️ Thread priority: {note}")
+        try:
+            self._click_loop()
+        finally:
+            if restore is not None:
+                restore()
+        if before is not None:
+            after = self.telemetry.stats()
+            self._log(
+                f"📈 Jitter p99 {before.p99_jitter_us:.0f} µs ({self._priority_label}) → "
+                f"{after.p99_jitter_us:.0f} µs ({label}); "
+                f"mean {before.mean_jitter_us:.0f} → {after.mean_jitter_us:.0f} µs"
+            )
+        self._priority_label = label
+
+    def _acquire_timer(self, profile: str) -> PrecisionTimer:
+        """Return the worker's timer for ``profile``, re-armed for a fresh run."""
+        if self._timer is None or self._timer_profile != profile:
+            old = self._timer
+            self._timer = self._create_timer(profile)
+            self._timer_profile = profile
+            if old is not None:
+                old.close()
+        else:
+            self._timer.reset()
+        # A stop that raced the re-arm must still win
+        if not self.running:
+            self._timer.interrupt()
+        return self._timer
+
+    def _pause_for_guard(
+        self, guard: ClickGuard, timer: PrecisionTimer, scheduler: DeadlineScheduler, rate: Optional[RateController]
+    ) -> None:
+        """Park while the guard disallows clicking, then restart the schedule from now."""
+        self._log("⏸️ Paused: cursor outside the region or target window not in front")
+        while self.running and not guard.allowed:
+            # Only the cached flag is read here; the timer keeps the pause interruptible
+            timer.sleep_ns(self.GUARD_POLL_NS)
+        if not self.running:
+            return
+        # Paused time is not "missed": re-anchor instead of catching up
+        scheduler.start()
+        if rate:
+            rate.start(self.clock())
+        self._log("▶️ Resumed")
+
+    @staticmethod
+    def _may_click(guard: Optional[ClickGuard], trigger) -> bool:
+        """Whether catch-up clicks may go out now: they obey the guard and trigger like any other click."""
+        return (guard is None or guard.allowed) and (trigger is None or trigger.matches())
+
+    def _matching_pool(self) -> ThreadPoolExecutor:
+        """Shared worker pool for image matching, created on first use."""
+        if self._match_pool is None:
+            self._match_pool = ThreadPoolExecutor(max_workers=self.MATCH_WORKERS, thread_name_prefix="TemplateMatch")
+        return self._match_pool
+
+    def _prepare_backend(self, plan: ClickPlan) -> None:
+        """Build the backend's click template for ``plan``: a mouse click or a key chord tap."""
+        # One array sized for the largest burst of the run, including catch-up bursts
+        size = plan.clicks if plan.burst else 1
+        if plan.catch_up == CATCH_UP_BURST:
+            size = max(size, MAX_CATCH_UP)
+        if plan.keys:
+            self.backend.prepare(size, keys=chord_template(plan.keys, plan.presses))
+        else:
+            self.backend.prepare(size, click_template(plan.button, plan.presses))
+
+    def _held_click(self, plan: ClickPlan, timer: PrecisionTimer) -> Callable[[], int]:
+        """Build a press-hold-release click for ``plan`` from prebuilt press/release buffers."""
+        if plan.keys:
+            down, up = chord_events(plan.keys)
+            press, release = self.backend.compile_keys(down), self.backend.compile_keys(up)
+        else:
+            down, up = button_events(plan.button)
+            press, release = self.backend.compile_mouse([down]), self.backend.compile_mouse([up])
+        send, sleep_until, clock = self.backend.send, timer.sleep_until, self.clock
+        hold_ns, presses = plan.hold_ns, plan.presses
+
+        def click() -> int:
+            sent = 0
+            for _ in range(presses):
+                sent += send(press)
+                # Interruptible: a stop cuts the hold short, but the button is still released
+                sleep_until(clock() + hold_ns)
+                sent += send(release)
+            return sent
+        return click
+
+    def _release_held(self, holding: Dict[object, object]) -> int:
+        """Send the release (one input event each) for everything in ``holding``."""
+        inserted = 0
+        for release in holding.values():
+            inserted += self.backend.send(release)
+        holding.clear()
+        return inserted
+
+    def _create_timer(self, profile: str) -> PrecisionTimer:
+        """Create the run timer without calibrating it.
+
+        Until idle calibration has measured a profile, its hybrid timer spins
+        for the whole budget: accurate, just more CPU for the first run.
+        """
+        if self.timer_factory is not None:
+            return self.timer_factory(profile)
+        return create_profile_timer(profile, self._spin_margins.get(profile, TIMING_PROFILES.get(profile, 0)))
+
+    def _calibrate_idle(self) -> None:
+        """Calibrate every hybrid profile while parked; a start aborts it between samples."""
+        if self.timer_factory is not None:
+            return
+        busy = lambda: self.state != STATE_IDLE or self._shutdown
+        for profile, spin_budget in TIMING_PROFILES.items():
+            if spin_budget <= 0 or profile in self._spin_margins:
+                continue
+            timer = HybridTimer(create_timer(), spin_budget)
+            self._calibration_timer = timer
+            try:
+                margin = timer.calibrate(abort=busy)
+            finally:
+                self._calibration_timer = None
+                timer.close()
+            if margin is None:
+                # A run was armed: it starts at the full spin budget and calibration resumes once idle
+                return
+            self._spin_margins[profile] = margin
+            if isinstance(self._timer, HybridTimer) and self._timer_profile == profile:
+                self._timer.margin_ns = margin
+            self._log(f"⏱️ {profile} timing calibrated: spin margin {margin / 1000:.0f} µs")
+
+    def _interrupt_calibration(self) -> None:
+        timer = self._calibration_timer
+        if timer is not None:
+            timer.interrupt()
+
+    def _report_injection(self, requested: int, inserted: int) -> None:
+        """Log how many input events the OS actually accepted."""
+        if not requested:
+            return
+        status = "✅" if inserted == requested else "⚠️"
+        self._log(f"{status} Input events inserted: {inserted}/{requested}")
+
+    # ------------------------------------------------------------------
+    # Windows 11 specifics
+    # ------------------------------------------------------------------
+    def _ensure_uiAccess(self) -> None:
+        """Ensure we can send input to elevated/UWP windows."""
+        # Try to allow UIAccess for this process (best-effort)
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()
+        except Exception:
+            pass
+
+    def _enable_precision_timer(self) -> None:
+        """Request 1 ms timer resolution for stable delays."""
+        if sys.platform == "win32":
+            ctypes.windll.winmm.timeBeginPeriod(1)
+
+    def _disable_precision_timer(self) -> None:
+        """Release precision timer."""
+        if sys.platform == "win32":
+            ctypes.windll.winmm.timeEndPeriod(1)
@@ -0,0 +1,365 @@
+import json
+import time
+import socket
+import itertools
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple
+from src.Public.click_plan import ClickPlan
+from src.Public.clicker_engine import ClickerEngine
+from src.Public.job_scheduler import JobScheduler, job_from_dict
+
+# ------------------------------------------------------------------
+# Protocol
+# ------------------------------------------------------------------
+# One JSON object per line in both directions. Requests look like
+# {"id": 1, "cmd": "start", "settings": {...}}; every request gets exactly one
+# reply {"id": 1, "ok": true, ...} or {"id": 1, "ok": false, "error": "..."}.
+# Subscribed connections also receive {"event": "metrics", ...} lines.
+PROTOCOL_VERSION: Final[int] = 1
+LEGACY_ACTIVATE: Final[bytes] = b"ACTIVATE"
+MAX_LINE_BYTES: Final[int] = 64 * 1024
+DEFAULT_METRICS_INTERVAL: Final[float] = 0.5
+MIN_METRICS_INTERVAL: Final[float] = 0.05
+
+# Fills in whatever a remote plan leaves out until UI settings are attached
+DEFAULT_PLAN_SETTINGS: Final[Dict[str, Any]] = {
+    "clicks": 1,
+    "max_loops": 0,
+    "click_delay": 0.1,
+    "cycle_delay": 0.0,
+}
+
+class ControlError(Exception):
+    """A request that can't be carried out; its message goes back to the client."""
+
+class ControlSession:
+    """One persistent client connection, served on its own thread.
+
+    The thread is the only writer to the socket, so replies and metrics
+    events never interleave. While subscribed, the receive timeout doubles
+    as the metrics clock: a timeout means "push the next sample".
+    """
+
+    RECV_BYTES: Final[int] = 4096
+
+    def __init__(self, server: "ControlServer", sock: socket.socket) -> None:
+        self.server = server
+        self.sock = sock
+        self.metrics_interval: Optional[float] = None
+        self._next_metrics = 0.0
+        self._buffer = b""
+        self.thread = threading.Thread(target=self._run, name="ControlSession", daemon=True)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.sock.sendall(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    def close(self) -> None:
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _run(self) -> None:
+        try:
+            while self.server.running:
+                self.sock.settimeout(self._timeout())
+                try:
+                    data = self.sock.recv(self.RECV_BYTES)
+                except socket.timeout:
+                    self._push_metrics()
+                    continue
+                if not data:
+                    # Pre-protocol clients send a bare b"ACTIVATE" and hang up
+                    if self._buffer.strip() == LEGACY_ACTIVATE:
+                        self.server.activate()
+                    return
+                self._buffer += data
+                while b"\n" in self._buffer:
+                    line, self._buffer = self._buffer.split(b"\n", 1)
+                    if line.strip():
+                        self.send(self.server.handle_line(line, self))
+                if len(self._buffer) > MAX_LINE_BYTES:
+                    self.send({"ok": False, "error": f"Line longer than {MAX_LINE_BYTES} bytes"})
+                    return
+                if self.metrics_interval is not None and time.monotonic() >= self._next_metrics:
+                    self._push_metrics()
+        except OSError:
+            pass
+        finally:
+            self.server.discard(self)
+            self.close()
+
+    def _timeout(self) -> Optional[float]:
+        if self.metrics_interval is None:
+            return self.server.POLL_INTERVAL
+        return max(0.0, min(self._next_metrics - time.monotonic(), self.server.POLL_INTERVAL))
+
+    def _push_metrics(self) -> None:
+        if self.metrics_interval is None or time.monotonic() < self._next_metrics:
+            return
+        self._next_metrics = time.monotonic() + self.metrics_interval
+        self.send({"event": "metrics", **self.server.snapshot()})
+
+    def subscribe(self, interval: float) -> None:
+        self.metrics_interval = interval
+        self._next_metrics = time.monotonic()
+
+class ControlServer:
+    """Dispatches line-delimited JSON commands to a ClickerEngine.
+
+    Qt-free: the owner accepts connections (the singleton lock socket) and
+    hands each one to ``serve``. Everything here only calls the engine's
+    thread-safe API, so a GUI picks up remote starts/stops through its usual
+    engine polling. ``on_activate`` is called for ``activate`` requests.
+    """
+
+    POLL_INTERVAL: Final[float] = 0.5
+
+    def __init__(self, on_activate: Optional[Callable[[], None]] = None) -> None:
+        self.on_activate = on_activate
+        self.engine: Optional[ClickerEngine] = None
+        # Full settings of the current plan; each remote change is layered over them
+        self.settings: Dict[str, Any] = dict(DEFAULT_PLAN_SETTINGS)
+        self.plan: Optional[ClickPlan] = None
+        # Created on the first add_job; runs next to the engine with its own backend
+        self.jobs: Optional[JobScheduler] = None
+        self.running = True
+        self._sessions: List[ControlSession] = []
+        self._lock = threading.Lock()
+        self._commands: Dict[str, Callable[[Dict[str, Any], ControlSession], Dict[str, Any]]] = {
+            "hello": self._cmd_hello,
+            "activate": self._cmd_activate,
+            "start": self._cmd_start,
+            "stop": self._cmd_stop,
+            "set_plan": self._cmd_set_plan,
+            "get_stats": self._cmd_get_stats,
+            "subscribe": self._cmd_subscribe,
+            "unsubscribe": self._cmd_unsubscribe,
+            "add_job": self._cmd_add_job,
+            "remove_job": self._cmd_remove_job,
+            "list_jobs": self._cmd_list_jobs,
+        }
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+    def attach(self, engine: ClickerEngine, settings: Optional[Dict[str, Any]] = None) -> None:
+        """Route commands to ``engine``; ``settings`` fill gaps in remote plans."""
+        self.engine = engine
+        if settings is not None:
+            self.use_settings(settings)
+
+    def use_settings(self, settings: Dict[str, Any]) -> None:
+        """Adopt a plan compiled elsewhere (the GUI form) as the base for remote changes."""
+        self.settings = dict(settings)
+        self.plan = None
+
+    def serve(self, sock: socket.socket) -> ControlSession:
+        """Serve an accepted connection until the client disconnects."""
+        session = ControlSession(self, sock)
+        with self._lock:
+            if not self.running:
+                session.close()
+                return session
+            self._sessions.append(session)
+        session.thread.start()
+        return session
+
+    def discard(self, session: ControlSession) -> None:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def close(self) -> None:
+        """Disconnect every client and stop any remote jobs."""
+        with self._lock:
+            self.running = False
+            sessions, self._sessions = self._sessions, []
+            jobs, self.jobs = self.jobs, None
+        for session in sessions:
+            session.close()
+        if jobs is not None:
+            jobs.shutdown()
+
+    def activate(self) -> None:
+        if self.on_activate is not None:
+            self.on_activate()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def handle_line(self, line: bytes, session: ControlSession) -> Dict[str, Any]:
+        """Decode one request line and return its reply."""
+        if line.strip() == LEGACY_ACTIVATE:
+            self.activate()
+            return {"ok": True}
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ControlError("Request must be a JSON object")
+            request_id = request.get("id")
+            command = self._commands.get(request.get("cmd"))
+            if command is None:
+                raise ControlError(f"Unknown command: {request.get('cmd')}")
+            reply = {"ok": True, **command(request, session)}
+        except (ControlError, ValueError, KeyError, TypeError) as e:
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Anything else is still this request's failure: the session must survive it
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if request_id is not None:
+            reply["id"] = request_id
+        return reply
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Engine counters and timing stats as a JSON-ready dict."""
+        engine = self._engine()
+        return {
+            "state": engine.state,
+            "runs": engine.runs,
+            "clicks": engine.clicks_done,
+            "cycles": engine.cycles_done,
+            "timing": engine.telemetry.stats().to_dict(),
+        }
+
+    def _engine(self) -> ClickerEngine:
+        if self.engine is None:
+            raise ControlError("No clicker engine attached")
+        return self.engine
+
+    def _compile(self, request: Dict[str, Any]) -> Tuple[ClickPlan, Dict[str, Any]]:
+        """Layer the request's settings over the current plan's; return the plan and merged settings."""
+        settings = request.get("settings") or {}
+        if not isinstance(settings, dict):
+            raise ControlError("settings must be a JSON object")
+        merged = {**self.settings, **settings}
+        return ClickPlan.compile(merged), merged
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+    def _cmd_hello(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        return {"protocol": PROTOCOL_VERSION, "commands": sorted(self._commands)}
+
+    def _cmd_activate(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        self.activate()
+        return {}
+
+    def _cmd_start(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        engine = self._engine()
+        if "settings" in request or self.plan is None:
+            plan, settings = self._compile(request)
+        else:
+            plan, settings = self.plan, self.settings
+        if not engine.start(plan):
+            raise ControlError(f"Engine is {engine.state}, not Idle")
+        self.plan, self.settings = plan, settings
+        return {"run": engine.runs}
+
+    def _cmd_stop(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        engine = self._engine()
+        engine.stop()
+        if request.get("wait"):
+            engine.join(float(request.get("timeout", engine.JOIN_TIMEOUT)))
+        return {"state": engine.state}
+
+    def _cmd_set_plan(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        engine = self._engine()
+        self.plan, self.settings = self._compile(request)
+        applied = engine.running
+        if applied:
+            engine.swap_plan(self.plan)
+        return {"applied": applied}
+
+    def _cmd_get_stats(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        return self.snapshot()
+
+    def _cmd_subscribe(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        self._engine()
+        interval = max(MIN_METRICS_INTERVAL, float(request.get("interval_ms", DEFAULT_METRICS_INTERVAL * 1000)) / 1000)
+        session.subscribe(interval)
+        return {"interval_ms": round(interval * 1000)}
+
+    def _cmd_unsubscribe(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        session.metrics_interval = None
+        return {}
+
+    def _cmd_add_job(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        name = request.get("name")
+        job = request.get("job")
+        if not isinstance(name, str) or not name:
+            raise ControlError("add_job needs a name")
+        if not isinstance(job, dict):
+            raise ControlError("job must be a JSON object")
+        with self._lock:
+            if self.jobs is None:
+                self.jobs = JobScheduler()
+            scheduler = self.jobs
+        scheduler.add_job(job_from_dict(name, job, scheduler.backend))
+        return {"jobs": len(scheduler.jobs())}
+
+    def _cmd_remove_job(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        name = request.get("name")
+        if self.jobs is None or not self.jobs.remove_job(name):
+            raise ControlError(f"No job named {name}")
+        return {}
+
+    def _cmd_list_jobs(self, request: Dict[str, Any], session: ControlSession) -> Dict[str, Any]:
+        jobs = self.jobs.jobs() if self.jobs is not None else []
+        return {"jobs": [
+            {"name": job.name, "interval_ms": job.interval_ns / 1e6, "runs": job.runs, "inserted": job.inserted}
+            for job in jobs
+        ]}
+
+class ControlClient:
+    """Minimal blocking client for the control protocol (scripts and tests).
+
+    Events that arrive while waiting for a reply are queued for ``next_event``.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1", timeout: float = 2.0) -> None:
+        self.sock = socket.create_connection((host, port), timeout)
+        self.reader = self.sock.makefile("rb")
+        self.events: deque = deque()
+        self._ids = itertools.count(1)
+
+    def request(self, cmd: str, **params: Any) -> Dict[str, Any]:
+        """Send ``cmd`` and return its reply; raises ControlError if it failed."""
+        request_id = next(self._ids)
+        self.sock.sendall(json.dumps({"id": request_id, "cmd": cmd, **params}).encode() + b"\n")
+        while True:
+            message = self._read()
+            if "event" in message:
+                self.events.append(message)
+            elif message.get("id") == request_id:
+                if not message.get("ok"):
+                    raise ControlError(message.get("error", "Request failed"))
+                return message
+
+    def next_event(self) -> Dict[str, Any]:
+        """Return the next pushed event, waiting up to the socket timeout."""
+        if self.events:
+            return self.events.popleft()
+        while True:
+            message = self._read()
+            if "event" in message:
+                return message
+
+    def _read(self) -> Dict[str, Any]:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Control connection closed")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "ControlClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
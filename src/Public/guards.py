@@ -0,0 +1,180 @@
+import sys
+import ctypes
+import threading
+from ctypes import wintypes
+from dataclasses import dataclass
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+# ------------------------------------------------------------------
+# WinEvent constants
+# ------------------------------------------------------------------
+EVENT_SYSTEM_FOREGROUND: Final[int] = 0x0003
+EVENT_OBJECT_LOCATIONCHANGE: Final[int] = 0x800B
+OBJID_CURSOR: Final[int] = -9
+WINEVENT_OUTOFCONTEXT: Final[int] = 0x0000
+WM_QUIT: Final[int] = 0x0012
+
+WINEVENTPROC = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+) if sys.platform == "win32" else None
+
+@dataclass(slots=True, frozen=True)
+class GuardCondition:
+    """Where clicking is allowed: a cursor rectangle and/or a foreground process."""
+    region: Tuple[int, ...] = ()  # (x, y, width, height); empty means anywhere
+    process: str = ""  # executable name such as "game.exe"; empty means any window
+
+    def __post_init__(self) -> None:
+        if self.region and (len(self.region) != 4 or self.region[2] <= 0 or self.region[3] <= 0):
+            raise ValueError("Guard region must be (x, y, width, height) with a positive size")
+        if not self.region and not self.process:
+            raise ValueError("Guard needs a region and/or a process name")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GuardCondition":
+        region = data.get("region") or ()
+        return cls(
+            region=tuple(int(v) for v in region),
+            process=str(data.get("process", "")).strip(),
+        )
+
+class ClickGuard:
+    """Cached "may click" flag, recomputed only when the cursor or foreground changes.
+
+    The click loop reads ``allowed`` – a plain attribute, no syscall. Event
+    sources call ``update_cursor``/``update_foreground``; this base class has
+    no source of its own, so headless runs and tests feed it directly.
+    """
+
+    name: str = "manual"
+
+    def __init__(self, condition: GuardCondition) -> None:
+        self.condition = condition
+        if condition.region:
+            x, y, width, height = condition.region
+            self._bounds = (x, y, x + width, y + height)
+        self._process = condition.process.lower()
+        self.cursor_ok = not condition.region
+        self.foreground_ok = not condition.process
+        self.allowed = self.cursor_ok and self.foreground_ok
+
+    def update_cursor(self, x: int, y: int) -> None:
+        """Bounds-test a new cursor position against the region."""
+        if self.condition.region:
+            left, top, right, bottom = self._bounds
+            self.cursor_ok = left <= x < right and top <= y < bottom
+            self.allowed = self.cursor_ok and self.foreground_ok
+
+    def update_foreground(self, process_name: str) -> None:
+        """Record the process that now owns the foreground window."""
+        if self._process:
+            self.foreground_ok = process_name.lower() == self._process
+            self.allowed = self.cursor_ok and self.foreground_ok
+
+    def start(self) -> None:
+        """Begin receiving events."""
+
+    def stop(self) -> None:
+        """Stop receiving events."""
+
+class Win32EventGuard(ClickGuard):
+    """ClickGuard fed by WinEvent hooks on a dedicated message-loop thread.
+
+    EVENT_SYSTEM_FOREGROUND reports foreground changes and
+    EVENT_OBJECT_LOCATIONCHANGE on OBJID_CURSOR reports cursor moves, so the
+    cursor position is read only when it actually changed.
+    """
+
+    name = "win32"
+    START_TIMEOUT: Final[float] = 1.0
+
+    def __init__(self, condition: GuardCondition) -> None:
+        super().__init__(condition)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        # Keep a reference: the hook calls into this for as long as it is installed
+        self._proc = WINEVENTPROC(self._on_event)
+        self._user32 = ctypes.windll.user32
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._user32.SetWinEventHook.argtypes = (
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+        )
+        self._user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+        self._user32.GetForegroundWindow.restype = wintypes.HWND
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="ClickGuard", daemon=True)
+        self._thread.start()
+        self._ready.wait(self.START_TIMEOUT)
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            thread.join(self.START_TIMEOUT)
+
+    def _run(self) -> None:
+        """Install the hooks and pump messages until WM_QUIT."""
+        user32 = self._user32
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        hooks: List[int] = []
+        try:
+            if self.condition.process:
+                hooks.append(user32.SetWinEventHook(
+                    EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT
+                ))
+                self._refresh_foreground(user32.GetForegroundWindow())
+            if self.condition.region:
+                hooks.append(user32.SetWinEventHook(
+                    EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE, None, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT
+                ))
+                self._refresh_cursor()
+            self._ready.set()
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            self._ready.set()
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread, time) -> None:
+        try:
+            if event == EVENT_SYSTEM_FOREGROUND:
+                self._refresh_foreground(hwnd)
+            elif id_object == OBJID_CURSOR:
+                self._refresh_cursor()
+        except Exception:
+            # Never let an exception escape into the hook callback
+            pass
+
+    def _refresh_cursor(self) -> None:
+        point = wintypes.POINT()
+        if self._user32.GetCursorPos(ctypes.byref(point)):
+            self.update_cursor(point.x, point.y)
+
+    def _refresh_foreground(self, hwnd) -> None:
+        import psutil
+        pid = wintypes.DWORD()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        try:
+            name = psutil.Process(pid.value).name() if pid.value else ""
+        except psutil.Error:
+            name = ""
+        self.update_foreground(name)
+
+def create_guard(condition: GuardCondition, name: Optional[str] = None) -> ClickGuard:
+    """Return the guard for ``name`` or the platform default."""
+    name = (name or ("win32" if sys.platform == "win32" else "manual")).lower()
+    if name == "win32":
+        return Win32EventGuard(condition)
+    if name == "manual":
+        return ClickGuard(condition)
+    raise ValueError(f"Unknown guard: {name}")
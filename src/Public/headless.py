@@ -0,0 +1,199 @@
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence
+from src.Public.click_plan import ClickPlan
+from src.Public.clicker_engine import ClickerEngine
+from src.Public.input_backend import BUTTON_FLAGS, CLICK_TYPES, create_input_backend, parse_chord
+from src.Public.job_scheduler import Job, JobScheduler, job_from_dict
+from src.Public.thread_priority import PRIORITY_LEVELS, PRIORITY_NORMAL
+from src.Public.timing import CATCH_UP_POLICIES, CATCH_UP_SKIP, DEFAULT_TIMING_PROFILE, MAX_CPS, TIMING_PROFILES
+
+# ------------------------------------------------------------------
+# Headless runner
+# ------------------------------------------------------------------
+# Entry-script start to first click; the interpreter's own startup comes on top
+COLD_START_TARGET_MS: Final[float] = 150.0
+DEFAULT_BURST_CLICKS: Final[int] = 10
+POLL_INTERVAL: Final[float] = 0.1
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sigma_auto_clicker",
+        description="Sigma Auto Clicker. Without a command the GUI is started.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Click without the GUI (Qt is never imported)")
+    rate = run.add_mutually_exclusive_group()
+    rate.add_argument("--cps", type=float, default=0.0, help=f"Target clicks per second (max {MAX_CPS})")
+    rate.add_argument("--delay", type=float, default=0.1, help="Seconds between clicks when --cps is not given")
+    run.add_argument("--count", type=int, default=0, help="Clicks to send; 0 runs until Ctrl+C")
+    run.add_argument("--button", choices=tuple(BUTTON_FLAGS), default="left")
+    run.add_argument("--click-type", choices=tuple(CLICK_TYPES), default="single")
+    run.add_argument("--hold-ms", type=float, default=0.0, help="Hold each press this long")
+    run.add_argument("--keys", default="", help="Press a key or chord (e.g. 'ctrl+c') instead of clicking")
+    run.add_argument(
+        "--burst", type=int, nargs="?", const=DEFAULT_BURST_CLICKS, default=0, metavar="CLICKS",
+        help=f"Send clicks in SendInput calls of this many (default {DEFAULT_BURST_CLICKS}), paced at the requested rate",
+    )
+    run.add_argument("--catch-up", choices=CATCH_UP_POLICIES, default=CATCH_UP_SKIP)
+    run.add_argument("--profile", choices=tuple(TIMING_PROFILES), default=DEFAULT_TIMING_PROFILE)
+    run.add_argument("--priority", choices=PRIORITY_LEVELS, default=PRIORITY_NORMAL)
+    run.add_argument("--core", type=int, default=None, help="Pin the click thread to this CPU core")
+    run.add_argument("--backend", choices=("win32", "recording"), default=None, help="Input backend (default: platform)")
+    run.add_argument("--export", type=Path, default=None, help="Write the stats and click timestamps to this JSON file")
+    run.add_argument("--json", action="store_true", help="Print the end-of-run stats as one JSON object")
+    run.add_argument(
+        "--cold-start-target-ms", type=float, default=COLD_START_TARGET_MS,
+        help="Warn when the first click comes later than this",
+    )
+    run.add_argument("--strict", action="store_true", help="Exit with code 3 when the cold-start target is missed")
+    jobs = commands.add_parser("jobs", help="Run several independent click/key jobs on one scheduler thread")
+    jobs.add_argument(
+        "--job", action="append", required=True, metavar="KEY=VALUE,...",
+        help="One job per flag, e.g. 'button=left,cps=20', 'keys=space,interval_ms=3000' or "
+             "'button=right,cps=2,x=800,y=600'; optional name= and max_runs=",
+    )
+    jobs.add_argument("--duration", type=float, default=0.0, help="Seconds to run; 0 runs until every job is done or Ctrl+C")
+    jobs.add_argument("--profile", choices=tuple(TIMING_PROFILES), default=DEFAULT_TIMING_PROFILE)
+    jobs.add_argument("--backend", choices=("win32", "recording"), default=None, help="Input backend (default: platform)")
+    jobs.add_argument("--json", action="store_true", help="Print the per-job counts as one JSON object")
+    return parser
+
+def parse_job_spec(text: str) -> Dict[str, Any]:
+    """Split a ``--job`` value like ``"button=left,cps=20"`` into a settings dict."""
+    spec: Dict[str, Any] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Job option '{item}' is not KEY=VALUE")
+        spec[key.strip().lower()] = value.strip()
+    return spec
+
+def plan_from_args(args: argparse.Namespace) -> ClickPlan:
+    """Translate ``run`` options into a ClickPlan.
+
+    Without ``--burst`` the ``--count`` clicks form one cycle. With it, each
+    cycle is one burst of ``--burst`` clicks, spaced so the average rate
+    stays the one asked for.
+    """
+    interval_ns = int(1e9 / args.cps) if args.cps else int(args.delay * 1_000_000_000)
+    clicks, max_loops, cycle_ns = args.count or 1, 1 if args.count else 0, 0
+    if args.burst:
+        if args.burst < 1:
+            raise ValueError("--burst needs at least 1 click per call")
+        clicks = min(args.burst, args.count) if args.count else args.burst
+        if args.count % clicks:
+            raise ValueError(f"--count must be a multiple of the burst size ({clicks})")
+        max_loops = args.count // clicks
+        # In CPS mode the engine spaces bursts itself
+        cycle_ns = 0 if args.cps else clicks * interval_ns
+    return ClickPlan(
+        clicks=clicks,
+        max_loops=max_loops,
+        click_interval_ns=interval_ns,
+        cycle_interval_ns=cycle_ns,
+        burst=bool(args.burst),
+        catch_up=args.catch_up,
+        timing_profile=args.profile,
+        target_cps=args.cps,
+        button=args.button,
+        click_type=args.click_type,
+        hold_ns=int(args.hold_ms * 1_000_000),
+        keys=parse_chord(args.keys),
+    )
+
+def run(args: argparse.Namespace, started_ns: int) -> int:
+    """Run one plan to completion (or Ctrl+C) and print the timing stats."""
+    engine = ClickerEngine(create_input_backend(args.backend), thread_priority=args.priority, cpu_core=args.core)
+    plan = plan_from_args(args)
+    armed_ns = time.perf_counter_ns()
+    if not engine.start(plan):
+        print("❌ Engine is not idle", file=sys.stderr)
+        return 1
+    try:
+        while not engine.join(POLL_INTERVAL):
+            for message in engine.drain_messages():
+                print(message, file=sys.stderr)
+    except KeyboardInterrupt:
+        engine.stop()
+        engine.join()
+    finally:
+        engine.shutdown()
+    for message in engine.drain_messages():
+        print(message, file=sys.stderr)
+
+    stats = engine.telemetry.stats()
+    start_latency_ns = engine.last_start_latency_ns or 0
+    cold_start_ms = (armed_ns - started_ns + start_latency_ns) / 1e6
+    if args.export is not None:
+        engine.telemetry.export(args.export)
+    if args.json:
+        report = stats.to_dict()
+        report.update(
+            clicks=engine.clicks_done,
+            cold_start_ms=round(cold_start_ms, 3),
+            start_latency_us=round(start_latency_ns / 1000, 1),
+            stop_latency_us=round((engine.last_stop_latency_ns or 0) / 1000, 1),
+            qt_loaded="PySide6" in sys.modules,
+        )
+        print(json.dumps(report))
+    else:
+        print(f"Clicks: {engine.clicks_done}")
+        print(stats.format())
+        print(f"Cold start: {cold_start_ms:.1f} ms (target {args.cold_start_target_ms:.0f} ms)")
+    if cold_start_ms > args.cold_start_target_ms:
+        print(f"⚠️ Cold start {cold_start_ms:.1f} ms is over the {args.cold_start_target_ms:.0f} ms target", file=sys.stderr)
+        if args.strict:
+            return 3
+    return 0
+
+def run_jobs(args: argparse.Namespace) -> int:
+    """Run every ``--job`` concurrently on one JobScheduler and print their counts."""
+    backend = create_input_backend(args.backend)
+    jobs: List[Job] = []
+    for index, text in enumerate(args.job, 1):
+        spec = parse_job_spec(text)
+        jobs.append(job_from_dict(spec.pop("name", f"job{index}"), spec, backend))
+    if len({job.name for job in jobs}) != len(jobs):
+        raise ValueError("Job names must be unique")
+    scheduler = JobScheduler(backend, args.profile)
+    deadline = time.monotonic() + args.duration if args.duration > 0 else None
+    try:
+        for job in jobs:
+            scheduler.add_job(job)
+        while scheduler.jobs() and (deadline is None or time.monotonic() < deadline):
+            time.sleep(POLL_INTERVAL if deadline is None else max(0.0, min(POLL_INTERVAL, deadline - time.monotonic())))
+            for message in scheduler.drain_messages():
+                print(message, file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.shutdown()
+    for message in scheduler.drain_messages():
+        print(message, file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({
+            "jobs": {job.name: {"runs": job.runs, "inserted": job.inserted} for job in jobs},
+            "skipped": scheduler.skipped,
+        }))
+    else:
+        for job in jobs:
+            print(f"{job.name}: {job.runs} runs, {job.inserted} events inserted")
+        print(f"Skipped runs: {scheduler.skipped}")
+    return 0
+
+def main(argv: Optional[Sequence[str]] = None, started_ns: Optional[int] = None) -> int:
+    """Parse ``argv`` and run the command; ``started_ns`` is when the entry script began."""
+    started_ns = started_ns or time.perf_counter_ns()
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "jobs":
+            return run_jobs(args)
+        return run(args, started_ns)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
@@ -0,0 +1,104 @@
+import math
+import random
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Final, List, Optional, Tuple
+
+# ------------------------------------------------------------------
+# Jitter distributions
+# ------------------------------------------------------------------
+JITTER_OFF: Final[str] = "off"
+JITTER_GAUSSIAN: Final[str] = "gaussian"
+JITTER_LOGNORMAL: Final[str] = "lognormal"
+JITTER_DISTRIBUTIONS: Final[Tuple[str, ...]] = (JITTER_OFF, JITTER_GAUSSIAN, JITTER_LOGNORMAL)
+
+# Shape of the log-normal delay; its median is the configured spread
+LOGNORMAL_SHAPE: Final[float] = 0.5
+
+# (extra delay per click in ns, x offset in px, y offset in px)
+JitterBatch = Tuple[List[int], List[int], List[int]]
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import numpy on first use (it is slow to import); None if not installed."""
+    try:
+        import numpy
+    except ImportError:  # Optional: the pure-Python generator below is used instead
+        return None
+    return numpy
+
+def generate_jitter(
+    distribution: str, spread_ns: int, offset_px: int, size: int, rng: Optional[random.Random] = None
+) -> JitterBatch:
+    """Draw ``size`` delay and cursor-offset values in one batch.
+
+    Gaussian delays are centred on zero with ``spread_ns`` standard deviation;
+    log-normal delays are shifted so their median is zero, giving the
+    right-skewed "sometimes late, rarely early" shape of human clicking.
+    Offsets are uniform integers in ``[-offset_px, offset_px]``.
+    """
+    np = _numpy()
+    if np is not None:
+        gen = np.random.default_rng(rng.getrandbits(64) if rng else None)
+        if distribution == JITTER_GAUSSIAN:
+            delays = gen.normal(0.0, spread_ns, size)
+        elif distribution == JITTER_LOGNORMAL:
+            delays = gen.lognormal(math.log(spread_ns or 1), LOGNORMAL_SHAPE, size) - spread_ns
+        else:
+            delays = np.zeros(size)
+        xs = gen.integers(-offset_px, offset_px, size, endpoint=True)
+        ys = gen.integers(-offset_px, offset_px, size, endpoint=True)
+        # Plain lists: the click loop indexes them without numpy scalar overhead
+        return delays.astype(np.int64).tolist(), xs.tolist(), ys.tolist()
+
+    rng = rng or random.Random()
+    if distribution == JITTER_GAUSSIAN:
+        delays = [int(rng.gauss(0.0, spread_ns)) for _ in range(size)]
+    elif distribution == JITTER_LOGNORMAL:
+        mu = math.log(spread_ns or 1)
+        delays = [int(rng.lognormvariate(mu, LOGNORMAL_SHAPE)) - spread_ns for _ in range(size)]
+    else:
+        delays = [0] * size
+    randint = rng.randint
+    xs = [randint(-offset_px, offset_px) for _ in range(size)]
+    ys = [randint(-offset_px, offset_px) for _ in range(size)]
+    return delays, xs, ys
+
+class JitterBuffer:
+    """Double-buffered jitter batches for the click loop.
+
+    ``next_batch`` hands out a ready batch and immediately starts generating
+    the following one on a background thread, so the click loop never draws
+    random numbers itself and rarely waits for a batch.
+    """
+
+    # Batches span many cycles: one submit + result per click would cost more than drawing inline
+    MIN_BATCH: Final[int] = 1024
+    MAX_BATCH: Final[int] = 65_536
+
+    def __init__(self, distribution: str, spread_ns: int, offset_px: int, batch_size: int, seed: Optional[int] = None) -> None:
+        if distribution not in JITTER_DISTRIBUTIONS:
+            raise ValueError(f"Unknown jitter distribution: {distribution}")
+        self.distribution = distribution
+        self.spread_ns = max(0, spread_ns)
+        self.offset_px = max(0, offset_px)
+        self.batch_size = max(self.MIN_BATCH, min(batch_size, self.MAX_BATCH))
+        self._rng = random.Random(seed)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="JitterFill")
+        self._next: Future = self._submit()
+
+    def _submit(self) -> Future:
+        return self._executor.submit(
+            generate_jitter, self.distribution, self.spread_ns, self.offset_px, self.batch_size, self._rng
+        )
+
+    def next_batch(self) -> JitterBatch:
+        """Return the prefilled batch and start filling the next one."""
+        batch = self._next.result()
+        self._next = self._submit()
+        return batch
+
+    def close(self) -> None:
+        """Stop the background filler."""
+        self._next.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,393 @@
+import sys
+import time
+import ctypes
+from array import array
+from ctypes import wintypes
+from typing import Any, Callable, Dict, Final, List, Optional, Sequence, Tuple
+
+# ------------------------------------------------------------------
+# Win32 INPUT structures (defined once at import, never per click)
+# ------------------------------------------------------------------
+INPUT_MOUSE: Final[int] = 0
+INPUT_KEYBOARD: Final[int] = 1
+INPUT_HARDWARE: Final[int] = 2
+
+MOUSEEVENTF_MOVE: Final[int] = 0x0001
+MOUSEEVENTF_LEFTDOWN: Final[int] = 0x0002
+MOUSEEVENTF_LEFTUP: Final[int] = 0x0004
+MOUSEEVENTF_RIGHTDOWN: Final[int] = 0x0008
+MOUSEEVENTF_RIGHTUP: Final[int] = 0x0010
+MOUSEEVENTF_MIDDLEDOWN: Final[int] = 0x0020
+MOUSEEVENTF_MIDDLEUP: Final[int] = 0x0040
+MOUSEEVENTF_XDOWN: Final[int] = 0x0080
+MOUSEEVENTF_XUP: Final[int] = 0x0100
+MOUSEEVENTF_WHEEL: Final[int] = 0x0800
+MOUSEEVENTF_HWHEEL: Final[int] = 0x1000
+MOUSEEVENTF_VIRTUALDESK: Final[int] = 0x4000
+MOUSEEVENTF_ABSOLUTE: Final[int] = 0x8000
+
+XBUTTON1: Final[int] = 0x0001
+XBUTTON2: Final[int] = 0x0002
+
+# (down, up) flags per button name
+BUTTON_FLAGS: Final[Dict[str, Tuple[int, int]]] = {
+    "left": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    "right": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+    "middle": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+    "x1": (MOUSEEVENTF_XDOWN, MOUSEEVENTF_XUP),
+    "x2": (MOUSEEVENTF_XDOWN, MOUSEEVENTF_XUP),
+}
+# mouseData for buttons that share flags
+BUTTON_DATA: Final[Dict[str, int]] = {"x1": XBUTTON1, "x2": XBUTTON2}
+
+# Presses per click type
+CLICK_TYPES: Final[Dict[str, int]] = {"single": 1, "double": 2, "triple": 3}
+
+KEYEVENTF_EXTENDEDKEY: Final[int] = 0x0001
+KEYEVENTF_KEYUP: Final[int] = 0x0002
+KEYEVENTF_SCANCODE: Final[int] = 0x0008
+WHEEL_DELTA: Final[int] = 120
+
+# Virtual-key codes by name (letters and digits map to their ASCII codes)
+VK_CODES: Final[Dict[str, int]] = {
+    "backspace": 0x08, "tab": 0x09, "enter": 0x0D, "shift": 0x10, "ctrl": 0x11, "alt": 0x12,
+    "pause": 0x13, "capslock": 0x14, "esc": 0x1B, "space": 0x20, "pageup": 0x21, "pagedown": 0x22,
+    "end": 0x23, "home": 0x24, "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "insert": 0x2D, "delete": 0x2E, "win": 0x5B,
+    **{chr(c).lower(): c for c in range(ord("A"), ord("Z") + 1)},
+    **{chr(c): c for c in range(ord("0"), ord("9") + 1)},
+    **{f"f{i}": 0x6F + i for i in range(1, 25)},
+}
+VK_ALIASES: Final[Dict[str, str]] = {
+    "control": "ctrl", "return": "enter", "escape": "esc", "del": "delete", "ins": "insert",
+    "pgup": "pageup", "pgdn": "pagedown", "windows": "win", "cmd": "win",
+}
+# Keys that need KEYEVENTF_EXTENDEDKEY to avoid being read as their numpad twins
+EXTENDED_VKS: Final[frozenset] = frozenset((0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E, 0x5B))
+
+SM_XVIRTUALSCREEN: Final[int] = 76
+SM_YVIRTUALSCREEN: Final[int] = 77
+SM_CXVIRTUALSCREEN: Final[int] = 78
+SM_CYVIRTUALSCREEN: Final[int] = 79
+
+# (flags, dx, dy, mouseData) – backend-neutral description of one mouse event
+MouseEvent = Tuple[int, int, int, int]
+# (virtual-key code, scan code, flags) – backend-neutral description of one key event
+KeyEvent = Tuple[int, int, int]
+
+def button_events(button: str) -> Tuple[MouseEvent, MouseEvent]:
+    """Return the (down, up) mouse events for ``button``."""
+    down, up = BUTTON_FLAGS[button]
+    data = BUTTON_DATA.get(button, 0)
+    return (down, 0, 0, data), (up, 0, 0, data)
+
+def click_template(button: str = "left", presses: int = 1) -> List[MouseEvent]:
+    """Return the down/up events of one (multi-)click of ``button``."""
+    return list(button_events(button)) * presses
+
+def parse_chord(text: str) -> Tuple[int, ...]:
+    """Parse a chord such as ``"ctrl+shift+a"`` into virtual-key codes."""
+    vks = []
+    for name in (part.strip().lower() for part in text.split("+")):
+        if not name:
+            continue
+        name = VK_ALIASES.get(name, name)
+        if name not in VK_CODES:
+            raise ValueError(f"Unknown key: {name}")
+        vks.append(VK_CODES[name])
+    return tuple(vks)
+
+def chord_events(vks: Sequence[int]) -> Tuple[List[KeyEvent], List[KeyEvent]]:
+    """Return the (press, release) key events of a chord; releases go in reverse order."""
+    press = [(vk, 0, KEYEVENTF_EXTENDEDKEY if vk in EXTENDED_VKS else 0) for vk in vks]
+    release = [(vk, scan, flags | KEYEVENTF_KEYUP) for vk, scan, flags in reversed(press)]
+    return press, release
+
+def chord_template(vks: Sequence[int], presses: int = 1) -> List[KeyEvent]:
+    """Return the key events of one (repeated) tap of a chord."""
+    press, release = chord_events(vks)
+    return (press + release) * presses
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_void_p),
+    ]
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_void_p),
+    ]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+class _INPUTunion(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", wintypes.DWORD), ("union", _INPUTunion)]
+
+def make_mouse_input(flags: int, dx: int = 0, dy: int = 0, mouse_data: int = 0) -> INPUT:
+    """Build a single mouse INPUT record."""
+    inp = INPUT()
+    inp.type = INPUT_MOUSE
+    inp.union.mi.dx = dx
+    inp.union.mi.dy = dy
+    inp.union.mi.mouseData = mouse_data
+    inp.union.mi.dwFlags = flags
+    inp.union.mi.time = 0
+    inp.union.mi.dwExtraInfo = None
+    return inp
+
+def make_key_input(vk: int, scan: int = 0, flags: int = 0) -> INPUT:
+    """Build a single keyboard INPUT record."""
+    inp = INPUT()
+    inp.type = INPUT_KEYBOARD
+    inp.union.ki.wVk = vk
+    inp.union.ki.wScan = scan
+    inp.union.ki.dwFlags = flags
+    inp.union.ki.time = 0
+    inp.union.ki.dwExtraInfo = None
+    return inp
+
+# ------------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------------
+class InputBackend:
+    """Interface for click injection used by the ClickerEngine.
+
+    ``prepare`` is called once per run and should do every allocation the
+    backend needs, so that ``click`` is as cheap as possible in the hot loop.
+    """
+
+    name: str = "base"
+
+    def prepare(
+        self, burst_size: int = 1, template: Optional[Sequence[MouseEvent]] = None,
+        keys: Optional[Sequence[KeyEvent]] = None,
+    ) -> None:
+        """Allocate per-run resources.
+
+        ``template`` is the mouse events of one click (left single by default);
+        if ``keys`` is given, one "click" is that key sequence instead.
+        """
+
+    def click(self) -> int:
+        """Inject one click and return the number of events inserted."""
+        raise NotImplementedError
+
+    def burst(self, count: int) -> int:
+        """Inject ``count`` clicks at once and return the events inserted."""
+        return sum(self.click() for _ in range(count))
+
+    def click_offset(self, dx: int, dy: int) -> int:
+        """Click ``(dx, dy)`` pixels away from the cursor, then move back."""
+        return self.click() + 2
+
+    def click_at(self, nx: int, ny: int) -> int:
+        """Move to normalized absolute ``(nx, ny)`` and click there."""
+        return self.click() + 1
+
+    def compile_mouse(self, events: Sequence[MouseEvent]) -> Any:
+        """Prebuild an opaque buffer for ``events`` that ``send`` can replay."""
+        return tuple(events)
+
+    def compile_keys(self, events: Sequence[KeyEvent]) -> Any:
+        """Prebuild an opaque buffer of keyboard events that ``send`` can replay."""
+        return tuple(events)
+
+    def send(self, compiled: Any) -> int:
+        """Inject a buffer from ``compile_mouse``/``compile_keys`` and return the events inserted."""
+        raise NotImplementedError
+
+    def virtual_desktop(self) -> Tuple[int, int, int, int]:
+        """Return (left, top, width, height) of the virtual desktop."""
+        return (0, 0, 1920, 1080)
+
+    def double_click_time_ns(self) -> int:
+        """Return the system double-click time."""
+        return 500_000_000
+
+    def close(self) -> None:
+        """Release per-run resources."""
+
+class Win32InputBackend(InputBackend):
+    """SendInput backend that reuses a prepared click-template INPUT array."""
+
+    name = "win32"
+
+    def __init__(self) -> None:
+        self._send_input = None
+        self._click_inputs = None
+        self._click_events = 0
+        self._offset_inputs = None
+        self._at_inputs = None
+        self._burst_inputs = None
+        self._burst_count = 0
+        self._input_size = ctypes.sizeof(INPUT)
+
+    def prepare(
+        self, burst_size: int = 1, template: Optional[Sequence[MouseEvent]] = None,
+        keys: Optional[Sequence[KeyEvent]] = None,
+    ) -> None:
+        """Bind SendInput and build the click/burst arrays once per run; ``burst_size`` is the largest burst."""
+        if self._send_input is None:
+            send_input = ctypes.windll.user32.SendInput
+            send_input.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+            send_input.restype = wintypes.UINT
+            self._send_input = send_input
+        if keys:
+            clicks = [make_key_input(vk, scan, flags) for vk, scan, flags in keys]
+        else:
+            clicks = [make_mouse_input(f, dx, dy, data) for f, dx, dy, data in (template or click_template())]
+        self._click_events = len(clicks)
+        self._click_inputs = (INPUT * len(clicks))(*clicks)
+        # move, click, move back – the move deltas are patched in place per click
+        self._offset_inputs = (INPUT * (len(clicks) + 2))(
+            make_mouse_input(MOUSEEVENTF_MOVE), *clicks, make_mouse_input(MOUSEEVENTF_MOVE),
+        )
+        # absolute move, click – the target is patched in place per click
+        self._at_inputs = (INPUT * (len(clicks) + 1))(
+            make_mouse_input(MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK), *clicks,
+        )
+        self._build_burst(max(1, burst_size))
+
+    def click(self) -> int:
+        """Send the prepared click template."""
+        return self._send_input(self._click_events, self._click_inputs, self._input_size)
+
+    def click_offset(self, dx: int, dy: int) -> int:
+        """Send move/click/move-back as one atomic SendInput call."""
+        inputs = self._offset_inputs
+        count = self._click_events + 2
+        there, back = inputs[0].union.mi, inputs[count - 1].union.mi
+        there.dx, there.dy, back.dx, back.dy = dx, dy, -dx, -dy
+        return self._send_input(count, inputs, self._input_size)
+
+    def click_at(self, nx: int, ny: int) -> int:
+        """Send absolute-move/click as one atomic SendInput call."""
+        inputs = self._at_inputs
+        move = inputs[0].union.mi
+        move.dx, move.dy = nx, ny
+        return self._send_input(self._click_events + 1, inputs, self._input_size)
+
+    def burst(self, count: int) -> int:
+        """Send ``count`` click templates in a single SendInput call.
+
+        The array prepared for the largest burst serves every smaller one:
+        only the leading ``count`` templates are passed to SendInput.
+        """
+        if count > self._burst_count:
+            self._build_burst(count)
+        return self._send_input(self._click_events * count, self._burst_inputs, self._input_size)
+
+    def compile_mouse(self, events: Sequence[MouseEvent]) -> Tuple[Any, int]:
+        """Return a ready ``(INPUT * n, n)`` pair for ``send``."""
+        inputs = (INPUT * len(events))(*(make_mouse_input(f, dx, dy, data) for f, dx, dy, data in events))
+        return inputs, len(events)
+
+    def compile_keys(self, events: Sequence[KeyEvent]) -> Tuple[Any, int]:
+        """Return a ready ``(INPUT * n, n)`` keyboard pair for ``send``."""
+        inputs = (INPUT * len(events))(*(make_key_input(vk, scan, flags) for vk, scan, flags in events))
+        return inputs, len(events)
+
+    def send(self, compiled: Tuple[Any, int]) -> int:
+        inputs, count = compiled
+        return self._send_input(count, inputs, self._input_size)
+
+    def virtual_desktop(self) -> Tuple[int, int, int, int]:
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        return (
+            metrics(SM_XVIRTUALSCREEN),
+            metrics(SM_YVIRTUALSCREEN),
+            metrics(SM_CXVIRTUALSCREEN),
+            metrics(SM_CYVIRTUALSCREEN),
+        )
+
+    def double_click_time_ns(self) -> int:
+        return ctypes.windll.user32.GetDoubleClickTime() * 1_000_000
+
+    def close(self) -> None:
+        self._click_inputs = None
+        self._offset_inputs = None
+        self._at_inputs = None
+        self._burst_inputs = None
+        self._burst_count = 0
+
+    def _build_burst(self, count: int) -> None:
+        """Build an ``INPUT`` array holding ``count`` copies of the click template."""
+        self._burst_inputs = (INPUT * (self._click_events * count))(*(tuple(self._click_inputs) * count))
+        self._burst_count = count
+
+class RecordingInputBackend(InputBackend):
+    """In-memory backend that records clicks instead of injecting them.
+
+    Useful for measuring engine throughput on machines without a real
+    input device (Linux CI, headless boxes).
+    """
+
+    name = "recording"
+
+    def __init__(
+        self, record_timestamps: bool = True, desktop: Tuple[int, int, int, int] = (0, 0, 1920, 1080),
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        self.record_timestamps = record_timestamps
+        self.clock = clock
+        self.desktop = desktop
+        self.clicks = 0
+        self.events_sent = 0
+        self.timestamps = array("q")
+        self.template: Tuple[Any, ...] = tuple(click_template())
+
+    def prepare(
+        self, burst_size: int = 1, template: Optional[Sequence[MouseEvent]] = None,
+        keys: Optional[Sequence[KeyEvent]] = None,
+    ) -> None:
+        self.clicks = 0
+        self.events_sent = 0
+        self.timestamps = array("q")
+        self.template = tuple(keys or template or click_template())
+
+    def click(self) -> int:
+        self.clicks += 1
+        if self.record_timestamps:
+            self.timestamps.append(self.clock())
+        return len(self.template)
+
+    def burst(self, count: int) -> int:
+        self.clicks += count
+        if self.record_timestamps:
+            self.timestamps.extend((self.clock(),) * count)
+        return len(self.template) * count
+
+    def send(self, compiled: Tuple[Tuple[int, ...], ...]) -> int:
+        self.events_sent += len(compiled)
+        if self.record_timestamps:
+            self.timestamps.append(self.clock())
+        return len(compiled)
+
+    def virtual_desktop(self) -> Tuple[int, int, int, int]:
+        return self.desktop
+
+def create_input_backend(name: Optional[str] = None) -> InputBackend:
+    """Return the backend for ``name`` or the platform default."""
+    name = (name or ("win32" if sys.platform == "win32" else "recording")).lower()
+    if name == "win32":
+        return Win32InputBackend()
+    if name == "recording":
+        return RecordingInputBackend()
+    raise ValueError(f"Unknown input backend: {name}")
@@ -0,0 +1,244 @@
+import sys
+import time
+import heapq
+import ctypes
+import itertools
+import threading
+from collections import deque
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+from src.Public.click_sequence import normalize_point
+from src.Public.input_backend import (
+    BUTTON_FLAGS, MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_MOVE, MOUSEEVENTF_VIRTUALDESK,
+    InputBackend, button_events, chord_template, create_input_backend, parse_chord,
+)
+from src.Public.timing import DEFAULT_TIMING_PROFILE, MAX_CPS, PrecisionTimer, create_profile_timer
+
+class Job:
+    """A repeating input action: one prebuilt buffer sent every ``interval_ns``."""
+
+    __slots__ = ("name", "buffer", "events", "clicks", "interval_ns", "max_runs", "runs", "inserted", "deadline", "cancelled")
+
+    def __init__(self, name: str, buffer: Any, events: int, interval_ns: int, clicks: int = 0, max_runs: int = 0) -> None:
+        if interval_ns <= 0:
+            raise ValueError("Job interval must be positive")
+        if max_runs < 0:
+            raise ValueError("Job max runs cannot be negative")
+        self.name = name
+        self.buffer = buffer
+        self.events = events
+        self.clicks = clicks
+        self.interval_ns = interval_ns
+        self.max_runs = max_runs
+        self.runs = 0
+        self.inserted = 0
+        self.deadline = 0
+        self.cancelled = False
+
+def click_job(
+    name: str, backend: InputBackend, interval_ns: int, button: str = "left",
+    position: Optional[Tuple[int, int]] = None, max_runs: int = 0,
+) -> Job:
+    """Build a job that clicks ``button`` in place or at a fixed screen position."""
+    if button not in BUTTON_FLAGS:
+        raise ValueError(f"Unknown mouse button: {button}")
+    events = list(button_events(button))
+    if position is not None:
+        nx, ny = normalize_point(position[0], position[1], backend.virtual_desktop())
+        events.insert(0, (MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK, nx, ny, 0))
+    return Job(name, backend.compile_mouse(events), len(events), interval_ns, 1, max_runs)
+
+def key_job(name: str, backend: InputBackend, interval_ns: int, keys: Sequence[int], max_runs: int = 0) -> Job:
+    """Build a job that taps a key or chord of virtual-key codes in one SendInput call."""
+    events = chord_template(keys)
+    return Job(name, backend.compile_keys(events), len(events), interval_ns, 0, max_runs)
+
+def job_from_dict(name: str, data: Dict[str, Any], backend: InputBackend) -> Job:
+    """Build a click or key job from a settings dict (CLI ``--job`` or control protocol).
+
+    ``cps`` or ``interval_ms`` sets the rate; ``keys`` (a chord such as
+    ``"ctrl+s"``) makes it a key job, otherwise ``button`` is clicked in
+    place or at ``x``/``y``. ``max_runs`` limits the runs (0 = forever).
+    """
+    if "cps" in data:
+        cps = float(data["cps"])
+        if not 0 < cps <= MAX_CPS:
+            raise ValueError(f"Job CPS must be between 0 and {MAX_CPS}")
+        interval_ns = int(1_000_000_000 / cps)
+    elif "interval_ms" in data:
+        interval_ms = float(data["interval_ms"])
+        if not 0 < interval_ms < float("inf"):
+            raise ValueError(f"Job '{name}' interval must be a positive number of milliseconds")
+        interval_ns = int(interval_ms * 1_000_000)
+    else:
+        raise ValueError(f"Job '{name}' needs cps or interval_ms")
+    max_runs = int(data.get("max_runs", 0))
+    if data.get("keys"):
+        return key_job(name, backend, interval_ns, parse_chord(data["keys"]), max_runs)
+    if ("x" in data) != ("y" in data):
+        raise ValueError(f"Job '{name}' needs both x and y")
+    position = (int(data["x"]), int(data["y"])) if "x" in data else None
+    return click_job(name, backend, interval_ns, str(data.get("button", "left")).lower(), position, max_runs)
+
+class JobScheduler:
+    """Runs many repeating jobs on one thread from a min-heap of deadlines.
+
+    The heap holds ``(deadline_ns, seq, job)`` entries; the thread sleeps on
+    a single precision timer until the earliest deadline, dispatches every
+    due job and pushes it back at its next deadline. Adding a job is a heap
+    push plus a timer interrupt – O(log n), no new threads or timer handles.
+    Removed jobs are flagged and dropped lazily when they reach the top.
+    """
+
+    MESSAGE_BACKLOG: Final[int] = 1000
+    JOIN_TIMEOUT: Final[float] = 1.0
+
+    def __init__(self, backend: Optional[InputBackend] = None, timing_profile: str = DEFAULT_TIMING_PROFILE) -> None:
+        self.backend = backend or create_input_backend()
+        self.timing_profile = timing_profile
+        self.thread: Optional[threading.Thread] = None
+        self.messages: deque = deque(maxlen=self.MESSAGE_BACKLOG)
+        self.skipped = 0
+        self._heap: List[Tuple[int, int, Job]] = []
+        self._jobs: Dict[str, Job] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._timer: Optional[PrecisionTimer] = None
+        self._shutdown = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def add_job(self, job: Job, start_ns: Optional[int] = None) -> Job:
+        """Schedule ``job`` (replacing one with the same name); first run at ``start_ns`` or now."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+            previous = self._jobs.get(job.name)
+            if previous is not None:
+                previous.cancelled = True
+            job.deadline = start_ns if start_ns is not None else time.perf_counter_ns()
+            self._jobs[job.name] = job
+            heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+            is_next = self._heap[0][2] is job
+            self._ensure_worker()
+        if is_next:
+            self._wake()
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        """Cancel the job called ``name``; False if there is none."""
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.cancelled = True
+        return True
+
+    def clear(self) -> None:
+        """Cancel every job."""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def drain_messages(self) -> List[str]:
+        """Pop every queued status message (call from the consumer thread)."""
+        messages = []
+        pop = self.messages.popleft
+        while self.messages:
+            messages.append(pop())
+        return messages
+
+    def shutdown(self, timeout: Optional[float] = JOIN_TIMEOUT) -> None:
+        """Cancel all jobs and let the scheduler thread exit."""
+        with self._lock:
+            self._shutdown = True
+        self.clear()
+        self._wake()
+        thread = self.thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Scheduler thread
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        """Start the scheduler thread on first use (caller holds the lock)."""
+        if self.thread is None or not self.thread.is_alive():
+            self._timer = create_profile_timer(self.timing_profile)
+            self.thread = threading.Thread(target=self._run, name="JobScheduler", daemon=True)
+            self.thread.start()
+
+    def _wake(self) -> None:
+        timer = self._timer
+        if timer is not None:
+            timer.interrupt()
+
+    def _run(self) -> None:
+        """Sleep to the earliest deadline, dispatch due jobs, repeat."""
+        timer = self._timer
+        heap = self._heap
+        send = self.backend.send
+        clock = time.perf_counter_ns
+        if sys.platform == "win32":
+            ctypes.windll.winmm.timeBeginPeriod(1)
+        self.backend.prepare()
+        try:
+            while True:
+                # Re-arm before reading the heap so a concurrent add_job always wakes us
+                timer.reset()
+                with self._lock:
+                    if self._shutdown:
+                        return
+                    while heap and heap[0][2].cancelled:
+                        heapq.heappop(heap)
+                    next_deadline = heap[0][0] if heap else None
+                if next_deadline is None:
+                    # Nothing scheduled: park until add_job interrupts the timer
+                    timer.sleep_ns(3600 * 1_000_000_000)
+                    continue
+                if not timer.sleep_until(next_deadline):
+                    continue
+                now = clock()
+                with self._lock:
+                    due = []
+                    while heap and heap[0][0] <= now:
+                        due.append(heapq.heappop(heap)[2])
+                for job in due:
+                    if job.cancelled:
+                        continue
+                    job.inserted += send(job.buffer)
+                    job.runs += 1
+                    if job.max_runs and job.runs >= job.max_runs:
+                        self._finish(job)
+                        continue
+                    deadline = job.deadline + job.interval_ns
+                    if deadline <= now:
+                        # Behind schedule: drop the missed runs instead of bursting them
+                        missed = (now - deadline) // job.interval_ns + 1
+                        self.skipped += missed
+                        deadline += missed * job.interval_ns
+                    job.deadline = deadline
+                    with self._lock:
+                        if not job.cancelled:
+                            heapq.heappush(heap, (deadline, next(self._seq), job))
+        except Exception as e:
+            self.messages.append(f"❌ Job scheduler error: {e}")
+        finally:
+            self.backend.close()
+            self._timer = None
+            timer.close()
+            if sys.platform == "win32":
+                ctypes.windll.winmm.timeEndPeriod(1)
+
+    def _finish(self, job: Job) -> None:
+        """Retire a job that reached its run limit."""
+        with self._lock:
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+        status = "✅" if job.inserted == job.runs * job.events else "⚠️"
+        self.messages.append(f"{status} Job '{job.name}' finished: {job.runs} runs, {job.inserted} events inserted")
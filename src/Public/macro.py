@@ -0,0 +1,323 @@
+import sys
+import mmap
+import time
+import queue
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Final, Iterator, List, Optional, Tuple
+from src.Public.click_sequence import SequenceAction, normalize_point
+from src.Public.input_backend import (
+    BUTTON_FLAGS, KEYEVENTF_KEYUP, MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_HWHEEL, MOUSEEVENTF_MOVE,
+    MOUSEEVENTF_VIRTUALDESK, MOUSEEVENTF_WHEEL, WHEEL_DELTA, InputBackend,
+)
+
+# ------------------------------------------------------------------
+# Event codes (uint8 column)
+# ------------------------------------------------------------------
+EVENT_MOVE: Final[int] = 0
+EVENT_LEFT_DOWN: Final[int] = 1
+EVENT_LEFT_UP: Final[int] = 2
+EVENT_RIGHT_DOWN: Final[int] = 3
+EVENT_RIGHT_UP: Final[int] = 4
+EVENT_MIDDLE_DOWN: Final[int] = 5
+EVENT_MIDDLE_UP: Final[int] = 6
+EVENT_SCROLL: Final[int] = 7  # x/y columns hold the wheel steps
+EVENT_KEY_DOWN: Final[int] = 8  # x column holds the virtual-key code
+EVENT_KEY_UP: Final[int] = 9
+
+_BUTTON_EVENTS: Final[dict] = {
+    "left": (EVENT_LEFT_DOWN, EVENT_LEFT_UP),
+    "right": (EVENT_RIGHT_DOWN, EVENT_RIGHT_UP),
+    "middle": (EVENT_MIDDLE_DOWN, EVENT_MIDDLE_UP),
+}
+# event code -> (SendInput button flag, completes a click)
+_BUTTON_CODES: Final[dict] = {
+    code: (BUTTON_FLAGS[button][i], i == 1)
+    for button, codes in _BUTTON_EVENTS.items()
+    for i, code in enumerate(codes)
+}
+_BUTTON_NAMES: Final[dict] = {code: button for button, codes in _BUTTON_EVENTS.items() for code in codes}
+
+class MacroRecording:
+    """Column-oriented macro: int64 time deltas, int16 x/y, uint8 event codes.
+
+    On disk the file is a fixed header followed by each column written in
+    bulk (little-endian), so save/load are four array reads or writes no
+    matter how many events the recording holds.
+    """
+
+    MAGIC: Final[bytes] = b"SACM"
+    FORMAT_VERSION: Final[int] = 1
+    HEADER: Final[struct.Struct] = struct.Struct("<4sHQ")  # magic, version, event count
+
+    def __init__(self) -> None:
+        self.deltas = array("q")
+        self.xs = array("h")
+        self.ys = array("h")
+        self.codes = array("B")
+        self._last_ns: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def duration_ns(self) -> int:
+        return sum(self.deltas)
+
+    def append(self, timestamp_ns: int, code: int, x: int = 0, y: int = 0) -> None:
+        """Add one event stamped with an absolute ``perf_counter_ns`` reading."""
+        last = self._last_ns if self._last_ns is not None else timestamp_ns
+        self.deltas.append(max(0, timestamp_ns - last))
+        self.xs.append(max(-32768, min(32767, x)))
+        self.ys.append(max(-32768, min(32767, y)))
+        self.codes.append(code)
+        self._last_ns = timestamp_ns
+
+    def _columns(self) -> Tuple[array, ...]:
+        return (self.deltas, self.xs, self.ys, self.codes)
+
+    def save(self, path: Path) -> Path:
+        """Write the header and each column in one bulk write."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, len(self)))
+            for column in self._columns():
+                if sys.byteorder == "big":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(f)
+        return path
+
+    @classmethod
+    def read_header(cls, header: bytes, path: Path) -> int:
+        """Validate a file header and return the event count."""
+        magic, version, count = cls.HEADER.unpack(header[:cls.HEADER.size])
+        if magic != cls.MAGIC or version != cls.FORMAT_VERSION:
+            raise ValueError(f"Not a macro recording (v{cls.FORMAT_VERSION}): {path}")
+        return count
+
+    @classmethod
+    def load(cls, path: Path) -> "MacroRecording":
+        """Read a recording written by ``save`` with one bulk read per column."""
+        recording = cls()
+        with open(path, "rb") as f:
+            count = cls.read_header(f.read(cls.HEADER.size), path)
+            for column in recording._columns():
+                column.fromfile(f, count)
+                if sys.byteorder == "big":
+                    column.byteswap()
+        return recording
+
+class MacroRecorder:
+    """Records real mouse and keyboard input with pynput listeners."""
+
+    def __init__(self) -> None:
+        self.recording = MacroRecording()
+        self._listeners: List = []
+        self._lock = threading.Lock()
+
+    @property
+    def recording_active(self) -> bool:
+        return bool(self._listeners)
+
+    def start(self) -> None:
+        """Begin recording into a fresh MacroRecording."""
+        # Imported lazily: pynput needs a display/input device at import time
+        from pynput import keyboard as pynput_keyboard, mouse as pynput_mouse
+        self.stop()
+        self.recording = MacroRecording()
+        self._listeners = [
+            pynput_mouse.Listener(on_move=self._on_move, on_click=self._on_click, on_scroll=self._on_scroll),
+            pynput_keyboard.Listener(on_press=self._on_press, on_release=self._on_release),
+        ]
+        for listener in self._listeners:
+            listener.start()
+
+    def stop(self) -> MacroRecording:
+        """Stop the listeners and return the recording."""
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners = []
+        return self.recording
+
+    def _add(self, code: int, x: int = 0, y: int = 0) -> None:
+        with self._lock:
+            self.recording.append(time.perf_counter_ns(), code, x, y)
+
+    def _on_move(self, x: int, y: int) -> None:
+        self._add(EVENT_MOVE, int(x), int(y))
+
+    def _on_click(self, x: int, y: int, button, pressed: bool) -> None:
+        codes = _BUTTON_EVENTS.get(getattr(button, "name", ""))
+        if codes:
+            self._add(codes[0] if pressed else codes[1], int(x), int(y))
+
+    def _on_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
+        self._add(EVENT_SCROLL, int(dx), int(dy))
+
+    def _on_press(self, key) -> None:
+        vk = self._vk(key)
+        if vk:
+            self._add(EVENT_KEY_DOWN, vk)
+
+    def _on_release(self, key) -> None:
+        vk = self._vk(key)
+        if vk:
+            self._add(EVENT_KEY_UP, vk)
+
+    @staticmethod
+    def _vk(key) -> int:
+        """Return the Windows virtual-key code for a pynput key."""
+        vk = getattr(key, "vk", None)
+        if vk is None:
+            vk = getattr(getattr(key, "value", None), "vk", None)
+        return int(vk or 0)
+
+def compile_macro_event(
+    backend: InputBackend, desktop: Tuple[int, int, int, int], code: int, x: int, y: int
+) -> Tuple[object, int, int, Optional[Tuple[object, object]]]:
+    """Compile one recorded event to ``(buffer, events, clicks, held)``."""
+    if code == EVENT_SCROLL:
+        events = []
+        if y:
+            events.append((MOUSEEVENTF_WHEEL, 0, 0, (y * WHEEL_DELTA) & 0xFFFFFFFF))
+        if x:
+            events.append((MOUSEEVENTF_HWHEEL, 0, 0, (x * WHEEL_DELTA) & 0xFFFFFFFF))
+        return backend.compile_mouse(events), len(events), 0, None
+    if code == EVENT_KEY_DOWN:
+        return backend.compile_keys([(x, 0, 0)]), 1, 0, (("key", x), backend.compile_keys([(x, 0, KEYEVENTF_KEYUP)]))
+    if code == EVENT_KEY_UP:
+        return backend.compile_keys([(x, 0, KEYEVENTF_KEYUP)]), 1, 0, (("key", x), None)
+    nx, ny = normalize_point(x, y, desktop)
+    move = (MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK, nx, ny, 0)
+    if code == EVENT_MOVE:
+        return backend.compile_mouse([move]), 1, 0, None
+    flag, is_release = _BUTTON_CODES[code]
+    button = _BUTTON_NAMES[code]
+    held = (button, None) if is_release else (button, backend.compile_mouse([(BUTTON_FLAGS[button][1], 0, 0, 0)]))
+    return backend.compile_mouse([move, (flag, 0, 0, 0)]), 2, int(is_release), held
+
+def compile_macro(recording: MacroRecording, backend: InputBackend) -> Tuple[SequenceAction, ...]:
+    """Compile a recording into the engine's ``(buffer, events, wait_ns, clicks, held)`` actions.
+
+    Each event waits for the *next* event's delta, so the recording's own
+    timing is reproduced on the deadline scheduler.
+    """
+    desktop = backend.virtual_desktop()
+    deltas, xs, ys, codes = recording.deltas, recording.xs, recording.ys, recording.codes
+    count = len(codes)
+    actions: List[SequenceAction] = []
+    for i in range(count):
+        buffer, events, clicks, held = compile_macro_event(backend, desktop, codes[i], xs[i], ys[i])
+        actions.append((buffer, events, deltas[i + 1] if i + 1 < count else 0, clicks, held))
+    return tuple(actions)
+
+class MacroStream:
+    """Re-iterable, memory-mapped view of a macro file for streaming playback.
+
+    Iterating yields the same ``SequenceAction`` tuples as ``compile_macro``,
+    but the file is never loaded whole: a prefetch thread walks the mapped
+    columns ``chunk_events`` at a time and compiles the next chunk while the
+    scheduler plays the current one. At most ``PREFETCH_CHUNKS`` compiled
+    chunks exist at once, so memory stays bounded for any recording length.
+    """
+
+    DEFAULT_CHUNK_EVENTS: Final[int] = 4096
+    PREFETCH_CHUNKS: Final[int] = 2
+    PUT_TIMEOUT: Final[float] = 0.1
+
+    def __init__(self, path: Path, backend: InputBackend, chunk_events: int = DEFAULT_CHUNK_EVENTS) -> None:
+        self.path = Path(path)
+        self.backend = backend
+        self.chunk_events = max(1, chunk_events)
+        with open(self.path, "rb") as f:
+            self.count = MacroRecording.read_header(f.read(MacroRecording.HEADER.size), self.path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[SequenceAction]:
+        chunks: queue.Queue = queue.Queue(maxsize=self.PREFETCH_CHUNKS)
+        cancelled = threading.Event()
+        prefetcher = threading.Thread(
+            target=self._prefetch, args=(chunks, cancelled), name="MacroPrefetch", daemon=True
+        )
+        prefetcher.start()
+        try:
+            pending = None
+            while True:
+                chunk = chunks.get()
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                if chunk is None:
+                    break
+                # Each event waits for the next event's delta, so hold one back
+                for buffer, events, clicks, held, delta in chunk:
+                    if pending is not None:
+                        yield pending[0], pending[1], delta, pending[2], pending[3]
+                    pending = (buffer, events, clicks, held)
+            if pending is not None:
+                yield pending[0], pending[1], 0, pending[2], pending[3]
+        finally:
+            cancelled.set()
+            # Unblock a producer waiting on a full queue
+            while not chunks.empty():
+                chunks.get_nowait()
+            prefetcher.join()
+
+    def _prefetch(self, chunks: queue.Queue, cancelled: threading.Event) -> None:
+        """Compile mapped chunks into the bounded queue until done or cancelled."""
+        def put(item) -> bool:
+            while not cancelled.is_set():
+                try:
+                    chunks.put(item, timeout=self.PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            for chunk in self._compiled_chunks():
+                if not put(chunk):
+                    return
+            put(None)
+        except Exception as e:
+            put(e)
+
+    def _compiled_chunks(self) -> Iterator[List[Tuple[object, int, int, object, int]]]:
+        """Walk the mapped columns and compile ``(buffer, events, clicks, held, delta_ns)`` chunks."""
+        backend, desktop, count, step = self.backend, self.backend.virtual_desktop(), self.count, self.chunk_events
+        base = MacroRecording.HEADER.size
+        # Column offsets follow the on-disk layout: deltas, x, y, codes
+        offsets = (base, base + 8 * count, base + 10 * count, base + 12 * count)
+        if count == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, count, step):
+                    n = min(step, count - start)
+                    deltas, xs, ys, codes = (
+                        self._column(view, offset, typecode, start, n)
+                        for offset, typecode in zip(offsets, ("q", "h", "h", "B"))
+                    )
+                    chunk = [
+                        compile_macro_event(backend, desktop, codes[i], xs[i], ys[i]) + (deltas[i],)
+                        for i in range(n)
+                    ]
+                    yield chunk
+            finally:
+                view.release()
+
+    @staticmethod
+    def _column(view: memoryview, offset: int, typecode: str, start: int, n: int) -> array:
+        """Copy ``n`` little-endian items of one column out of the mapping."""
+        size = array(typecode).itemsize
+        column = array(typecode)
+        column.frombytes(view[offset + start * size:offset + (start + n) * size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
@@ -0,0 +1,201 @@
+import sys
+import ctypes
+from ctypes import wintypes
+from typing import Final, Optional, Tuple
+
+# (x, y, width, height) in virtual-desktop pixels
+Region = Tuple[int, int, int, int]
+
+# ------------------------------------------------------------------
+# GDI structures
+# ------------------------------------------------------------------
+BI_RGB: Final[int] = 0
+DIB_RGB_COLORS: Final[int] = 0
+SRCCOPY: Final[int] = 0x00CC0020
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+class BITMAPINFO(ctypes.Structure):
+    _fields_ = [("bmiHeader", BITMAPINFOHEADER), ("bmiColors", wintypes.DWORD * 3)]
+
+# ------------------------------------------------------------------
+# Capture backends
+# ------------------------------------------------------------------
+class CaptureBackend:
+    """Grabs a small screen region into a reusable BGRA buffer.
+
+    ``open`` does every allocation for a region; ``grab`` then only copies
+    pixels into the same buffer and returns a memoryview of it (row-major,
+    top-down, 4 bytes per pixel in B, G, R, A order).
+    """
+
+    name: str = "base"
+
+    def __init__(self) -> None:
+        self.region: Optional[Region] = None
+
+    def open(self, region: Region) -> None:
+        """Prepare capture resources for ``region``."""
+        self.region = region
+
+    def grab(self) -> memoryview:
+        """Capture the region and return its BGRA pixels."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release capture resources."""
+        self.region = None
+
+class Win32GdiCapture(CaptureBackend):
+    """BitBlt capture into a cached memory DC and DIB section.
+
+    The screen DC, memory DC and bitmap are created once per region size and
+    reused for every grab, so a check is one BitBlt of the ROI – no
+    full-screen screenshot and no per-grab allocation.
+    """
+
+    name = "gdi"
+
+    def __init__(self) -> None:
+        super().__init__()
+        user32, gdi32 = ctypes.windll.user32, ctypes.windll.gdi32
+        user32.GetDC.restype = wintypes.HDC
+        user32.GetDC.argtypes = (wintypes.HWND,)
+        user32.ReleaseDC.argtypes = (wintypes.HWND, wintypes.HDC)
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleDC.argtypes = (wintypes.HDC,)
+        gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+        gdi32.CreateDIBSection.argtypes = (
+            wintypes.HDC, ctypes.POINTER(BITMAPINFO), wintypes.UINT,
+            ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD,
+        )
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.SelectObject.argtypes = (wintypes.HDC, wintypes.HGDIOBJ)
+        gdi32.DeleteObject.argtypes = (wintypes.HGDIOBJ,)
+        gdi32.DeleteDC.argtypes = (wintypes.HDC,)
+        gdi32.BitBlt.argtypes = (
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+        )
+        self._user32, self._gdi32 = user32, gdi32
+        self._screen_dc = None
+        self._mem_dc = None
+        self._bitmap = None
+        self._old_bitmap = None
+        self._size: Tuple[int, int] = (0, 0)
+        self._pixels: Optional[memoryview] = None
+
+    def open(self, region: Region) -> None:
+        x, y, width, height = region
+        if self._screen_dc is None:
+            self._screen_dc = self._user32.GetDC(None)
+            self._mem_dc = self._gdi32.CreateCompatibleDC(self._screen_dc)
+        if (width, height) != self._size:
+            self._release_bitmap()
+            bmi = BITMAPINFO()
+            header = bmi.bmiHeader
+            header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+            header.biWidth = width
+            header.biHeight = -height  # negative: top-down rows
+            header.biPlanes = 1
+            header.biBitCount = 32
+            header.biCompression = BI_RGB
+            bits = ctypes.c_void_p()
+            self._bitmap = self._gdi32.CreateDIBSection(
+                self._screen_dc, ctypes.byref(bmi), DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+            )
+            if not self._bitmap:
+                raise OSError("CreateDIBSection failed")
+            self._old_bitmap = self._gdi32.SelectObject(self._mem_dc, self._bitmap)
+            self._pixels = memoryview((ctypes.c_ubyte * (width * height * 4)).from_address(bits.value)).cast("B")
+            self._size = (width, height)
+        self.region = region
+
+    def grab(self) -> memoryview:
+        x, y, width, height = self.region
+        self._gdi32.BitBlt(self._mem_dc, 0, 0, width, height, self._screen_dc, x, y, SRCCOPY)
+        # Make sure GDI has finished writing the DIB before it is read
+        self._gdi32.GdiFlush()
+        return self._pixels
+
+    def close(self) -> None:
+        self._release_bitmap()
+        if self._mem_dc:
+            self._gdi32.DeleteDC(self._mem_dc)
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, self._screen_dc)
+        self._screen_dc = self._mem_dc = None
+        super().close()
+
+    def _release_bitmap(self) -> None:
+        if self._bitmap:
+            self._pixels = None
+            self._gdi32.SelectObject(self._mem_dc, self._old_bitmap)
+            self._gdi32.DeleteObject(self._bitmap)
+        self._bitmap = self._old_bitmap = None
+        self._size = (0, 0)
+
+class FakeFramebufferCapture(CaptureBackend):
+    """In-memory BGRA framebuffer for exercising triggers without a display.
+
+    Tests and headless runs paint into ``framebuffer`` with ``fill`` and the
+    triggers read it through the same ``open``/``grab`` contract as GDI.
+    """
+
+    name = "fake"
+
+    def __init__(self, width: int = 1920, height: int = 1080) -> None:
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.framebuffer = bytearray(width * height * 4)
+        self._buffer = bytearray()
+        self.grabs = 0
+
+    def fill(self, region: Region, rgb: Tuple[int, int, int]) -> None:
+        """Paint ``region`` with an opaque ``(r, g, b)`` color."""
+        x, y, width, height = region
+        pixel = bytes((rgb[2], rgb[1], rgb[0], 255))
+        stride = self.width * 4
+        for row in range(y, y + height):
+            start = row * stride + x * 4
+            self.framebuffer[start:start + width * 4] = pixel * width
+
+    def open(self, region: Region) -> None:
+        x, y, width, height = region
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            raise ValueError(f"Region {region} is outside the {self.width}x{self.height} framebuffer")
+        self._buffer = bytearray(width * height * 4)
+        super().open(region)
+
+    def grab(self) -> memoryview:
+        x, y, width, height = self.region
+        stride, row_bytes = self.width * 4, width * 4
+        src, dst = self.framebuffer, self._buffer
+        for row in range(height):
+            start = (y + row) * stride + x * 4
+            dst[row * row_bytes:(row + 1) * row_bytes] = src[start:start + row_bytes]
+        self.grabs += 1
+        return memoryview(dst)
+
+def create_capture_backend(name: Optional[str] = None) -> CaptureBackend:
+    """Return the capture backend for ``name`` or the platform default."""
+    name = (name or ("gdi" if sys.platform == "win32" else "fake")).lower()
+    if name == "gdi":
+        return Win32GdiCapture()
+    if name == "fake":
+        return FakeFramebufferCapture()
+    raise ValueError(f"Unknown capture backend: {name}")
@@ -19,7 +19,13 @@ import winreg
 import ctypes
 import logging as _logging
 from src.Public.win32ui import Win32UI
-from ctypes import wintypes
+from src.Public.clicker_engine import STATE_IDLE, STATE_STOPPING, ClickerEngine
+from src.Public.click_plan import ClickPlan
+from src.Public.control_protocol import ControlServer
+from src.Public.macro import MacroRecorder
+from src.Public.humanize import JITTER_GAUSSIAN, JITTER_LOGNORMAL, JITTER_OFF
+from src.Public.thread_priority import PRIORITY_LEVELS, PRIORITY_NORMAL
+from src.Public.timing import CATCH_UP_SKIP, CATCH_UP_BURST, TIMING_PROFILES, DEFAULT_TIMING_PROFILE, MAX_CPS
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
@@ -28,7 +34,8 @@ from requests.exceptions import RequestException, HTTPError, ConnectionError, Ti
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
     QTabWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QTextEdit, QGraphicsDropShadowEffect,
-    QComboBox, QSystemTrayIcon, QMenu, QFormLayout, QMessageBox, QDialog, QProgressBar, QCheckBox
+    QComboBox, QSystemTrayIcon, QMenu, QFormLayout, QMessageBox, QDialog, QProgressBar, QCheckBox,
+    QTableWidget, QTableWidgetItem
 )
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import Qt, QTimer, QThread, Signal as pyqtSignal, QObject
@@ -102,11 +109,21 @@ class Config(metaclass=_MetaConfig):
         "loop_count": "0",
         "click_delay": "1",
         "cycle_delay": "0.5",
+        "target_cps": "0",
+        "jitter_ms": "0",
+        "offset_px": "0",
+        "hold_ms": "0",
+        "keys": "space",
+        "trigger_size": "1",
+        "trigger_color": "#ffffff",
+        "trigger_tolerance": "10",
+        "template_threshold": "0.9",
     }
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
     UPDATE_CHECK_INTERVAL: Final[int] = 24 * 60 * 60 * 1000  # ms
+    ENGINE_POLL_INTERVAL: Final[int] = 66  # ms (~15 Hz UI refresh while clicking)
     LOCK_PORT: Final[int] = random.randint(1024, 49151)
     PORTS: Final[str] = "127.0.0.1"
 
@@ -138,6 +155,8 @@ class Config(metaclass=_MetaConfig):
     VERSION_FILE: Final[Path] = APPDATA_DIR / "current_version.txt"
     VERSION_CACHE_FILE: Final[Path] = APPDATA_DIR / "version_cache.txt"
     LOCK_FILE: Final[Path] = APPDATA_DIR / f"app.lock.{LOCK_PORT}"
+    TELEMETRY_FILE: Final[Path] = APPDATA_DIR / "timing_stats.json"
+    MACRO_FILE: Final[Path] = APPDATA_DIR / "macro.sacm"
 
     # ------------------------------------------------------------------
     # Update history
@@ -805,6 +824,8 @@ class SingletonLock(QObject):
         self.listener_thread = None
         self.lockfile_path = Config.LOCK_FILE
         self._running = True
+        # Line-delimited JSON commands on the lock socket; ``activate`` raises the window
+        self.control = ControlServer(on_activate=self.activation_requested.emit)
 
     def acquire_lock(self) -> Optional[socket.socket]:
         """Acquire singleton lock with stale cleanup."""
@@ -822,6 +843,7 @@ class SingletonLock(QObject):
     def release_lock(self) -> None:
         """Clean release of lock resources."""
         self._running = False
+        self.control.close()
         if self.socket:
             try:
                 self.socket.close()
@@ -897,17 +919,13 @@ class SingletonLock(QObject):
             return None
 
     def _start_listener(self) -> Optional[socket.socket]:
-        """Start listener thread for activation requests."""
+        """Start listener thread for activation and control connections."""
         def listen():
             while self._running and self.socket:
                 try:
                     client_sock, _ = self.socket.accept()
-                    try:
-                        data = client_sock.recv(1024)
-                        if data == b"ACTIVATE":
-                            self.activation_requested.emit()
-                    finally:
-                        client_sock.close()
+                    # Each connection stays open on its own session thread
+                    self.control.serve(client_sock)
                 except socket.timeout:
                     continue
                 except:
@@ -1147,6 +1165,25 @@ class UpdateChecker(QThread):
 class UIManager:
     """Centralized UI builder – keeps widget references in one dict."""
 
+    CATCH_UP_OPTIONS: Final[Dict[str, str]] = {
+        "Skip Missed Clicks": CATCH_UP_SKIP,
+        "Burst Missed Clicks": CATCH_UP_BURST,
+    }
+    BUTTON_OPTIONS: Final[Dict[str, str]] = {
+        "Left": "left", "Right": "right", "Middle": "middle", "X1 (Back)": "x1", "X2 (Forward)": "x2",
+    }
+    CLICK_TYPE_OPTIONS: Final[Dict[str, str]] = {"Single": "single", "Double": "double", "Triple": "triple"}
+    JITTER_OPTIONS: Final[Dict[str, str]] = {
+        "Off": JITTER_OFF,
+        "Gaussian": JITTER_GAUSSIAN,
+        "Log-normal": JITTER_LOGNORMAL,
+    }
+    SEQUENCE_COLUMNS: Final[tuple] = (
+        ("x", "X"), ("y", "Y"), ("button", "Button"),
+        ("count", "Count"), ("hold_ms", "Hold (ms)"), ("delay_ms", "Delay (ms)"),
+    )
+    SEQUENCE_CAPTURE_DELAY: Final[int] = 3000  # ms
+
     # ------------------------------------------------------------------
     # Construction
     # ------------------------------------------------------------------
@@ -1171,6 +1208,173 @@ class UIManager:
         for w in ("version_display", "current_version_label", "latest_version_label", "last_check_label"):
             self.widgets[w].update()
 
+    # ------------------------------------------------------------------
+    # Settings helper
+    # ------------------------------------------------------------------
+    def _clamp_cps(self, cps: float) -> float:
+        """Keep target CPS within the hard ceiling so a typo can't flood the input queue."""
+        if cps <= 0:
+            return 0.0
+        if cps > MAX_CPS:
+            self.logger.log(f"⚠️ Target CPS {cps:g} exceeds the {MAX_CPS} CPS ceiling; clamped")
+            return float(MAX_CPS)
+        return cps
+
+    def get_click_settings(self) -> Dict[str, Any]:
+        """Get clicker settings from UI."""
+        widgets = self.widgets
+
+        def safe_int(widget, default):
+            try:
+                return int(widget.text() or default)
+            except (ValueError, TypeError):
+                return default
+
+        def safe_float(widget, default):
+            try:
+                return float(widget.text() or default)
+            except (ValueError, TypeError):
+                return default
+
+        return {
+            'clicks': max(1, safe_int(widgets.get('click_count'), Config.DEFAULT_SETTINGS["click_count"])),
+            'max_loops': safe_int(widgets.get('loop_count'), Config.DEFAULT_SETTINGS["loop_count"]),
+            'click_delay': max(0.001, safe_float(widgets.get('click_delay'), Config.DEFAULT_SETTINGS["click_delay"])),
+            'cycle_delay': max(0.001, safe_float(widgets.get('cycle_delay'), Config.DEFAULT_SETTINGS["cycle_delay"])),
+            'burst': bool(widgets.get('burst_mode_toggle') and widgets['burst_mode_toggle'].isChecked()),
+            'catch_up': self.CATCH_UP_OPTIONS.get(
+                widgets['catch_up_combo'].currentText() if widgets.get('catch_up_combo') else "", CATCH_UP_SKIP
+            ),
+            'target_cps': self._clamp_cps(safe_float(widgets.get('target_cps'), Config.DEFAULT_SETTINGS["target_cps"])),
+            'button': self.BUTTON_OPTIONS.get(
+                widgets['button_combo'].currentText() if widgets.get('button_combo') else "", "left"
+            ),
+            'click_type': self.CLICK_TYPE_OPTIONS.get(
+                widgets['click_type_combo'].currentText() if widgets.get('click_type_combo') else "", "single"
+            ),
+            'hold_ms': max(0.0, safe_float(widgets.get('hold_ms'), Config.DEFAULT_SETTINGS["hold_ms"])),
+            'keys': (
+                widgets['keys'].text().strip()
+                if widgets.get('key_mode_toggle') and widgets['key_mode_toggle'].isChecked() else ""
+            ),
+            'jitter': self.JITTER_OPTIONS.get(
+                widgets['jitter_combo'].currentText() if widgets.get('jitter_combo') else "", JITTER_OFF
+            ),
+            'jitter_ms': max(0.0, safe_float(widgets.get('jitter_ms'), Config.DEFAULT_SETTINGS["jitter_ms"])),
+            'offset_px': max(0, safe_int(widgets.get('offset_px'), Config.DEFAULT_SETTINGS["offset_px"])),
+            'timing_profile': (
+                widgets['timing_profile_combo'].currentText() if widgets.get('timing_profile_combo') else DEFAULT_TIMING_PROFILE
+            ),
+            'sequence': (
+                self.get_sequence_steps()
+                if widgets.get('sequence_toggle') and widgets['sequence_toggle'].isChecked() else []
+            ),
+            'pixel_trigger': self.get_pixel_trigger(),
+            'template_trigger': self.get_template_trigger(),
+            'guard': self.get_guard(),
+            'macro_path': (
+                widgets['macro_path'].text().strip()
+                if widgets.get('macro_toggle') and widgets['macro_toggle'].isChecked() else ""
+            ),
+        }
+
+    def get_thread_priority(self) -> tuple:
+        """Return the (priority level, CPU core or None) chosen for the click thread."""
+        widgets = self.widgets
+        level = widgets['thread_priority_combo'].currentText() if widgets.get('thread_priority_combo') else PRIORITY_NORMAL
+        core = widgets['cpu_core'].text().strip() if widgets.get('cpu_core') else ""
+        return level, int(core) if core.isdigit() else None
+
+    def get_pixel_trigger(self) -> Optional[Dict[str, str]]:
+        """Read the pixel-trigger fields (validated by ClickPlan), or None when disabled."""
+        widgets = self.widgets
+        if not (widgets.get('pixel_trigger_toggle') and widgets['pixel_trigger_toggle'].isChecked()):
+            return None
+        size = widgets['trigger_size'].text().strip() or Config.DEFAULT_SETTINGS["trigger_size"]
+        return {
+            'x': widgets['trigger_x'].text().strip() or "0",
+            'y': widgets['trigger_y'].text().strip() or "0",
+            'width': size,
+            'height': size,
+            'color': widgets['trigger_color'].text().strip() or Config.DEFAULT_SETTINGS["trigger_color"],
+            'tolerance': widgets['trigger_tolerance'].text().strip() or Config.DEFAULT_SETTINGS["trigger_tolerance"],
+        }
+
+    def get_template_trigger(self) -> Optional[Dict[str, Any]]:
+        """Read the image-trigger fields (validated by ClickPlan), or None when disabled."""
+        widgets = self.widgets
+        if not (widgets.get('template_trigger_toggle') and widgets['template_trigger_toggle'].isChecked()):
+            return None
+        return {
+            'image_path': widgets['template_path'].text().strip(),
+            'x': widgets['template_x'].text().strip() or "0",
+            'y': widgets['template_y'].text().strip() or "0",
+            'width': widgets['template_width'].text().strip() or "0",
+            'height': widgets['template_height'].text().strip() or "0",
+            'threshold': widgets['template_threshold'].text().strip() or Config.DEFAULT_SETTINGS["template_threshold"],
+            'click_at_match': widgets['template_click_at_match'].isChecked(),
+        }
+
+    def get_guard(self) -> Optional[Dict[str, Any]]:
+        """Read the cursor-region / foreground-window guard (validated by ClickPlan), or None."""
+        widgets = self.widgets
+        use_region = bool(widgets.get('guard_region_toggle') and widgets['guard_region_toggle'].isChecked())
+        use_process = bool(widgets.get('guard_process_toggle') and widgets['guard_process_toggle'].isChecked())
+        if not (use_region or use_process):
+            return None
+        return {
+            'region': [
+                widgets[key].text().strip() or "0" for key in ("guard_x", "guard_y", "guard_width", "guard_height")
+            ] if use_region else [],
+            'process': widgets['guard_process'].text().strip() if use_process else "",
+        }
+
+    def pick_trigger_pixel(self) -> None:
+        """Fill the trigger position and color from the cursor after a short delay."""
+        self.logger.log(f"🎯 Move the cursor to the pixel; capturing in {self.SEQUENCE_CAPTURE_DELAY // 1000} s...")
+
+        def capture() -> None:
+            x, y = pyautogui.position()
+            r, g, b = pyautogui.pixel(x, y)[:3]
+            self.widgets['trigger_x'].setText(str(x))
+            self.widgets['trigger_y'].setText(str(y))
+            self.widgets['trigger_color'].setText(f"#{r:02x}{g:02x}{b:02x}")
+            self.logger.log(f"🎯 Trigger pixel set to ({x}, {y}) #{r:02x}{g:02x}{b:02x}")
+            self.parent.apply_live_settings()
+
+        QTimer.singleShot(self.SEQUENCE_CAPTURE_DELAY, capture)
+
+    def get_sequence_steps(self) -> List[Dict[str, str]]:
+        """Read the sequence table as a list of step dicts (validated by ClickPlan)."""
+        table = self.widgets['sequence_table']
+        steps = []
+        for row in range(table.rowCount()):
+            step = {}
+            for col, (key, _) in enumerate(self.SEQUENCE_COLUMNS):
+                item = table.item(row, col)
+                step[key] = item.text().strip() if item else ""
+            steps.append(step)
+        return steps
+
+    def add_sequence_step(self, x: int = 0, y: int = 0) -> None:
+        """Append a step row to the sequence table."""
+        table = self.widgets['sequence_table']
+        row = table.rowCount()
+        table.insertRow(row)
+        for col, value in enumerate((x, y, "left", 1, 0, 100)):
+            table.setItem(row, col, QTableWidgetItem(str(value)))
+
+    def capture_sequence_step(self) -> None:
+        """Add a step at the cursor position after a short delay."""
+        self.logger.log(f"🎯 Move the cursor to the target; capturing in {self.SEQUENCE_CAPTURE_DELAY // 1000} s...")
+        QTimer.singleShot(self.SEQUENCE_CAPTURE_DELAY, lambda: self.add_sequence_step(*pyautogui.position()))
+
+    def remove_sequence_step(self) -> None:
+        """Remove the selected (or last) step from the sequence table."""
+        table = self.widgets['sequence_table']
+        row = table.currentRow()
+        table.removeRow(row if row >= 0 else table.rowCount() - 1)
+
     # ------------------------------------------------------------------
     # Factory helpers
     # ------------------------------------------------------------------
@@ -1225,10 +1429,77 @@ class UIManager:
         form = QFormLayout()
 
         defs = Config.DEFAULT_SETTINGS
+        apply_live = self.parent.apply_live_settings
         form.addRow("Clicks per Cycle:", self._make_line_edit("click_count", defs["click_count"]))
         form.addRow("Max Cycles (0=∞):", self._make_line_edit("loop_count", defs["loop_count"]))
         form.addRow("Delay Between Clicks (s):", self._make_line_edit("click_delay", defs["click_delay"]))
         form.addRow("Delay Between Cycles (s):", self._make_line_edit("cycle_delay", defs["cycle_delay"]))
+        form.addRow(
+            "Target CPS (0=use delays):",
+            self._make_line_edit("target_cps", defs["target_cps"], f"Clicks per second, max {MAX_CPS}"),
+        )
+
+        button = QComboBox()
+        button.addItems(list(self.BUTTON_OPTIONS.keys()))
+        button.currentTextChanged.connect(apply_live)
+        self.widgets["button_combo"] = button
+        form.addRow("Mouse Button:", button)
+
+        click_type = QComboBox()
+        click_type.addItems(list(self.CLICK_TYPE_OPTIONS.keys()))
+        click_type.setToolTip("Double/triple clicks are spaced by at least the system double-click time")
+        click_type.currentTextChanged.connect(apply_live)
+        self.widgets["click_type_combo"] = click_type
+        form.addRow("Click Type:", click_type)
+        form.addRow("Hold Duration (ms):", self._make_line_edit("hold_ms", defs["hold_ms"]))
+
+        key_mode = QCheckBox("Key Presser (press keys instead of clicking)")
+        key_mode.setChecked(False)
+        key_mode.stateChanged.connect(apply_live)
+        self.widgets["key_mode_toggle"] = key_mode
+        form.addRow(key_mode)
+        form.addRow("Keys:", self._make_line_edit("keys", defs["keys"], "e.g., space, f5, ctrl+shift+s"))
+
+        burst = QCheckBox("Burst Mode (send each cycle in one call)")
+        burst.setChecked(False)
+        burst.stateChanged.connect(apply_live)
+        self.widgets["burst_mode_toggle"] = burst
+        form.addRow(burst)
+
+        catch_up = QComboBox()
+        catch_up.addItems(list(self.CATCH_UP_OPTIONS.keys()))
+        catch_up.currentTextChanged.connect(apply_live)
+        self.widgets["catch_up_combo"] = catch_up
+        form.addRow("When Behind Schedule:", catch_up)
+
+        profile = QComboBox()
+        profile.addItems(list(TIMING_PROFILES.keys()))
+        profile.setCurrentText(DEFAULT_TIMING_PROFILE)
+        profile.setToolTip("Eco: lowest CPU · Balanced: short spin · Precise: sub-ms accuracy, more CPU")
+        profile.currentTextChanged.connect(apply_live)
+        self.widgets["timing_profile_combo"] = profile
+        form.addRow("Timing Profile:", profile)
+
+        priority = QComboBox()
+        priority.addItems(list(PRIORITY_LEVELS))
+        priority.setToolTip("Applies from the next start; the log compares jitter before and after")
+        self.widgets["thread_priority_combo"] = priority
+        form.addRow("Click Thread Priority:", priority)
+        form.addRow("Pin to CPU Core:", self._make_line_edit("cpu_core", "", "blank = any core"))
+
+        jitter = QComboBox()
+        jitter.addItems(list(self.JITTER_OPTIONS.keys()))
+        jitter.setToolTip("Randomize click timing and position (per-click delays only)")
+        jitter.currentTextChanged.connect(apply_live)
+        self.widgets["jitter_combo"] = jitter
+        form.addRow("Humanize:", jitter)
+        form.addRow("Timing Jitter (ms):", self._make_line_edit("jitter_ms", defs["jitter_ms"]))
+        form.addRow("Cursor Offset (px):", self._make_line_edit("offset_px", defs["offset_px"]))
+
+        for key in (
+            "click_count", "loop_count", "click_delay", "cycle_delay", "target_cps", "hold_ms", "keys", "jitter_ms", "offset_px",
+        ):
+            self.widgets[key].editingFinished.connect(apply_live)
 
         hotkey = self._make_line_edit("hotkey_input", Config.load_hotkey(), "e.g., Ctrl+F, Alt+Shift+G")
         form.addRow("Hotkey:", hotkey)
@@ -1272,6 +1543,16 @@ class UIManager:
         self.widgets["progress_label"] = progress
         form.addRow("Progress:", progress)
 
+        cps = QLabel("CPS: 0.0")
+        cps.setAlignment(Qt.AlignRight)
+        self.widgets["cps_label"] = cps
+        form.addRow("Rate:", cps)
+
+        status = QLabel("Idle")
+        status.setAlignment(Qt.AlignRight)
+        self.widgets["status_label"] = status
+        form.addRow("Status:", status)
+
         group.setLayout(form)
         return group
 
@@ -1305,6 +1586,146 @@ class UIManager:
         widget.setLayout(layout)
         return widget
 
+    def create_sequence_tab(self) -> QWidget:
+        """Multi-step click sequence editor."""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        toggle = QCheckBox("Play sequence instead of clicking in place")
+        toggle.stateChanged.connect(self.parent.apply_live_settings)
+        self.widgets["sequence_toggle"] = toggle
+        layout.addWidget(toggle)
+
+        table = QTableWidget(0, len(self.SEQUENCE_COLUMNS))
+        table.setHorizontalHeaderLabels([label for _, label in self.SEQUENCE_COLUMNS])
+        table.itemChanged.connect(self.parent.apply_live_settings)
+        self.widgets["sequence_table"] = table
+        layout.addWidget(table)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(self._make_button("➕ Add Step", lambda: self.add_sequence_step()))
+        btn_layout.addWidget(self._make_button("🎯 Capture Cursor", self.capture_sequence_step))
+        btn_layout.addWidget(self._make_button("➖ Remove Step", self.remove_sequence_step))
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        widget.setLayout(layout)
+        return widget
+
+    def create_trigger_tab(self) -> QWidget:
+        """Screen-condition triggers."""
+        widget = QWidget()
+        layout = QVBoxLayout()
+        defs = Config.DEFAULT_SETTINGS
+        apply_live = self.parent.apply_live_settings
+
+        group = QGroupBox("🎯 Pixel Trigger")
+        form = QFormLayout()
+        toggle = QCheckBox("Only click while the pixel/region matches the color")
+        toggle.stateChanged.connect(apply_live)
+        self.widgets["pixel_trigger_toggle"] = toggle
+        form.addRow(toggle)
+        form.addRow("X:", self._make_line_edit("trigger_x", "0"))
+        form.addRow("Y:", self._make_line_edit("trigger_y", "0"))
+        form.addRow("Region Size (px):", self._make_line_edit("trigger_size", defs["trigger_size"]))
+        form.addRow("Color:", self._make_line_edit("trigger_color", defs["trigger_color"], "#rrggbb or r,g,b"))
+        form.addRow("Tolerance (0-255):", self._make_line_edit("trigger_tolerance", defs["trigger_tolerance"]))
+        form.addRow("", self._make_button("🎯 Pick From Cursor", self.pick_trigger_pixel))
+        for key in ("trigger_x", "trigger_y", "trigger_size", "trigger_color", "trigger_tolerance"):
+            self.widgets[key].editingFinished.connect(apply_live)
+        group.setLayout(form)
+        layout.addWidget(group)
+
+        group = QGroupBox("🛡️ Click Guards")
+        form = QFormLayout()
+        region_toggle = QCheckBox("Pause while the cursor is outside this region")
+        region_toggle.stateChanged.connect(apply_live)
+        self.widgets["guard_region_toggle"] = region_toggle
+        form.addRow(region_toggle)
+        form.addRow("Region X:", self._make_line_edit("guard_x", "0"))
+        form.addRow("Region Y:", self._make_line_edit("guard_y", "0"))
+        form.addRow("Region Width:", self._make_line_edit("guard_width", "800"))
+        form.addRow("Region Height:", self._make_line_edit("guard_height", "600"))
+        process_toggle = QCheckBox("Pause while this program is not in front")
+        process_toggle.stateChanged.connect(apply_live)
+        self.widgets["guard_process_toggle"] = process_toggle
+        form.addRow(process_toggle)
+        form.addRow("Program:", self._make_line_edit("guard_process", "", "e.g., game.exe"))
+        for key in ("guard_x", "guard_y", "guard_width", "guard_height", "guard_process"):
+            self.widgets[key].editingFinished.connect(apply_live)
+        group.setLayout(form)
+        layout.addWidget(group)
+
+        group = QGroupBox("🖼️ Image Trigger")
+        form = QFormLayout()
+        toggle = QCheckBox("Only click while the image is visible in the region")
+        toggle.stateChanged.connect(apply_live)
+        self.widgets["template_trigger_toggle"] = toggle
+        form.addRow(toggle)
+        form.addRow("Image File:", self._make_line_edit("template_path", "", "PNG/BMP of the target"))
+        form.addRow("Region X:", self._make_line_edit("template_x", "0"))
+        form.addRow("Region Y:", self._make_line_edit("template_y", "0"))
+        form.addRow("Region Width:", self._make_line_edit("template_width", "400"))
+        form.addRow("Region Height:", self._make_line_edit("template_height", "300"))
+        form.addRow("Match Threshold (0-1):", self._make_line_edit("template_threshold", defs["template_threshold"]))
+        click_at = QCheckBox("Click at the match location")
+        click_at.stateChanged.connect(apply_live)
+        self.widgets["template_click_at_match"] = click_at
+        form.addRow(click_at)
+        for key in ("template_path", "template_x", "template_y", "template_width", "template_height", "template_threshold"):
+            self.widgets[key].editingFinished.connect(apply_live)
+        group.setLayout(form)
+        layout.addWidget(group)
+        layout.addStretch()
+
+        widget.setLayout(layout)
+        return widget
+
+    def create_macro_tab(self) -> QWidget:
+        """Macro recorder / replay tab."""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        toggle = QCheckBox("Replay macro instead of clicking in place")
+        toggle.stateChanged.connect(self.parent.apply_live_settings)
+        self.widgets["macro_toggle"] = toggle
+        layout.addWidget(toggle)
+
+        path_layout = QHBoxLayout()
+        path_layout.addWidget(QLabel("Macro file:"))
+        path_layout.addWidget(self._make_line_edit("macro_path", str(Config.MACRO_FILE)))
+        layout.addLayout(path_layout)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(self._make_button("⏺️ Record", self.parent.start_macro_recording))
+        btn_layout.addWidget(self._make_button("💾 Stop & Save", self.parent.stop_macro_recording))
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+        layout.addStretch()
+
+        widget.setLayout(layout)
+        return widget
+
+    def create_stats_tab(self) -> QWidget:
+        """Click-timing telemetry tab."""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        stats = QTextEdit()
+        stats.setReadOnly(True)
+        stats.setPlainText("No timing data yet. Start clicking to collect samples.")
+        self.widgets["stats_text"] = stats
+        layout.addWidget(stats)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        btn_layout.addWidget(self._make_button("🔄 Refresh", self.parent.refresh_timing_stats))
+        btn_layout.addWidget(self._make_button("💾 Export", self.parent.export_timing_stats))
+        layout.addLayout(btn_layout)
+
+        widget.setLayout(layout)
+        return widget
+
     def create_credits_tab(self) -> QWidget:
         """Credits / about tab."""
         widget = QWidget()
@@ -1353,159 +1774,6 @@ class UIManager:
         widget.setLayout(layout)
         return widget
 
-class ClickerEngine:
-    """Manages the auto-clicking functionality – Windows 11 optimized."""
-    def __init__(self, parent, logger: Logger):
-        self.parent = parent
-        self.logger = logger
-        self.running = False
-        self.thread = None
-        # Win11: ensure we send INPUT structs instead of legacy mouse_event
-        self._ensure_uiAccess()
-
-    # ------------------------------------------------------------------
-    # Public API
-    # ------------------------------------------------------------------
-    def start(self) -> None:
-        """Start the clicker engine."""
-        if self.running:
-            return
-        self.running = True
-        self.parent.start_btn.setEnabled(False)
-        self.parent.stop_btn.setEnabled(True)
-        self.parent.ui.widgets['progress_label'].setText("Cycles: 0")
-        self.thread = threading.Thread(target=self._click_loop, daemon=True)
-        self.thread.start()
-        self.logger.log("▶️ Started clicking")
-
-    def stop(self) -> None:
-        """Stop the clicker engine."""
-        self.running = False
-        self.parent.start_btn.setEnabled(True)
-        self.parent.stop_btn.setEnabled(False)
-        self.logger.log("⏹️ Stopped clicking")
-
-    # ------------------------------------------------------------------
-    # Core loop
-    # ------------------------------------------------------------------
-    def _click_loop(self) -> None:
-        """Main click loop – Win11 precision timers & INPUT injection."""
-        try:
-            settings = self._get_settings()
-            cycle_count = 0
-            # Use Win11 high-resolution timer if available
-            self._enable_precision_timer()
-            while self.running and (settings['max_loops'] == 0 or cycle_count < settings['max_loops']):
-                for _ in range(settings['clicks']):
-                    if not self.running:
-                        break
-                    self._send_click()
-                    self.logger.log("🖱️ Clicked")
-                    self._precise_sleep(settings['click_delay'])
-                cycle_count += 1
-                self.parent.ui.widgets['progress_label'].setText(f"Cycles: {cycle_count}")
-                self.logger.log(f"🔁 Cycle {cycle_count} complete")
-                self._precise_sleep(settings['cycle_delay'])
-        except Exception as e:
-            self.logger.log(f"❌ Clicker error: {e}")
-        finally:
-            self._disable_precision_timer()
-            self.stop()
-
-    # ------------------------------------------------------------------
-    # Windows 11 specifics
-    # ------------------------------------------------------------------
-    def _ensure_uiAccess(self) -> None:
-        """Ensure we can send input to elevated/UWP windows."""
-        # Try to allow UIAccess for this process (best-effort)
-        try:
-            ctypes.windll.user32.SetProcessDPIAware()
-        except Exception:
-            pass
-
-    def _enable_precision_timer(self) -> None:
-        """Request 1 ms timer resolution for stable delays."""
-        ctypes.windll.winmm.timeBeginPeriod(1)
-
-    def _disable_precision_timer(self) -> None:
-        """Release precision timer."""
-        ctypes.windll.winmm.timeEndPeriod(1)
-
-    def _precise_sleep(self, seconds: float) -> None:
-        """High-resolution sleep using Win32 waitable timer."""
-        if seconds <= 0:
-            return
-        # 100-ns units
-        dt = -int(seconds * 10_000_000)
-        handle = ctypes.windll.kernel32.CreateWaitableTimerA(None, True, None)
-        ctypes.windll.kernel32.SetWaitableTimer(handle, ctypes.byref(ctypes.c_longlong(dt)), 0, None, None, False)
-        ctypes.windll.kernel32.WaitForSingleObject(handle, 0xFFFFFFFF)
-        ctypes.windll.kernel32.CloseHandle(handle)
-
-    def _send_click(self) -> None:
-        """Send a single left-click using Win32 INPUT structure."""
-        # INPUT structure for mouse
-        class INPUT(ctypes.Structure):
-            class _INPUTunion(ctypes.Union):
-                class MOUSEINPUT(ctypes.Structure):
-                    _fields_ = [
-                        ("dx", wintypes.LONG),
-                        ("dy", wintypes.LONG),
-                        ("mouseData", wintypes.DWORD),
-                        ("dwFlags", wintypes.DWORD),
-                        ("time", wintypes.DWORD),
-                        ("dwExtraInfo", ctypes.c_void_p),
-                    ]
-                _fields_ = [("mi", MOUSEINPUT)]
-            _fields_ = [("type", wintypes.DWORD), ("union", _INPUTunion)]
-
-        INPUT_MOUSE = 0
-        MOUSEEVENTF_LEFTDOWN = 0x0002
-        MOUSEEVENTF_LEFTUP = 0x0004
-
-        def make_input(flags):
-            inp = INPUT()
-            inp.type = INPUT_MOUSE
-            inp.union.mi.dx = 0
-            inp.union.mi.dy = 0
-            inp.union.mi.mouseData = 0
-            inp.union.mi.dwFlags = flags
-            inp.union.mi.time = 0
-            inp.union.mi.dwExtraInfo = None
-            return inp
-
-        inputs = (INPUT * 2)(
-            make_input(MOUSEEVENTF_LEFTDOWN),
-            make_input(MOUSEEVENTF_LEFTUP),
-        )
-        ctypes.windll.user32.SendInput(2, inputs, ctypes.sizeof(INPUT))
-
-    # ------------------------------------------------------------------
-    # Settings helper
-    # ------------------------------------------------------------------
-    def _get_settings(self) -> Dict[str, Any]:
-        """Get clicker settings from UI."""
-        widgets = self.parent.ui.widgets
-
-        def safe_int(widget, default):
-            try:
-                return int(widget.text() or default)
-            except (ValueError, TypeError):
-                return default
-
-        def safe_float(widget, default):
-            try:
-                return float(widget.text() or default)
-            except (ValueError, TypeError):
-                return default
-
-        return {
-            'clicks': max(1, safe_int(widgets.get('click_count'), Config.DEFAULT_SETTINGS["click_count"])),
-            'max_loops': safe_int(widgets.get('loop_count'), Config.DEFAULT_SETTINGS["loop_count"]),
-            'click_delay': max(0.001, safe_float(widgets.get('click_delay'), Config.DEFAULT_SETTINGS["click_delay"])),
-            'cycle_delay': max(0.001, safe_float(widgets.get('cycle_delay'), Config.DEFAULT_SETTINGS["cycle_delay"]))
-        }
-
 class SystemTrayManager:
     """Windows-11-optimized system-tray manager with native styling and modern menu."""
 
@@ -1678,9 +1946,16 @@ class AutoClickerApp(QMainWindow):
         self.current_color_theme = Config.DEFAULT_COLOR
         self.ui = UIManager(self, self.logger)
         self.tray = SystemTrayManager(self, self.logger)
-        self.clicker = ClickerEngine(self, self.logger)
+        self.clicker = ClickerEngine()
+        self.macro_recorder = MacroRecorder()
+        self._engine_was_running = False
+        # A start requested while the previous run is still stopping; armed once the engine is idle
+        self._queued_plan: Optional[ClickPlan] = None
+        self._seen_run = 0
+        self._last_poll = (time.perf_counter(), 0)
         self.lock.activation_requested.connect(self.show_normal)
         self._init_ui()
+        self.lock.control.attach(self.clicker, self.ui.get_click_settings())
         self._setup_timers()
         self.hotkey_manager.register_hotkey(self.hotkey_manager.current_hotkey, self.toggle_clicking)
         self.ui.widgets['update_text'].setPlainText(Config.format_update_logs())
@@ -1714,6 +1989,9 @@ class AutoClickerApp(QMainWindow):
         settings_layout.addWidget(self.ui.create_theme_settings())
         settings_layout.addStretch()
         tabs.addTab(settings_tab, "⚙️ Settings")
+        tabs.addTab(self.ui.create_sequence_tab(), "🧭 Sequence")
+        tabs.addTab(self.ui.create_macro_tab(), "⏺️ Macro")
+        tabs.addTab(self.ui.create_trigger_tab(), "🎯 Triggers")
         tabs.addTab(self.ui.create_update_tab(), "📜 Updates")
         log_tab = QWidget()
         log_layout = QVBoxLayout(log_tab)
@@ -1721,6 +1999,7 @@ class AutoClickerApp(QMainWindow):
         self.logger.log_widget.setReadOnly(True)
         log_layout.addWidget(self.logger.log_widget)
         tabs.addTab(log_tab, "📋 Activity Log")
+        tabs.addTab(self.ui.create_stats_tab(), "📊 Timing")
         tabs.addTab(self.ui.create_credits_tab(), "📄 Credits")
         layout.addWidget(tabs)
 
@@ -1731,25 +2010,105 @@ class AutoClickerApp(QMainWindow):
         self.stop_btn = QPushButton(f"⏹️ Stop ({self.hotkey_manager.current_hotkey})")
         self.stop_btn.setEnabled(False)
         self.start_btn.clicked.connect(self.toggle_clicking)
-        self.stop_btn.clicked.connect(self.clicker.stop)
+        self.stop_btn.clicked.connect(self.stop_clicking)
         btn_layout.addStretch()
         btn_layout.addWidget(self.start_btn)
         btn_layout.addWidget(self.stop_btn)
         layout.addLayout(btn_layout)
 
     def _setup_timers(self) -> None:
-        """Set up update check timer."""
+        """Set up update check and engine poll timers."""
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.check_for_updates_silent)
         self.update_timer.start(Config.UPDATE_CHECK_INTERVAL)
         QTimer.singleShot(10000, self.check_for_updates)
+        # The click thread never touches widgets; sample its counters here instead
+        self.engine_poll_timer = QTimer(self)
+        self.engine_poll_timer.timeout.connect(self._poll_engine)
+        self.engine_poll_timer.start(Config.ENGINE_POLL_INTERVAL)
+
+    def _poll_engine(self) -> None:
+        """Refresh progress, CPS, status and log from the engine counters (GUI thread)."""
+        engine = self.clicker
+        if self._queued_plan is not None and engine.state == STATE_IDLE:
+            plan, self._queued_plan = self._queued_plan, None
+            if not engine.start(plan):
+                self.logger.log(f"⚠️ Queued start refused: engine is {engine.state}")
+        running = engine.running
+        new_run = engine.runs != self._seen_run
+        now = time.perf_counter()
+        clicks = engine.clicks_done
+        last_time, last_clicks = self._last_poll
+        self._last_poll = (now, clicks)
+        if new_run:
+            self._seen_run = engine.runs
+            self.logger.log("▶️ Started clicking")
+        for message in engine.drain_messages():
+            self.logger.log(message)
+        if not running and not self._engine_was_running and not new_run:
+            return
+        widgets = self.ui.widgets
+        widgets['progress_label'].setText(f"Cycles: {engine.cycles_done}")
+        if clicks >= last_clicks and now > last_time:
+            widgets['cps_label'].setText(f"CPS: {(clicks - last_clicks) / (now - last_time):.1f}")
+        widgets['status_label'].setText(f"{engine.state} – {clicks} clicks")
+        if running != self._engine_was_running:
+            self.start_btn.setEnabled(not running)
+            self.stop_btn.setEnabled(running)
+            self._engine_was_running = running
+        if not running:
+            widgets['cps_label'].setText("CPS: 0.0")
+            self.logger.log("⏹️ Stopped clicking")
+
+    def _compile_plan(self) -> Optional[ClickPlan]:
+        """Compile the current settings into a ClickPlan, logging validation errors."""
+        settings = self.ui.get_click_settings()
+        try:
+            plan = ClickPlan.compile(settings)
+        except ValueError as e:
+            self.logger.log(f"❌ Invalid click settings: {e}")
+            return None
+        # Remote changes are layered over the form as it was last used
+        self.lock.control.use_settings(settings)
+        return plan
+
+    def start_clicking(self) -> None:
+        """Start the clicker engine with the current settings; the poller updates the UI."""
+        plan = self._compile_plan()
+        if not plan:
+            return
+        try:
+            self.clicker.set_thread_priority(*self.ui.get_thread_priority())
+        except ValueError as e:
+            self.logger.log(f"⚠️ Thread priority not applied: {e}")
+        if self.clicker.start(plan):
+            return
+        if self.clicker.state == STATE_STOPPING:
+            # The last run is still releasing held input or joining a scan; start right after it
+            self._queued_plan = plan
+            self.logger.log("⏳ Previous run is still stopping – start queued")
+        else:
+            self.logger.log(f"⚠️ Start ignored: engine is {self.clicker.state}")
+
+    def apply_live_settings(self, *_args) -> None:
+        """Hot-swap edited settings into a running engine (applied on its next cycle)."""
+        if not self.clicker.running:
+            return
+        plan = self._compile_plan()
+        if plan and plan != self.clicker.plan:
+            self.clicker.swap_plan(plan)
+
+    def stop_clicking(self) -> None:
+        """Stop the clicker engine; the poller updates the UI."""
+        self._queued_plan = None
+        self.clicker.stop()
 
     def toggle_clicking(self) -> None:
         """Toggle the clicker engine."""
         if self.clicker.running:
-            self.clicker.stop()
+            self.stop_clicking()
         else:
-            self.clicker.start()
+            self.start_clicking()
 
     def toggle_always_on_top(self) -> None:
         """Toggle the window always-on-top flag and update UI text."""
@@ -1762,6 +2121,41 @@ class AutoClickerApp(QMainWindow):
             self.logger.log("🔒 Enabled always-on-top")
         self.show()
 
+    def start_macro_recording(self) -> None:
+        """Start recording mouse and keyboard input."""
+        if self.clicker.running:
+            self.logger.log("⚠️ Stop clicking before recording a macro")
+            return
+        try:
+            self.macro_recorder.start()
+            self.logger.log("⏺️ Macro recording started")
+        except Exception as e:
+            self.logger.log(f"❌ Failed to start macro recording: {e}")
+
+    def stop_macro_recording(self) -> None:
+        """Stop recording and save the macro to the configured file."""
+        if not self.macro_recorder.recording_active:
+            self.logger.log("ℹ️ No macro recording in progress")
+            return
+        recording = self.macro_recorder.stop()
+        try:
+            path = recording.save(Path(self.ui.widgets['macro_path'].text().strip() or Config.MACRO_FILE))
+            self.logger.log(f"💾 Saved {len(recording)} macro events ({recording.duration_ns / 1e9:.1f} s) to {path}")
+        except Exception as e:
+            self.logger.log(f"❌ Failed to save macro: {e}")
+
+    def refresh_timing_stats(self) -> None:
+        """Show the latest click-timing statistics."""
+        self.ui.widgets['stats_text'].setPlainText(self.clicker.telemetry.stats().format())
+
+    def export_timing_stats(self) -> None:
+        """Export click-timing statistics and raw samples to JSON."""
+        try:
+            path = self.clicker.telemetry.export(Config.TELEMETRY_FILE)
+            self.logger.log(f"💾 Timing stats exported to {path}")
+        except Exception as e:
+            self.logger.log(f"❌ Failed to export timing stats: {e}")
+
     def update_hotkey(self) -> None:
         """Update the hotkey based on user input."""
         new_hotkey = self.ui.widgets.get('hotkey_input').text().strip()
@@ -1839,9 +2233,8 @@ class AutoClickerApp(QMainWindow):
     def kill_application(self) -> None:
         """Immediately terminate the application with full cleanup (Windows 11 optimized)."""
         self.logger.log("🚫 Kill switch activated: Terminating application...")
-        # Stop the clicker engine
-        if self.clicker.running:
-            self.clicker.stop()
+        # Stop the clicker engine (sleeps are interruptible, so this is immediate)
+        self.clicker.shutdown()
 
         # Stop the update checker
         if self.update_checker and self.update_checker.isRunning():
@@ -1882,6 +2275,7 @@ class AutoClickerApp(QMainWindow):
     def quit_app(self) -> None:
         """Clean shutdown with lock release."""
         self.logger.log("👋 Shutting down...")
+        self.clicker.shutdown()
         self.update_timer.stop()
         if self.update_checker and self.update_checker.isRunning():
             self.update_checker.stop()
@@ -0,0 +1,104 @@
+import json
+from array import array
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Final
+
+@dataclass(slots=True, frozen=True)
+class TimingStats:
+    samples: int
+    achieved_cps: float
+    mean_jitter_us: float
+    p50_jitter_us: float
+    p99_jitter_us: float
+    max_jitter_us: float
+    missed_deadlines: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format(self) -> str:
+        """Return a human-readable multi-line summary."""
+        return (
+            f"Samples: {self.samples}\n"
+            f"Achieved CPS: {self.achieved_cps:.2f}\n"
+            f"Jitter mean / p50 / p99 / max (µs): "
+            f"{self.mean_jitter_us:.1f} / {self.p50_jitter_us:.1f} / "
+            f"{self.p99_jitter_us:.1f} / {self.max_jitter_us:.1f}\n"
+            f"Missed deadlines: {self.missed_deadlines}"
+        )
+
+class ClickTelemetry:
+    """Preallocated ring buffer of intended/actual click timestamps.
+
+    Every column is a fixed-size ``array('q')`` buffer written in place, so
+    recording a click allocates no Python containers. Once full, the oldest
+    samples are overwritten. A sample can stand for several clicks sent in
+    one call (a burst), which the achieved rate accounts for.
+    """
+
+    DEFAULT_CAPACITY: Final[int] = 65_536
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = max(2, capacity)
+        self._intended = array("q", bytes(8 * self.capacity))
+        self._actual = array("q", bytes(8 * self.capacity))
+        self._clicks = array("q", bytes(8 * self.capacity))
+        self._index = 0
+        self.count = 0
+        self.missed = 0
+
+    def reset(self) -> None:
+        """Forget all samples without reallocating the buffers."""
+        self._index = 0
+        self.count = 0
+        self.missed = 0
+
+    def record(self, intended_ns: int, actual_ns: int, clicks: int = 1) -> None:
+        """Store the scheduled and actual timestamps of ``clicks`` clicks sent together."""
+        i = self._index
+        self._intended[i] = intended_ns
+        self._actual[i] = actual_ns
+        self._clicks[i] = clicks
+        i += 1
+        self._index = 0 if i == self.capacity else i
+        self.count += 1
+
+    def _ordered(self, column: array) -> array:
+        """Return the live samples of ``column`` in chronological order."""
+        if self.count < self.capacity:
+            return column[:self.count]
+        return column[self._index:] + column[:self._index]
+
+    def stats(self) -> TimingStats:
+        """Compute achieved CPS and jitter percentiles over the buffered samples."""
+        intended = self._ordered(self._intended)
+        actual = self._ordered(self._actual)
+        n = len(actual)
+        if n == 0:
+            return TimingStats(0, 0.0, 0.0, 0.0, 0.0, 0.0, self.missed)
+        jitter = sorted(a - b for a, b in zip(actual, intended))
+        span = actual[-1] - actual[0]
+        # Clicks sent from the first sample up to (not including) the last one
+        clicks = sum(self._ordered(self._clicks)) - self._clicks[self._index - 1]
+        return TimingStats(
+            samples=n,
+            achieved_cps=clicks * 1_000_000_000 / span if span > 0 else 0.0,
+            mean_jitter_us=sum(jitter) / n / 1000,
+            p50_jitter_us=jitter[n // 2] / 1000,
+            p99_jitter_us=jitter[min(n - 1, int(n * 0.99))] / 1000,
+            max_jitter_us=jitter[-1] / 1000,
+            missed_deadlines=self.missed,
+        )
+
+    def export(self, path: Path) -> Path:
+        """Write the summary and raw samples to ``path`` as JSON."""
+        payload = {
+            "stats": self.stats().to_dict(),
+            "intended_ns": self._ordered(self._intended).tolist(),
+            "actual_ns": self._ordered(self._actual).tolist(),
+            "clicks": self._ordered(self._clicks).tolist(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return path
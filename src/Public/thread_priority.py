@@ -0,0 +1,123 @@
+import os
+import sys
+import ctypes
+import threading
+from ctypes import wintypes
+from typing import Callable, Final, List, Optional, Tuple
+
+# ------------------------------------------------------------------
+# Priority levels
+# ------------------------------------------------------------------
+PRIORITY_NORMAL: Final[str] = "Normal"
+PRIORITY_HIGH: Final[str] = "High"
+PRIORITY_REALTIME: Final[str] = "Realtime"
+PRIORITY_LEVELS: Final[Tuple[str, ...]] = (PRIORITY_NORMAL, PRIORITY_HIGH, PRIORITY_REALTIME)
+
+# Windows: (SetThreadPriority level, MMCSS task)
+THREAD_PRIORITY_NORMAL: Final[int] = 0
+THREAD_PRIORITY_HIGHEST: Final[int] = 2
+THREAD_PRIORITY_TIME_CRITICAL: Final[int] = 15
+_WIN32_LEVELS: Final[dict] = {
+    PRIORITY_HIGH: (THREAD_PRIORITY_HIGHEST, "Games"),
+    PRIORITY_REALTIME: (THREAD_PRIORITY_TIME_CRITICAL, "Pro Audio"),
+}
+
+# Linux: niceness for High, SCHED_FIFO priority for Realtime
+LINUX_HIGH_NICE: Final[int] = -10
+LINUX_FIFO_PRIORITY: Final[int] = 50
+
+def describe_priority(level: str, core: Optional[int]) -> str:
+    return level if core is None else f"{level}, core {core}"
+
+def validate_priority(level: str, core: Optional[int]) -> None:
+    if level not in PRIORITY_LEVELS:
+        raise ValueError(f"Unknown thread priority: {level}")
+    if core is not None and not 0 <= core < (os.cpu_count() or 1):
+        raise ValueError(f"CPU core must be between 0 and {(os.cpu_count() or 1) - 1}")
+
+def apply_thread_priority(level: str, core: Optional[int] = None) -> Tuple[Callable[[], None], List[str]]:
+    """Raise the *calling* thread's priority and optionally pin it to ``core``.
+
+    Returns ``(restore, notes)``: ``restore`` must be called from the same
+    thread to undo every change that succeeded; ``notes`` describes steps
+    that failed (usually missing privileges), which are not fatal.
+    """
+    validate_priority(level, core)
+    if sys.platform == "win32":
+        return _apply_win32(level, core)
+    if sys.platform.startswith("linux"):
+        return _apply_linux(level, core)
+    return (lambda: None), [f"Thread priority is not supported on {sys.platform}"]
+
+def _apply_win32(level: str, core: Optional[int]) -> Tuple[Callable[[], None], List[str]]:
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentThread.restype = wintypes.HANDLE
+    kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+    kernel32.SetThreadAffinityMask.argtypes = (wintypes.HANDLE, ctypes.c_size_t)
+    thread = kernel32.GetCurrentThread()
+    undo: List[Callable[[], None]] = []
+    notes: List[str] = []
+    if level in _WIN32_LEVELS:
+        priority, task = _WIN32_LEVELS[level]
+        previous = kernel32.GetThreadPriority(thread)
+        if kernel32.SetThreadPriority(thread, priority):
+            undo.append(lambda: kernel32.SetThreadPriority(thread, previous))
+        else:
+            notes.append(f"SetThreadPriority failed ({ctypes.GetLastError()})")
+        try:
+            avrt = ctypes.windll.avrt
+            avrt.AvSetMmThreadCharacteristicsW.restype = wintypes.HANDLE
+            avrt.AvSetMmThreadCharacteristicsW.argtypes = (wintypes.LPCWSTR, ctypes.POINTER(wintypes.DWORD))
+            avrt.AvRevertMmThreadCharacteristics.argtypes = (wintypes.HANDLE,)
+            task_index = wintypes.DWORD(0)
+            mmcss = avrt.AvSetMmThreadCharacteristicsW(task, ctypes.byref(task_index))
+            if mmcss:
+                undo.append(lambda: avrt.AvRevertMmThreadCharacteristics(mmcss))
+            else:
+                notes.append(f"MMCSS '{task}' registration failed ({ctypes.GetLastError()})")
+        except OSError:
+            notes.append("MMCSS (avrt.dll) is unavailable")
+    if core is not None:
+        previous_mask = kernel32.SetThreadAffinityMask(thread, 1 << core)
+        if previous_mask:
+            undo.append(lambda: kernel32.SetThreadAffinityMask(thread, previous_mask))
+        else:
+            notes.append(f"SetThreadAffinityMask failed ({ctypes.GetLastError()})")
+    return _undo_all(undo), notes
+
+def _apply_linux(level: str, core: Optional[int]) -> Tuple[Callable[[], None], List[str]]:
+    # On Linux these calls take a thread id and only affect that thread
+    tid = threading.get_native_id()
+    undo: List[Callable[[], None]] = []
+    notes: List[str] = []
+    if level == PRIORITY_HIGH:
+        previous_nice = os.getpriority(os.PRIO_PROCESS, tid)
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, LINUX_HIGH_NICE)
+            undo.append(lambda: os.setpriority(os.PRIO_PROCESS, tid, previous_nice))
+        except PermissionError:
+            notes.append(f"Lowering niceness to {LINUX_HIGH_NICE} needs CAP_SYS_NICE")
+    elif level == PRIORITY_REALTIME:
+        policy, param = os.sched_getscheduler(tid), os.sched_getparam(tid)
+        try:
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(LINUX_FIFO_PRIORITY))
+            undo.append(lambda: os.sched_setscheduler(tid, policy, param))
+        except PermissionError:
+            notes.append("SCHED_FIFO needs CAP_SYS_NICE or an rtprio limit")
+    if core is not None:
+        previous_cores = os.sched_getaffinity(tid)
+        try:
+            os.sched_setaffinity(tid, {core})
+            undo.append(lambda: os.sched_setaffinity(tid, previous_cores))
+        except OSError as e:
+            notes.append(f"Pinning to core {core} failed: {e}")
+    return _undo_all(undo), notes
+
+def _undo_all(undo: List[Callable[[], None]]) -> Callable[[], None]:
+    def restore() -> None:
+        for step in reversed(undo):
+            try:
+                step()
+            except OSError:
+                pass
+    return restore
@@ -0,0 +1,437 @@
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import threading
+from typing import Callable, Dict, Final, Optional
+
+# ------------------------------------------------------------------
+# Reusable precision timers
+# ------------------------------------------------------------------
+class PrecisionTimer:
+    """Sleep primitive created once per engine run and re-armed per wait.
+
+    Deadlines are absolute ``time.perf_counter_ns`` readings. Every wait also
+    watches a stop signal, so ``interrupt`` (from any thread) wakes a sleeping
+    worker immediately instead of after the current delay expires.
+    ``sleep_until`` returns False when the wait was interrupted.
+    """
+
+    name: str = "sleep"
+
+    def __init__(self) -> None:
+        self.interrupted = False
+        self._stop = threading.Event()
+
+    def sleep_until(self, deadline_ns: int) -> bool:
+        """Block until the clock reaches ``deadline_ns`` or the timer is interrupted."""
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining > 0:
+            return not self._stop.wait(remaining / 1_000_000_000)
+        return not self.interrupted
+
+    def sleep_ns(self, duration_ns: int) -> bool:
+        """Block for ``duration_ns`` nanoseconds."""
+        return self.sleep_until(time.perf_counter_ns() + duration_ns)
+
+    def interrupt(self) -> None:
+        """Wake the current (and any later) wait immediately."""
+        self.interrupted = True
+        self._stop.set()
+
+    def reset(self) -> None:
+        """Re-arm the stop signal after an interrupt."""
+        self.interrupted = False
+        self._stop.clear()
+
+    def close(self) -> None:
+        """Release the underlying OS handle, if any."""
+
+class Win32WaitableTimer(PrecisionTimer):
+    """Waitable timer handle that is created once and re-armed on every sleep.
+
+    Sleeps wait on the timer and a manual-reset stop event together via
+    ``WaitForMultipleObjects``.
+    """
+
+    name = "win32"
+
+    CREATE_WAITABLE_TIMER_MANUAL_RESET: Final[int] = 0x00000001
+    CREATE_WAITABLE_TIMER_HIGH_RESOLUTION: Final[int] = 0x00000002
+    TIMER_ALL_ACCESS: Final[int] = 0x1F0003
+    INFINITE: Final[int] = 0xFFFFFFFF
+    WAIT_OBJECT_0: Final[int] = 0
+
+    def __init__(self) -> None:
+        super().__init__()
+        kernel32 = ctypes.windll.kernel32
+        self._set_timer = kernel32.SetWaitableTimer
+        self._wait_multiple = kernel32.WaitForMultipleObjects
+        self._set_event = kernel32.SetEvent
+        self._reset_event = kernel32.ResetEvent
+        self._close_handle = kernel32.CloseHandle
+        self._due = ctypes.c_longlong(0)
+        self._due_ref = ctypes.byref(self._due)
+        kernel32.CreateWaitableTimerExW.restype = ctypes.c_void_p
+        kernel32.CreateWaitableTimerW.restype = ctypes.c_void_p
+        kernel32.CreateEventW.restype = ctypes.c_void_p
+        self._wait_multiple.argtypes = (ctypes.c_uint32, ctypes.POINTER(ctypes.c_void_p), ctypes.c_int, ctypes.c_uint32)
+        self._wait_multiple.restype = ctypes.c_uint32
+        self._set_timer.argtypes = (
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_longlong), ctypes.c_long,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+        )
+        self._set_event.argtypes = (ctypes.c_void_p,)
+        self._reset_event.argtypes = (ctypes.c_void_p,)
+        self._close_handle.argtypes = (ctypes.c_void_p,)
+        # High-resolution timers need Windows 10 1803+; fall back to a classic one
+        self.high_resolution = True
+        self._handle = kernel32.CreateWaitableTimerExW(
+            None, None, self.CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, self.TIMER_ALL_ACCESS
+        )
+        if not self._handle:
+            self.high_resolution = False
+            self._handle = kernel32.CreateWaitableTimerW(None, True, None)
+        if not self._handle:
+            raise OSError("CreateWaitableTimer failed")
+        self._event = kernel32.CreateEventW(None, True, False, None)
+        if not self._event:
+            self._close_handle(self._handle)
+            raise OSError("CreateEvent failed")
+        self._handles = (ctypes.c_void_p * 2)(self._handle, self._event)
+
+    def sleep_until(self, deadline_ns: int) -> bool:
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining <= 0:
+            return not self.interrupted
+        # Negative due time = relative, in 100-ns units
+        self._due.value = -(remaining // 100) or -1
+        self._set_timer(self._handle, self._due_ref, 0, None, None, False)
+        return self._wait_multiple(2, self._handles, False, self.INFINITE) == self.WAIT_OBJECT_0
+
+    def interrupt(self) -> None:
+        self.interrupted = True
+        if self._event:
+            self._set_event(self._event)
+
+    def reset(self) -> None:
+        self.interrupted = False
+        if self._event:
+            self._reset_event(self._event)
+
+    def close(self) -> None:
+        for handle in (self._handle, self._event):
+            if handle:
+                self._close_handle(handle)
+        self._handle = self._event = None
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+class _Itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+class LinuxTimerfdTimer(PrecisionTimer):
+    """Absolute CLOCK_MONOTONIC ``timerfd`` polled together with an ``eventfd``.
+
+    ``time.perf_counter_ns`` reads CLOCK_MONOTONIC on Linux, so engine
+    deadlines are armed straight through as absolute wake-up times; writing
+    to the eventfd interrupts the poll.
+    """
+
+    name = "timerfd"
+
+    CLOCK_MONOTONIC: Final[int] = 1
+    TFD_TIMER_ABSTIME: Final[int] = 1
+    TFD_CLOEXEC: Final[int] = 0o2000000
+
+    def __init__(self) -> None:
+        super().__init__()
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.timerfd_create.argtypes = (ctypes.c_int, ctypes.c_int)
+        libc.timerfd_settime.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(_Itimerspec), ctypes.c_void_p)
+        self._settime = libc.timerfd_settime
+        self._timer_fd = libc.timerfd_create(self.CLOCK_MONOTONIC, self.TFD_CLOEXEC)
+        if self._timer_fd < 0:
+            raise OSError(ctypes.get_errno(), "timerfd_create failed")
+        self._event_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+        self._spec = _Itimerspec()
+        self._spec_ref = ctypes.byref(self._spec)
+        self._poll = select.poll()
+        self._poll.register(self._timer_fd, select.POLLIN)
+        self._poll.register(self._event_fd, select.POLLIN)
+
+    def sleep_until(self, deadline_ns: int) -> bool:
+        if self.interrupted:
+            return False
+        if deadline_ns <= time.perf_counter_ns():
+            return True
+        value = self._spec.it_value
+        value.tv_sec, value.tv_nsec = divmod(deadline_ns, 1_000_000_000)
+        self._settime(self._timer_fd, self.TFD_TIMER_ABSTIME, self._spec_ref, None)
+        while True:
+            for fd, _ in self._poll.poll():
+                if fd == self._event_fd:
+                    return False
+                os.read(self._timer_fd, 8)
+                return True
+
+    def interrupt(self) -> None:
+        self.interrupted = True
+        if self._event_fd is not None:
+            os.eventfd_write(self._event_fd, 1)
+
+    def reset(self) -> None:
+        self.interrupted = False
+        if self._event_fd is not None:
+            try:
+                os.eventfd_read(self._event_fd)
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        for fd in (self._timer_fd, self._event_fd):
+            if fd is not None and fd >= 0:
+                os.close(fd)
+        self._timer_fd = self._event_fd = None
+
+class HybridTimer(PrecisionTimer):
+    """Coarse OS sleep until ``margin_ns`` before the deadline, then busy-wait.
+
+    Trades CPU for accuracy: the spin phase never exceeds ``spin_budget_ns``
+    and the margin is auto-calibrated from the coarse timer's overshoot.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, coarse: PrecisionTimer, spin_budget_ns: int, margin_ns: Optional[int] = None) -> None:
+        # Stop state lives on the coarse timer, so the base initialiser is not used
+        self.coarse = coarse
+        self.spin_budget_ns = max(0, spin_budget_ns)
+        self.margin_ns = min(margin_ns if margin_ns is not None else self.spin_budget_ns, self.spin_budget_ns)
+
+    def calibrate(
+        self, samples: int = 20, interval_ns: int = 1_000_000, abort: Optional[Callable[[], bool]] = None,
+    ) -> Optional[int]:
+        """Set the spin margin to the coarse timer's p99 overshoot, capped by the budget.
+
+        Returns None and leaves the margin alone if ``abort`` turns true between samples.
+        """
+        stats = benchmark_timer(self.coarse, interval_ns, samples, abort)
+        if stats is None:
+            return None
+        self.margin_ns = min(int(stats["p99_us"] * 1000), self.spin_budget_ns)
+        return self.margin_ns
+
+    def sleep_until(self, deadline_ns: int) -> bool:
+        clock = time.perf_counter_ns
+        coarse = self.coarse
+        if deadline_ns - clock() > self.margin_ns and not coarse.sleep_until(deadline_ns - self.margin_ns):
+            return False
+        while clock() < deadline_ns:
+            if coarse.interrupted:
+                return False
+        return not coarse.interrupted
+
+    @property
+    def interrupted(self) -> bool:
+        return self.coarse.interrupted
+
+    def interrupt(self) -> None:
+        self.coarse.interrupt()
+
+    def reset(self) -> None:
+        self.coarse.reset()
+
+    def close(self) -> None:
+        self.coarse.close()
+
+# ------------------------------------------------------------------
+# Timing profiles (CPU vs accuracy)
+# ------------------------------------------------------------------
+TIMING_PROFILES: Final[Dict[str, int]] = {
+    "Eco": 0,  # OS timer only, no spinning
+    "Balanced": 500_000,  # spin at most 0.5 ms per wait
+    "Precise": 2_000_000,  # spin at most 2 ms per wait
+}
+DEFAULT_TIMING_PROFILE: Final[str] = "Balanced"
+
+def create_profile_timer(profile: str = DEFAULT_TIMING_PROFILE, margin_ns: Optional[int] = None) -> PrecisionTimer:
+    """Return a timer for the named profile; hybrid timers are calibrated unless ``margin_ns`` is given."""
+    spin_budget = TIMING_PROFILES.get(profile, TIMING_PROFILES[DEFAULT_TIMING_PROFILE])
+    coarse = create_timer()
+    if spin_budget <= 0:
+        return coarse
+    timer = HybridTimer(coarse, spin_budget, margin_ns)
+    if margin_ns is None:
+        timer.calibrate()
+    return timer
+
+def create_timer(name: Optional[str] = None) -> PrecisionTimer:
+    """Return the best available timer for this platform (or ``name``)."""
+    if name is None:
+        name = "win32" if sys.platform == "win32" else "timerfd" if sys.platform.startswith("linux") else "sleep"
+    if name == "win32":
+        return Win32WaitableTimer()
+    if name == "timerfd":
+        return LinuxTimerfdTimer()
+    if name == "sleep":
+        return PrecisionTimer()
+    raise ValueError(f"Unknown timer: {name}")
+
+def benchmark_timer(
+    timer: PrecisionTimer, interval_ns: int = 1_000_000, samples: int = 200, abort: Optional[Callable[[], bool]] = None,
+) -> Optional[Dict[str, float]]:
+    """Measure wake-up overshoot of ``timer`` in microseconds; None if ``abort`` turns true first."""
+    overshoots = []
+    deadline = time.perf_counter_ns()
+    for _ in range(samples):
+        if abort is not None and abort():
+            return None
+        deadline += interval_ns
+        timer.sleep_until(deadline)
+        overshoots.append(time.perf_counter_ns() - deadline)
+    overshoots.sort()
+    return {
+        "timer": timer.name,
+        "mean_us": sum(overshoots) / len(overshoots) / 1000,
+        "p50_us": overshoots[len(overshoots) // 2] / 1000,
+        "p99_us": overshoots[min(len(overshoots) - 1, int(len(overshoots) * 0.99))] / 1000,
+        "max_us": overshoots[-1] / 1000,
+    }
+
+# ------------------------------------------------------------------
+# Catch-up policies
+# ------------------------------------------------------------------
+CATCH_UP_SKIP: Final[str] = "skip"
+CATCH_UP_BURST: Final[str] = "burst"
+CATCH_UP_POLICIES: Final[tuple] = (CATCH_UP_SKIP, CATCH_UP_BURST)
+# Most missed clicks a single catch-up burst sends
+MAX_CATCH_UP: Final[int] = 100
+
+class DeadlineScheduler:
+    """Absolute-deadline pacing on a monotonic nanosecond clock.
+
+    Deadlines are computed as ``base + sum(intervals)`` instead of chaining
+    relative sleeps, so the time spent doing work between waits does not
+    accumulate as drift. When the caller falls behind by whole intervals the
+    grid jumps forward and ``wait`` reports how many ticks were missed; the
+    caller decides (via ``catch_up``) whether to drop them or burst them.
+    """
+
+    __slots__ = ("_clock", "_sleep_until", "catch_up", "max_catch_up", "_deadline", "missed")
+
+    def __init__(
+        self,
+        sleep_until: Callable[[int], None],
+        catch_up: str = CATCH_UP_SKIP,
+        max_catch_up: int = MAX_CATCH_UP,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up}")
+        self._clock = clock
+        self._sleep_until = sleep_until
+        self.catch_up = catch_up
+        self.max_catch_up = max_catch_up
+        self._deadline = 0
+        self.missed = 0
+
+    @property
+    def deadline(self) -> int:
+        """Current absolute deadline in clock nanoseconds."""
+        return self._deadline
+
+    def set_sleeper(self, sleep_until: Callable[[int], None]) -> None:
+        """Swap the blocking primitive without disturbing the deadline grid."""
+        self._sleep_until = sleep_until
+
+    def start(self) -> int:
+        """Anchor the schedule at the current clock reading."""
+        self._deadline = self._clock()
+        self.missed = 0
+        return self._deadline
+
+    def wait(self, interval_ns: int, limit: Optional[int] = None) -> int:
+        """Advance the deadline by ``interval_ns`` and block until it.
+
+        Returns the number of whole intervals that were already overdue. The
+        grid jumps over at most ``limit`` of them, so a caller can keep an
+        overdue deadline that marks a boundary (such as the end of a cycle).
+        """
+        deadline = self._deadline + interval_ns
+        remaining = deadline - self._clock()
+        if remaining > 0:
+            self._sleep_until(deadline)
+            self._deadline = deadline
+            return 0
+        missed = (-remaining) // interval_ns if interval_ns > 0 else 0
+        if limit is not None and missed > limit:
+            missed = limit
+        self._deadline = deadline + missed * interval_ns
+        self.missed += missed
+        return missed
+
+    def advance(self, duration_ns: int) -> None:
+        """Move the grid forward without waiting (e.g. over whole overdue cycles)."""
+        self._deadline += duration_ns
+
+    def catch_up_count(self, missed: int) -> int:
+        """Return how many missed ticks the caller should fire now."""
+        if self.catch_up == CATCH_UP_BURST:
+            return min(missed, self.max_catch_up)
+        return 0
+
+# ------------------------------------------------------------------
+# Closed-loop rate control
+# ------------------------------------------------------------------
+MAX_CPS: Final[int] = 1000
+
+class RateController:
+    """Sliding-window feedback controller that holds a target clicks-per-second.
+
+    Every ``window_ns`` the achieved rate is compared with the target and the
+    click interval is nudged proportionally (``gain``), bounded to
+    ``[0.5, 1.5] x`` the nominal interval, so systematic timer overshoot and
+    missed deadlines are corrected without oscillating.
+    """
+
+    __slots__ = (
+        "target_cps", "gain", "window_ns", "base_interval_ns", "interval_ns",
+        "achieved_cps", "_window_start", "_window_clicks", "_min_ns", "_max_ns",
+    )
+
+    def __init__(self, target_cps: float, window_ns: int = 1_000_000_000, gain: float = 0.5) -> None:
+        if target_cps <= 0:
+            raise ValueError("target_cps must be positive")
+        self.target_cps = min(float(target_cps), MAX_CPS)
+        self.gain = gain
+        self.window_ns = window_ns
+        self.base_interval_ns = int(1_000_000_000 / self.target_cps)
+        self.interval_ns = self.base_interval_ns
+        self.achieved_cps = 0.0
+        self._min_ns = self.base_interval_ns // 2
+        self._max_ns = self.base_interval_ns * 3 // 2
+        self._window_start = 0
+        self._window_clicks = 0
+
+    def start(self, now_ns: int) -> None:
+        """Open the first measurement window."""
+        self._window_start = now_ns
+        self._window_clicks = 0
+        self.interval_ns = self.base_interval_ns
+
+    def tick(self, now_ns: int, clicks: int = 1) -> int:
+        """Record ``clicks`` at ``now_ns`` and return the interval to use next."""
+        self._window_clicks += clicks
+        elapsed = now_ns - self._window_start
+        if elapsed >= self.window_ns:
+            self.achieved_cps = self._window_clicks * 1_000_000_000 / elapsed
+            ratio = self.achieved_cps / self.target_cps
+            corrected = int(self.interval_ns * (1 + self.gain * (ratio - 1)))
+            self.interval_ns = max(self._min_ns, min(self._max_ns, corrected))
+            self._window_start = now_ns
+            self._window_clicks = 0
+        return self.interval_ns
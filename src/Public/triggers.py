@@ -0,0 +1,309 @@
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from src.Public.click_sequence import normalize_point
+from src.Public.screen_capture import CaptureBackend
+
+# Optional and slow to import: loaded by _require_numpy when an image trigger is built
+np = None
+sliding_window_view = None
+
+def parse_color(value: Any) -> Tuple[int, int, int]:
+    """Parse ``"#rrggbb"``, ``"r,g,b"`` or an ``(r, g, b)`` sequence."""
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("#") and len(text) == 7:
+            return tuple(int(text[i:i + 2], 16) for i in (1, 3, 5))
+        value = text.split(",")
+    rgb = tuple(int(c) for c in value)
+    if len(rgb) != 3 or any(not 0 <= c <= 255 for c in rgb):
+        raise ValueError(f"Invalid color: {value}")
+    return rgb
+
+@dataclass(slots=True, frozen=True)
+class PixelCondition:
+    """Click only while every pixel of a small region is within ``tolerance`` of ``color``."""
+    x: int
+    y: int
+    color: Tuple[int, int, int]
+    width: int = 1
+    height: int = 1
+    tolerance: int = 0
+
+    MAX_SIZE = 64
+
+    def __post_init__(self) -> None:
+        if not (0 < self.width <= self.MAX_SIZE and 0 < self.height <= self.MAX_SIZE):
+            raise ValueError(f"Trigger region must be 1–{self.MAX_SIZE} pixels per side")
+        if not 0 <= self.tolerance <= 255:
+            raise ValueError("Color tolerance must be between 0 and 255")
+
+    @property
+    def region(self) -> Tuple[int, int, int, int]:
+        return (self.x, self.y, self.width, self.height)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PixelCondition":
+        return cls(
+            x=int(data["x"]),
+            y=int(data["y"]),
+            color=parse_color(data["color"]),
+            width=int(data.get("width", 1)),
+            height=int(data.get("height", 1)),
+            tolerance=int(data.get("tolerance", 0)),
+        )
+
+@dataclass(slots=True, frozen=True)
+class TemplateCondition:
+    """Click while an image appears in a screen region, optionally at the match location."""
+    image_path: str
+    x: int
+    y: int
+    width: int
+    height: int
+    threshold: float = 0.9
+    click_at_match: bool = False
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError("Search region must have a positive size")
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError("Match threshold must be between 0 and 1")
+
+    @property
+    def region(self) -> Tuple[int, int, int, int]:
+        return (self.x, self.y, self.width, self.height)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateCondition":
+        return cls(
+            image_path=str(data["image_path"]),
+            x=int(data["x"]),
+            y=int(data["y"]),
+            width=int(data["width"]),
+            height=int(data["height"]),
+            threshold=float(data.get("threshold", 0.9)),
+            click_at_match=bool(data.get("click_at_match", False)),
+        )
+
+class PixelTrigger:
+    """Checks a PixelCondition against the screen through a capture backend.
+
+    The capture context is opened once for the ROI. Each check is one ROI
+    grab plus three C-level passes (one per channel) that delete every
+    in-tolerance byte – any byte left over means a mismatch.
+    """
+
+    def __init__(self, capture: CaptureBackend, condition: PixelCondition) -> None:
+        self.capture = capture
+        self.condition = condition
+        # Per channel (B, G, R in memory order): the byte values that count as a match
+        self._allowed = tuple(
+            bytes(range(max(0, c - condition.tolerance), min(255, c + condition.tolerance) + 1))
+            for c in reversed(condition.color)
+        )
+        self.name = "Pixel trigger"
+        self.checks = 0
+        self.max_check_ns = 0
+        capture.open(condition.region)
+
+    def matches(self) -> bool:
+        """Grab the ROI and return True if it matches the condition."""
+        start = time.perf_counter_ns()
+        pixels = self.capture.grab()
+        result = True
+        for channel, allowed in enumerate(self._allowed):
+            if pixels[channel::4].tobytes().translate(None, allowed):
+                result = False
+                break
+        elapsed = time.perf_counter_ns() - start
+        self.checks += 1
+        if elapsed > self.max_check_ns:
+            self.max_check_ns = elapsed
+        return result
+
+    def close(self) -> None:
+        self.capture.close()
+
+# ------------------------------------------------------------------
+# Template matching
+# ------------------------------------------------------------------
+def _require_numpy() -> None:
+    global np, sliding_window_view
+    if np is None:
+        try:
+            import numpy
+            from numpy.lib.stride_tricks import sliding_window_view
+        except ImportError:
+            raise RuntimeError("Image triggers need numpy (pip install numpy)") from None
+        np = numpy
+
+def to_gray(pixels: memoryview, width: int, height: int) -> "np.ndarray":
+    """Convert a BGRA capture buffer to a float32 luminance image."""
+    bgra = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+    return bgra[..., 2] * np.float32(0.299) + bgra[..., 1] * np.float32(0.587) + bgra[..., 0] * np.float32(0.114)
+
+def load_template(path: str) -> "np.ndarray":
+    """Load an image file as a float32 luminance template."""
+    _require_numpy()
+    from PIL import Image
+    with Image.open(path) as image:
+        return np.asarray(image.convert("L"), dtype=np.float32)
+
+def downscale(image: "np.ndarray") -> "np.ndarray":
+    """Halve an image by 2x2 mean pooling."""
+    h, w = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    return image[:h, :w].reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3))
+
+def _window_sums(image: "np.ndarray", h: int, w: int) -> "np.ndarray":
+    """Sum of every ``h`` x ``w`` window via an integral image."""
+    c = np.pad(image, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return c[h:, w:] - c[:-h, w:] - c[h:, :-w] + c[:-h, :-w]
+
+def best_match(image: "np.ndarray", template: "np.ndarray") -> Tuple[int, int, float]:
+    """Return ``(x, y, score)`` of the best template position; score is 1 for an exact match.
+
+    The sum of squared differences is expanded as ΣI² − 2ΣIT + ΣT², with
+    ΣI² from an integral image and ΣIT as one einsum over a strided window
+    view, so no per-window Python work or window copies are involved.
+    """
+    th, tw = template.shape
+    if image.shape[0] < th or image.shape[1] < tw:
+        return 0, 0, 0.0
+    image = image.astype(np.float64, copy=False)
+    template = template.astype(np.float64, copy=False)
+    corr = np.einsum("ijkl,kl->ij", sliding_window_view(image, (th, tw)), template)
+    ssd = _window_sums(image * image, th, tw) - 2.0 * corr + float((template * template).sum())
+    y, x = np.unravel_index(int(np.argmin(ssd)), ssd.shape)
+    rms = np.sqrt(max(float(ssd[y, x]), 0.0) / template.size)
+    return int(x), int(y), 1.0 - float(rms) / 255.0
+
+class TemplateMatcher:
+    """Coarse-to-fine template search over an image pyramid.
+
+    The full scan runs on the coarsest level only; each finer level just
+    refines a few pixels around the previous estimate. A search first looks
+    near the last hit at full resolution and only falls back to the full
+    pyramid scan when the image has moved away.
+    """
+
+    MAX_LEVELS = 4
+    MIN_TEMPLATE_SIDE = 8
+    REFINE_RADIUS = 2
+
+    def __init__(self, template: "np.ndarray", threshold: float = 0.9) -> None:
+        _require_numpy()
+        self.threshold = threshold
+        self.templates: List["np.ndarray"] = [np.asarray(template, dtype=np.float32)]
+        while (
+            len(self.templates) < self.MAX_LEVELS
+            and min(self.templates[-1].shape) // 2 >= self.MIN_TEMPLATE_SIDE
+        ):
+            self.templates.append(downscale(self.templates[-1]))
+        self.last_hit: Optional[Tuple[int, int]] = None
+        self.full_scans = 0
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.templates[0].shape
+
+    def _search_near(self, image: "np.ndarray", template: "np.ndarray", x: int, y: int, radius: int) -> Tuple[int, int, float]:
+        th, tw = template.shape
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        x1 = min(image.shape[1], x + radius + tw)
+        y1 = min(image.shape[0], y + radius + th)
+        bx, by, score = best_match(image[y0:y1, x0:x1], template)
+        return x0 + bx, y0 + by, score
+
+    def find(self, image: "np.ndarray") -> Optional[Tuple[int, int, float]]:
+        """Return the top-left ``(x, y, score)`` of the template in ``image``, or None."""
+        if self.last_hit is not None:
+            radius = max(self.shape) // 2
+            hit = self._search_near(image, self.templates[0], *self.last_hit, radius)
+            if hit[2] >= self.threshold:
+                self.last_hit = hit[:2]
+                return hit
+        self.full_scans += 1
+        pyramid = [image]
+        for _ in range(len(self.templates) - 1):
+            pyramid.append(downscale(pyramid[-1]))
+        x, y, score = best_match(pyramid[-1], self.templates[-1])
+        for level in range(len(self.templates) - 2, -1, -1):
+            x, y, score = self._search_near(pyramid[level], self.templates[level], 2 * x, 2 * y, self.REFINE_RADIUS)
+        if score < self.threshold:
+            self.last_hit = None
+            return None
+        self.last_hit = (x, y)
+        return x, y, score
+
+class TemplateTrigger:
+    """Non-blocking image trigger: matching runs on a worker pool.
+
+    ``matches`` never waits: it returns the latest finished result and, if
+    no scan is in flight, submits the next grab-and-match job. The capture
+    backend is only touched by that single in-flight job.
+    """
+
+    def __init__(
+        self, capture: CaptureBackend, condition: TemplateCondition, pool: Executor,
+        desktop: Tuple[int, int, int, int], template: Optional["np.ndarray"] = None,
+    ) -> None:
+        self.name = "Image trigger"
+        self.capture = capture
+        self.condition = condition
+        self.pool = pool
+        self.desktop = desktop
+        self.matcher = TemplateMatcher(
+            template if template is not None else load_template(condition.image_path), condition.threshold
+        )
+        self.matched = False
+        # Normalized absolute coordinates of the last match centre
+        self.target: Tuple[int, int] = (0, 0)
+        self.checks = 0
+        self.max_check_ns = 0
+        self.scans = 0
+        self.max_scan_ns = 0
+        self._pending: Optional[Future] = None
+        capture.open(condition.region)
+
+    def matches(self) -> bool:
+        """Return the latest match state and keep one scan in flight."""
+        start = time.perf_counter_ns()
+        pending = self._pending
+        if pending is None or pending.done():
+            if pending is not None:
+                self._apply(pending.result())
+            self._pending = self.pool.submit(self._scan)
+        elapsed = time.perf_counter_ns() - start
+        self.checks += 1
+        if elapsed > self.max_check_ns:
+            self.max_check_ns = elapsed
+        return self.matched
+
+    def _apply(self, hit: Optional[Tuple[int, int, float]]) -> None:
+        if hit is None:
+            self.matched = False
+            return
+        th, tw = self.matcher.shape
+        x, y = self.condition.x + hit[0] + tw // 2, self.condition.y + hit[1] + th // 2
+        self.target = normalize_point(x, y, self.desktop)
+        self.matched = True
+
+    def _scan(self) -> Optional[Tuple[int, int, float]]:
+        """Grab the region and search it (runs on the pool)."""
+        start = time.perf_counter_ns()
+        _, _, width, height = self.condition.region
+        hit = self.matcher.find(to_gray(self.capture.grab(), width, height))
+        elapsed = time.perf_counter_ns() - start
+        self.scans += 1
+        if elapsed > self.max_scan_ns:
+            self.max_scan_ns = elapsed
+        return hit
+
+    def close(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None and not pending.cancel():
+            # Let an in-flight scan finish before its capture context goes away
+            pending.exception()
+        self.capture.close()
@@ -0,0 +1,192 @@
+import heapq
+import random
+import itertools
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+from src.Public.click_plan import ClickPlan
+from src.Public.clicker_engine import ClickerEngine
+from src.Public.input_backend import RecordingInputBackend
+from src.Public.telemetry import TimingStats
+from src.Public.timing import PrecisionTimer
+
+# ------------------------------------------------------------------
+# Virtual time
+# ------------------------------------------------------------------
+class VirtualClock:
+    """Nanosecond clock that only moves when something advances it.
+
+    Callable like ``time.perf_counter_ns``. Callbacks registered with
+    ``call_at`` run on whichever thread advances the clock past their time,
+    with the clock reading exactly that time while they run.
+    """
+
+    def __init__(self, start_ns: int = 0) -> None:
+        self.now_ns = start_ns
+        self._events: List[Tuple[int, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+
+    def __call__(self) -> int:
+        return self.now_ns
+
+    def call_at(self, when_ns: int, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the clock reaches ``when_ns``."""
+        heapq.heappush(self._events, (when_ns, next(self._seq), callback))
+
+    def cancel_all(self) -> None:
+        """Drop every pending callback."""
+        self._events.clear()
+
+    def advance(self, duration_ns: int) -> None:
+        self.advance_to(self.now_ns + duration_ns)
+
+    def advance_to(self, deadline_ns: int, interrupted: Callable[[], bool] = lambda: False) -> bool:
+        """Jump to ``deadline_ns``, firing due callbacks; stop early (False) once ``interrupted``."""
+        events = self._events
+        while events and events[0][0] <= deadline_ns:
+            when, _, callback = heapq.heappop(events)
+            self.now_ns = max(self.now_ns, when)
+            callback()
+            if interrupted():
+                return False
+        self.now_ns = max(self.now_ns, deadline_ns)
+        return True
+
+class SimulatedTimer(PrecisionTimer):
+    """PrecisionTimer that advances a VirtualClock instead of sleeping.
+
+    ``overshoot`` maps a deadline to how late the wake-up is, which is how
+    scheduling noise and missed deadlines are modelled.
+    """
+
+    name = "simulated"
+
+    def __init__(self, clock: VirtualClock, overshoot: Optional[Callable[[int], int]] = None) -> None:
+        super().__init__()
+        self.clock = clock
+        self.overshoot = overshoot
+        self.sleeps = 0
+
+    def sleep_until(self, deadline_ns: int) -> bool:
+        if self.interrupted:
+            return False
+        self.sleeps += 1
+        if self.overshoot is not None:
+            deadline_ns += self.overshoot(deadline_ns)
+        return self.clock.advance_to(deadline_ns, lambda: self.interrupted) and not self.interrupted
+
+    def sleep_ns(self, duration_ns: int) -> bool:
+        return self.sleep_until(self.clock() + duration_ns)
+
+def random_overshoot(max_ns: int, seed: Optional[int] = None, late_every: int = 0, late_ns: int = 0) -> Callable[[int], int]:
+    """Uniform ``0..max_ns`` wake-up lateness, plus a ``late_ns`` stall every ``late_every`` sleeps."""
+    rng = random.Random(seed)
+    sleeps = itertools.count(1)
+
+    def overshoot(deadline_ns: int) -> int:
+        late = rng.randint(0, max_ns) if max_ns else 0
+        if late_every and next(sleeps) % late_every == 0:
+            late += late_ns
+        return late
+    return overshoot
+
+class SimulatedInputBackend(RecordingInputBackend):
+    """RecordingInputBackend on virtual time; each injected event costs ``event_cost_ns``."""
+
+    name = "simulated"
+
+    def __init__(self, clock: VirtualClock, event_cost_ns: int = 0, record_timestamps: bool = False) -> None:
+        super().__init__(record_timestamps, clock=clock)
+        self.event_cost_ns = event_cost_ns
+
+    def click(self) -> int:
+        return self._charge(super().click())
+
+    def burst(self, count: int) -> int:
+        return self._charge(super().burst(count))
+
+    def send(self, compiled) -> int:
+        return self._charge(super().send(compiled))
+
+    def _charge(self, events: int) -> int:
+        if self.event_cost_ns:
+            self.clock.advance(events * self.event_cost_ns)
+        return events
+
+# ------------------------------------------------------------------
+# Harness
+# ------------------------------------------------------------------
+@dataclass(slots=True, frozen=True)
+class SimulationResult:
+    clicks: int
+    cycles: int
+    elapsed_ns: int
+    stop_latency_ns: Optional[int]
+    stats: TimingStats
+    messages: Tuple[str, ...]
+
+class EngineSimulation:
+    """Runs a real ClickerEngine against virtual time.
+
+    The engine's click loop is unchanged; only its clock, timers and input
+    backend are swapped, so "8 hours at 100 CPS" costs as much wall time as
+    the loop needs to execute 2.88M iterations – no sleeping at all.
+    Schedule stops, plan swaps or any other action at virtual times with
+    ``at`` before calling ``run``; call ``close`` after the last run.
+    """
+
+    WALL_TIMEOUT = 600.0
+
+    def __init__(
+        self, start_ns: int = 0, overshoot: Optional[Callable[[int], int]] = None, event_cost_ns: int = 0,
+    ) -> None:
+        self.clock = VirtualClock(start_ns)
+        self.overshoot = overshoot
+        self.backend = SimulatedInputBackend(self.clock, event_cost_ns)
+        self.timers: List[SimulatedTimer] = []
+        self.engine = ClickerEngine(self.backend, clock=self.clock, timer_factory=self._create_timer)
+
+    def _create_timer(self, profile: str) -> SimulatedTimer:
+        timer = SimulatedTimer(self.clock, self.overshoot)
+        self.timers.append(timer)
+        return timer
+
+    def at(self, offset_ns: int, action: Callable[[ClickerEngine], None]) -> None:
+        """Call ``action(engine)`` ``offset_ns`` from now – the start of the next run, as idle time stands still."""
+        self.clock.call_at(self.clock() + offset_ns, lambda: action(self.engine))
+
+    def stop_at(self, offset_ns: int) -> None:
+        self.at(offset_ns, ClickerEngine.stop)
+
+    def swap_at(self, offset_ns: int, plan: ClickPlan) -> None:
+        self.at(offset_ns, lambda engine: engine.swap_plan(plan))
+
+    def run(self, plan: ClickPlan, duration_ns: Optional[int] = None) -> SimulationResult:
+        """Run ``plan`` until it finishes or ``duration_ns`` of virtual time has passed.
+
+        Scheduled actions that have not fired when the run ends are dropped.
+        """
+        if duration_ns is None and not plan.max_loops:
+            raise ValueError("An endless plan needs a duration")
+        if duration_ns is not None:
+            self.stop_at(duration_ns)
+        engine = self.engine
+        started = self.clock()
+        if not engine.start(plan):
+            raise RuntimeError(f"Engine is {engine.state}, not Idle")
+        try:
+            if not engine.join(self.WALL_TIMEOUT):
+                engine.stop()
+                raise TimeoutError("Simulated run did not finish")
+        finally:
+            self.clock.cancel_all()
+        return SimulationResult(
+            clicks=engine.clicks_done,
+            cycles=engine.cycles_done,
+            elapsed_ns=self.clock() - started,
+            stop_latency_ns=engine.last_stop_latency_ns,
+            stats=engine.telemetry.stats(),
+            messages=tuple(engine.drain_messages()),
+        )
+
+    def close(self) -> None:
+        self.engine.shutdown()
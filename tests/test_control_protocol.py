@@ -0,0 +1,112 @@
+import socket
+import pytest
+from src.Public.clicker_engine import ClickerEngine
+from src.Public.control_protocol import LEGACY_ACTIVATE, PROTOCOL_VERSION, ControlClient, ControlError, ControlServer
+from src.Public.input_backend import RecordingInputBackend
+
+BASE_SETTINGS = {"clicks": 1, "max_loops": 0, "click_delay": 0.01, "cycle_delay": 0.0}
+
+@pytest.fixture
+def control():
+    """A ControlServer on a local listener, driving an engine with a recording backend."""
+    activations = []
+    engine = ClickerEngine(RecordingInputBackend())
+    server = ControlServer(on_activate=lambda: activations.append(True))
+    server.attach(engine, BASE_SETTINGS)
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+
+    def connect() -> ControlClient:
+        client = ControlClient(port)
+        server.serve(listener.accept()[0])
+        return client
+    yield server, engine, connect, activations
+    server.close()
+    listener.close()
+    engine.stop()
+    engine.shutdown()
+
+def test_hello_lists_commands(control):
+    _, _, connect, _ = control
+    with connect() as client:
+        reply = client.request("hello")
+    assert reply["protocol"] == PROTOCOL_VERSION
+    assert {"start", "stop", "set_plan", "get_stats", "subscribe"} <= set(reply["commands"])
+
+def test_start_stop_over_one_connection(control):
+    _, engine, connect, _ = control
+    with connect() as client:
+        assert client.request("start", settings={"max_loops": 5})["run"] == 1
+        assert engine.join(2.0)
+        stats = client.request("get_stats")
+        assert (stats["state"], stats["clicks"], stats["cycles"]) == ("Idle", 5, 5)
+        client.request("start")
+        assert client.request("stop", wait=True)["state"] == "Idle"
+
+def test_start_while_running_is_refused(control):
+    _, _, connect, _ = control
+    with connect() as client:
+        client.request("start")
+        with pytest.raises(ControlError, match="not Idle"):
+            client.request("start")
+
+def test_set_plan_keeps_earlier_remote_changes(control):
+    _, engine, connect, _ = control
+    with connect() as client:
+        client.request("start", settings={"timing_profile": "Eco", "target_cps": 20})
+        assert client.request("set_plan", settings={"button": "right"})["applied"]
+        plan = engine.plan
+    assert (plan.timing_profile, plan.target_cps, plan.button) == ("Eco", 20.0, "right")
+
+@pytest.mark.parametrize("settings", [{"keys": 5}, {"clicks": 1e308 * 10}, {"click_delay": 1e300}, {"clicks": 0}])
+def test_bad_settings_get_an_error_and_keep_the_session(control, settings):
+    _, _, connect, _ = control
+    with connect() as client:
+        with pytest.raises(ControlError):
+            client.request("set_plan", settings=settings)
+        assert client.request("hello")["ok"]
+
+def test_unknown_command_and_bad_json(control):
+    _, _, connect, _ = control
+    with connect() as client:
+        with pytest.raises(ControlError, match="Unknown command"):
+            client.request("explode")
+        client.sock.sendall(b"{not json\n")
+        assert client._read()["ok"] is False
+        assert client.request("hello")["ok"]
+
+def test_subscribe_pushes_metrics(control):
+    _, _, connect, _ = control
+    with connect() as client:
+        assert client.request("subscribe", interval_ms=50)["interval_ms"] == 50
+        client.request("start")
+        event = client.next_event()
+        assert event["event"] == "metrics"
+        assert {"state", "clicks", "timing"} <= set(event)
+        client.request("unsubscribe")
+
+def test_activate_and_legacy_message(control):
+    _, _, connect, activations = control
+    with connect() as client:
+        client.request("activate")
+    legacy = connect()
+    legacy.sock.sendall(LEGACY_ACTIVATE)
+    legacy.sock.shutdown(socket.SHUT_WR)
+    with pytest.raises(ConnectionError):
+        legacy._read()
+    legacy.close()
+    assert activations == [True, True]
+
+def test_jobs_run_next_to_the_engine(control):
+    _, _, connect, _ = control
+    with connect() as client:
+        client.request("add_job", name="left", job={"button": "left", "cps": 50})
+        client.request("add_job", name="space", job={"keys": "space", "interval_ms": 20})
+        names = {job["name"] for job in client.request("list_jobs")["jobs"]}
+        assert names == {"left", "space"}
+        client.request("remove_job", name="left")
+        assert [job["name"] for job in client.request("list_jobs")["jobs"]] == ["space"]
+        with pytest.raises(ControlError):
+            client.request("remove_job", name="left")
+        with pytest.raises(ControlError):
+            client.request("add_job", name="bad", job={"button": "left"})
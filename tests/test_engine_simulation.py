@@ -0,0 +1,176 @@
+import pytest
+from src.Public.click_plan import ClickPlan
+from src.Public.click_sequence import SequenceStep
+from src.Public.input_backend import MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
+from src.Public.screen_capture import FakeFramebufferCapture
+from src.Public.timing import CATCH_UP_BURST, CATCH_UP_SKIP
+from src.Public.triggers import PixelCondition
+from tests.simulation import EngineSimulation, random_overshoot
+
+MS = 1_000_000
+SECOND = 1_000 * MS
+
+@pytest.fixture
+def sim():
+    simulation = EngineSimulation()
+    yield simulation
+    simulation.close()
+
+def stalled_simulation() -> EngineSimulation:
+    """Wake-ups are on time except for a 50 ms stall every 50 sleeps."""
+    return EngineSimulation(overshoot=random_overshoot(0, seed=1, late_every=50, late_ns=50 * MS))
+
+def test_eight_hours_at_100_cps_is_exact(sim):
+    plan = ClickPlan(clicks=1, max_loops=0, click_interval_ns=0, cycle_interval_ns=0, target_cps=100)
+    result = sim.run(plan, 8 * 3600 * SECOND)
+    assert result.clicks == 8 * 3600 * 100
+    assert result.elapsed_ns == 8 * 3600 * SECOND
+    assert result.stats.missed_deadlines == 0
+
+def test_finite_plan_hits_cycle_boundaries(sim):
+    plan = ClickPlan(clicks=10, max_loops=5, click_interval_ns=5 * MS, cycle_interval_ns=10 * MS)
+    result = sim.run(plan)
+    assert (result.clicks, result.cycles) == (50, 5)
+    # Each cycle is 10 clicks 5 ms apart followed by the 10 ms cycle delay
+    assert result.elapsed_ns == 5 * (10 * 5 + 10) * MS
+
+def test_stop_is_immediate_and_mid_cycle(sim):
+    sim.stop_at(500 * MS)
+    result = sim.run(ClickPlan(clicks=10, max_loops=3, click_interval_ns=100 * MS, cycle_interval_ns=0))
+    assert result.clicks == 5
+    assert result.elapsed_ns == 500 * MS
+    assert result.stop_latency_ns == 0
+
+def test_burst_stats_count_clicks_not_cycles(sim):
+    plan = ClickPlan(clicks=10, max_loops=0, click_interval_ns=0, cycle_interval_ns=100 * MS, burst=True)
+    result = sim.run(plan, 10 * SECOND)
+    assert result.stats.samples == 100
+    assert result.stats.achieved_cps == pytest.approx(100.0)
+
+def test_runs_back_to_back_start_from_a_clean_state(sim):
+    plan = ClickPlan(clicks=1, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=0)
+    first = sim.run(plan, SECOND)
+    second = sim.run(plan, SECOND)
+    assert first.clicks == second.clicks == 100
+
+def test_swap_plan_changes_the_rate(sim):
+    sim.swap_at(SECOND, ClickPlan(clicks=1, max_loops=0, click_interval_ns=5 * MS, cycle_interval_ns=0))
+    result = sim.run(ClickPlan(clicks=1, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=0), 2 * SECOND)
+    assert result.clicks == pytest.approx(100 + 200, abs=1)
+
+@pytest.mark.parametrize("clicks", [1, 10])
+def test_burst_catch_up_keeps_the_exact_count(clicks):
+    simulation = stalled_simulation()
+    try:
+        plan = ClickPlan(
+            clicks=clicks, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=0, catch_up=CATCH_UP_BURST,
+        )
+        result = simulation.run(plan, 10 * SECOND)
+    finally:
+        simulation.close()
+    assert result.clicks == 1000
+    assert result.stats.missed_deadlines > 0
+
+@pytest.mark.parametrize("clicks", [1, 10])
+def test_skip_catch_up_drops_exactly_the_missed_clicks(clicks):
+    simulation = stalled_simulation()
+    try:
+        plan = ClickPlan(
+            clicks=clicks, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=0, catch_up=CATCH_UP_SKIP,
+        )
+        result = simulation.run(plan, 10 * SECOND)
+    finally:
+        simulation.close()
+    missed = result.stats.missed_deadlines
+    assert missed > 0
+    assert result.clicks == 1000 - missed
+    assert f"⏭️ Skipped {missed} overdue clicks" in result.messages
+
+@pytest.mark.parametrize("catch_up", [CATCH_UP_BURST, CATCH_UP_SKIP])
+@pytest.mark.parametrize("burst", [False, True])
+def test_catch_up_accounts_for_every_slot_with_a_cycle_delay(catch_up, burst):
+    # Stalls land in the cycle delay as well as between clicks
+    simulation = EngineSimulation(overshoot=random_overshoot(0, seed=1, late_every=7, late_ns=50 * MS))
+    try:
+        plan = ClickPlan(
+            clicks=10, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=50 * MS,
+            burst=burst, catch_up=catch_up,
+        )
+        result = simulation.run(plan, 15 * SECOND)
+    finally:
+        simulation.close()
+    # Per-click cycles last 10 x 10 + 50 ms; a burst cycle is only the 50 ms cycle delay
+    expected = 3000 if burst else 1000
+    missed = result.stats.missed_deadlines
+    assert missed > 0
+    if catch_up == CATCH_UP_BURST:
+        assert result.clicks == expected
+    else:
+        assert result.clicks + missed == expected
+
+def test_burst_catch_up_holds_target_cps():
+    simulation = stalled_simulation()
+    try:
+        plan = ClickPlan(
+            clicks=1, max_loops=0, click_interval_ns=0, cycle_interval_ns=0, target_cps=100, catch_up=CATCH_UP_BURST,
+        )
+        result = simulation.run(plan, 60 * SECOND)
+    finally:
+        simulation.close()
+    assert result.clicks == pytest.approx(6000, abs=1)
+    assert result.stats.missed_deadlines > 0
+
+@pytest.mark.parametrize("burst", [False, True])
+def test_catch_up_clicks_respect_the_trigger(burst):
+    simulation = stalled_simulation()
+    # A black framebuffer never matches a white pixel condition
+    simulation.engine.capture = FakeFramebufferCapture(64, 64)
+    try:
+        plan = ClickPlan(
+            clicks=10, max_loops=0, click_interval_ns=10 * MS, cycle_interval_ns=20 * MS, burst=burst,
+            catch_up=CATCH_UP_BURST, pixel_trigger=PixelCondition(5, 5, (255, 255, 255)),
+        )
+        result = simulation.run(plan, 10 * SECOND)
+    finally:
+        simulation.close()
+    assert result.stats.missed_deadlines > 0
+    assert result.clicks == 0
+    assert simulation.backend.clicks == 0
+
+@pytest.mark.parametrize("settings", [{"hold_ns": 100 * MS}, {"click_type": "double"}])
+def test_burst_rejects_held_and_multi_clicks(settings):
+    with pytest.raises(ValueError):
+        ClickPlan(clicks=5, max_loops=1, click_interval_ns=0, cycle_interval_ns=0, burst=True, **settings)
+
+def test_held_clicks_are_never_caught_up_back_to_back():
+    simulation = stalled_simulation()
+    try:
+        plan = ClickPlan(
+            clicks=5, max_loops=0, click_interval_ns=20 * MS, cycle_interval_ns=0, hold_ns=10 * MS,
+            catch_up=CATCH_UP_BURST,
+        )
+        result = simulation.run(plan, 10 * SECOND)
+    finally:
+        simulation.close()
+    missed = result.stats.missed_deadlines
+    assert missed > 0
+    assert result.clicks + missed == 500
+    assert f"⏭️ Skipped {missed} overdue clicks" in result.messages
+
+def test_stop_mid_hold_releases_the_button(sim):
+    sent = []
+    send = sim.backend.send
+
+    def record(compiled):
+        sent.extend(flags for flags, *_ in compiled)
+        return send(compiled)
+    sim.backend.send = record
+    plan = ClickPlan(clicks=1, max_loops=0, click_interval_ns=0, cycle_interval_ns=0,
+                     sequence=(SequenceStep(100, 100, hold_ms=1000),))
+    sim.run(plan, 500 * MS)
+    assert sent.count(MOUSEEVENTF_LEFTDOWN) == 1
+    assert sent.count(MOUSEEVENTF_LEFTUP) == 1
+
+def test_endless_plan_needs_a_duration(sim):
+    with pytest.raises(ValueError):
+        sim.run(ClickPlan(clicks=1, max_loops=0, click_interval_ns=MS, cycle_interval_ns=0))
@@ -0,0 +1,29 @@
+import pytest
+from src.Public.headless import DEFAULT_BURST_CLICKS, build_parser, main, plan_from_args
+
+def parse(*argv: str):
+    return build_parser().parse_args(["run", *argv])
+
+def test_count_is_one_cycle_without_burst():
+    plan = plan_from_args(parse("--cps", "50", "--count", "200"))
+    assert (plan.clicks, plan.max_loops, plan.burst) == (200, 1, False)
+
+def test_burst_splits_count_into_paced_cycles():
+    plan = plan_from_args(parse("--cps", "500", "--count", "2000", "--burst"))
+    assert (plan.clicks, plan.max_loops, plan.burst) == (DEFAULT_BURST_CLICKS, 200, True)
+    assert plan.target_cps == 500
+
+def test_burst_in_delay_mode_spaces_cycles_by_the_delay():
+    plan = plan_from_args(parse("--delay", "0.01", "--count", "100", "--burst", "20"))
+    assert (plan.clicks, plan.max_loops) == (20, 5)
+    assert plan.cycle_interval_ns == 20 * 10_000_000
+
+def test_burst_count_must_divide_evenly():
+    with pytest.raises(ValueError):
+        plan_from_args(parse("--count", "15", "--burst", "4"))
+
+@pytest.mark.parametrize("strict, code", [(False, 0), (True, 3)])
+def test_missed_cold_start_target_only_fails_when_strict(strict, code, capsys):
+    argv = ["run", "--backend", "recording", "--delay", "0.001", "--count", "5", "--cold-start-target-ms", "0"]
+    assert main(argv + ["--strict"] if strict else argv, started_ns=1) == code
+    assert "over the 0 ms target" in capsys.readouterr().err
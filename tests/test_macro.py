@@ -0,0 +1,85 @@
+import struct
+import types
+import pytest
+from src.Public import macro
+from src.Public.input_backend import RecordingInputBackend
+from src.Public.macro import (
+    EVENT_KEY_DOWN, EVENT_KEY_UP, EVENT_LEFT_DOWN, EVENT_LEFT_UP, EVENT_MOVE, EVENT_RIGHT_DOWN, EVENT_RIGHT_UP,
+    EVENT_SCROLL, MacroRecording, MacroStream, compile_macro,
+)
+
+MS = 1_000_000
+CODES = (
+    EVENT_MOVE, EVENT_LEFT_DOWN, EVENT_LEFT_UP, EVENT_SCROLL, EVENT_KEY_DOWN,
+    EVENT_KEY_UP, EVENT_RIGHT_DOWN, EVENT_RIGHT_UP,
+)
+
+def make_recording(count: int) -> MacroRecording:
+    recording = MacroRecording()
+    for i in range(count):
+        code = CODES[i % len(CODES)]
+        x, y = (0x41, 0) if code in (EVENT_KEY_DOWN, EVENT_KEY_UP) else (i * 37 - 500, 1080 - i * 11)
+        recording.append(i * 3 * MS + i, code, x, y)
+    return recording
+
+def columns(recording: MacroRecording):
+    return [list(recording.deltas), list(recording.xs), list(recording.ys), list(recording.codes)]
+
+def test_save_writes_header_and_little_endian_columns(tmp_path):
+    recording = make_recording(5)
+    data = recording.save(tmp_path / "macro.sacm").read_bytes()
+    magic, version, count = MacroRecording.HEADER.unpack_from(data)
+    assert (magic, version, count) == (MacroRecording.MAGIC, MacroRecording.FORMAT_VERSION, 5)
+    base = MacroRecording.HEADER.size
+    # Column offsets: int64 deltas, int16 x, int16 y, uint8 codes
+    assert list(struct.unpack_from("<5q", data, base)) == list(recording.deltas)
+    assert list(struct.unpack_from("<5h", data, base + 8 * 5)) == list(recording.xs)
+    assert list(struct.unpack_from("<5h", data, base + 10 * 5)) == list(recording.ys)
+    assert list(data[base + 12 * 5:]) == list(recording.codes)
+
+def test_save_load_round_trip(tmp_path):
+    recording = make_recording(50)
+    loaded = MacroRecording.load(recording.save(tmp_path / "macro.sacm"))
+    assert columns(loaded) == columns(recording)
+    assert loaded.duration_ns == recording.duration_ns
+
+def test_coordinates_are_clamped_to_int16():
+    recording = MacroRecording()
+    recording.append(0, EVENT_MOVE, 100_000, -100_000)
+    assert (recording.xs[0], recording.ys[0]) == (32767, -32768)
+
+def test_big_endian_hosts_byteswap_on_save_and_load(tmp_path, monkeypatch):
+    recording = make_recording(9)
+    monkeypatch.setattr(macro, "sys", types.SimpleNamespace(byteorder="big"))
+    path = recording.save(tmp_path / "macro.sacm")
+    assert columns(MacroRecording.load(path)) == columns(recording)
+    backend = RecordingInputBackend()
+    assert list(MacroStream(path, backend, chunk_events=4)) == list(compile_macro(recording, backend))
+    monkeypatch.undo()
+    # Read natively, the file holds byteswapped values (this host is little-endian)
+    assert columns(MacroRecording.load(path))[1] != columns(recording)[1]
+
+def test_bad_header_is_rejected(tmp_path):
+    path = tmp_path / "bad.sacm"
+    path.write_bytes(b"NOPE" + bytes(MacroRecording.HEADER.size))
+    with pytest.raises(ValueError):
+        MacroRecording.load(path)
+    with pytest.raises(ValueError):
+        MacroStream(path, RecordingInputBackend())
+
+@pytest.mark.parametrize("count, chunk_events", [(50, 7), (50, 50), (50, 4096), (1, 3)])
+def test_stream_matches_compile_macro(tmp_path, count, chunk_events):
+    recording = make_recording(count)
+    path = recording.save(tmp_path / "macro.sacm")
+    backend = RecordingInputBackend()
+    stream = MacroStream(path, backend, chunk_events=chunk_events)
+    assert len(stream) == count
+    assert list(stream) == list(compile_macro(recording, backend))
+    # Re-iterable: a second pass reads the mapping again
+    assert list(stream) == list(compile_macro(recording, backend))
+
+def test_empty_recording_streams_nothing(tmp_path):
+    path = MacroRecording().save(tmp_path / "empty.sacm")
+    stream = MacroStream(path, RecordingInputBackend(), chunk_events=7)
+    assert len(stream) == 0
+    assert list(stream) == []
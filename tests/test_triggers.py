@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.Public.click_sequence import normalize_point
+from src.Public.screen_capture import FakeFramebufferCapture
+from src.Public.triggers import PixelCondition, PixelTrigger, TemplateCondition, TemplateMatcher, TemplateTrigger
+
+np = pytest.importorskip("numpy")
+
+DESKTOP = (0, 0, 1920, 1080)
+
+def synthetic_template(size: int = 24) -> "np.ndarray":
+    """A checkerboard with a diagonal ramp, so it has exactly one best match."""
+    y, x = np.mgrid[0:size, 0:size]
+    return (((x // 4 + y // 4) % 2) * 160 + (x + y) * 2).astype(np.float32)
+
+def scene_with(template: "np.ndarray", x: int, y: int, shape=(120, 160)) -> "np.ndarray":
+    rng = np.random.default_rng(7)
+    image = rng.uniform(0, 40, shape).astype(np.float32)
+    th, tw = template.shape
+    image[y:y + th, x:x + tw] = template
+    return image
+
+def paint_gray(capture: FakeFramebufferCapture, image: "np.ndarray", left: int, top: int) -> None:
+    for row, values in enumerate(image.astype(np.uint8)):
+        for col, value in enumerate(values):
+            capture.fill((left + col, top + row, 1, 1), (int(value),) * 3)
+
+# ------------------------------------------------------------------
+# Pixel trigger
+# ------------------------------------------------------------------
+def test_pixel_trigger_matches_color_within_tolerance():
+    capture = FakeFramebufferCapture(64, 64)
+    capture.fill((10, 10, 4, 4), (200, 100, 50))
+    trigger = PixelTrigger(capture, PixelCondition(10, 10, (205, 95, 50), width=4, height=4, tolerance=5))
+    assert trigger.matches()
+    capture.fill((13, 13, 1, 1), (200, 100, 60))
+    assert not trigger.matches()
+    assert trigger.checks == 2
+    trigger.close()
+
+def test_pixel_trigger_only_grabs_the_region():
+    capture = FakeFramebufferCapture(64, 64)
+    trigger = PixelTrigger(capture, PixelCondition(0, 0, (0, 0, 0), width=2, height=2))
+    capture.fill((2, 2, 10, 10), (255, 255, 255))
+    assert trigger.matches()
+    assert capture.region == (0, 0, 2, 2)
+    trigger.close()
+
+def test_pixel_region_outside_framebuffer_is_rejected():
+    with pytest.raises(ValueError):
+        PixelTrigger(FakeFramebufferCapture(16, 16), PixelCondition(15, 15, (0, 0, 0), width=4, height=4))
+
+# ------------------------------------------------------------------
+# Template matching
+# ------------------------------------------------------------------
+def test_matcher_finds_template_in_synthetic_image():
+    template = synthetic_template()
+    matcher = TemplateMatcher(template, threshold=0.95)
+    x, y, score = matcher.find(scene_with(template, 90, 37))
+    assert (x, y) == (90, 37)
+    assert score == pytest.approx(1.0, abs=1e-3)
+    assert len(matcher.templates) > 1
+
+def test_matcher_searches_near_last_hit_before_full_scan():
+    template = synthetic_template()
+    matcher = TemplateMatcher(template, threshold=0.95)
+    matcher.find(scene_with(template, 40, 30))
+    assert matcher.full_scans == 1
+    assert matcher.find(scene_with(template, 44, 33))[:2] == (44, 33)
+    assert matcher.full_scans == 1
+    # Moved too far for the local search: falls back to the pyramid
+    assert matcher.find(scene_with(template, 120, 80))[:2] == (120, 80)
+    assert matcher.full_scans == 2
+
+def test_matcher_reports_no_match():
+    template = synthetic_template()
+    matcher = TemplateMatcher(template, threshold=0.95)
+    assert matcher.find(np.random.default_rng(1).uniform(0, 255, (120, 160)).astype(np.float32)) is None
+    assert matcher.last_hit is None
+
+def test_template_trigger_targets_match_centre():
+    template = synthetic_template()
+    capture = FakeFramebufferCapture(200, 200)
+    paint_gray(capture, scene_with(template, 30, 20, shape=(100, 120)), 50, 40)
+    condition = TemplateCondition("synthetic.png", 50, 40, 120, 100, threshold=0.95, click_at_match=True)
+    with ThreadPoolExecutor(1) as pool:
+        trigger = TemplateTrigger(capture, condition, pool, DESKTOP, template=template)
+        # The first check only submits a scan; results are picked up by later checks
+        assert not trigger.matches()
+        trigger._pending.result()
+        assert trigger.matches()
+        trigger.close()
+    assert trigger.target == normalize_point(50 + 30 + 12, 40 + 20 + 12, DESKTOP)